@@ -0,0 +1,11 @@
+"""Helpers shared by the example scripts"""
+
+import os
+
+# Fast mode skips the simulated delays (e.g. in CI)
+FAST_MODE = os.getenv("MICROFLOW_FAST") == "1"
+
+
+def sim_delay(seconds):
+    """Simulated latency; 0 in fast mode so tasks still yield to the loop"""
+    return 0 if FAST_MODE else seconds
@@ -1,15 +1,20 @@
 """
 Example demonstrating HTTP API workflows similar to n8n
+
+Set MICROFLOW_FAST=1 to run without the simulated API delays.
 """
 
 import asyncio
+from collections import Counter
+from operator import itemgetter
 from microflow import (
-    Workflow, task, JSONStateStore,
+    Workflow, task, JSONStateStore, run_async,
     http_get, http_post, http_put,
     webhook_call, rest_api_call,
     BearerAuth, APIKeyAuth,
     if_node, conditional_task
 )
+from _demo import sim_delay
 
 
 # Mock HTTP tasks for demonstration (since we don't have real APIs)
@@ -19,18 +24,22 @@ async def mock_fetch_github_user(ctx):
     username = ctx.get("github_username", "octocat")
     print(f"🐙 Fetching GitHub user: {username}")
 
-    await asyncio.sleep(0.5)  # Simulate API delay
+    await asyncio.sleep(sim_delay(0.5))  # Simulate API delay
+
+    github_user = {
+        "login": username,
+        "id": 12345,
+        "name": "The Octocat",
+        "public_repos": 8,
+        "followers": 4000,
+        "following": 9,
+        "created_at": "2011-01-25T18:44:36Z"
+    }
+    # Per-run mock data overrides (e.g. a regular user with few followers)
+    github_user.update(ctx.get("github_user_overrides", {}))
 
     return {
-        "github_user": {
-            "login": username,
-            "id": 12345,
-            "name": "The Octocat",
-            "public_repos": 8,
-            "followers": 4000,
-            "following": 9,
-            "created_at": "2011-01-25T18:44:36Z"
-        },
+        "github_user": github_user,
         "github_api_success": True
     }
 
@@ -41,7 +50,7 @@ async def mock_fetch_user_repos(ctx):
     username = ctx["github_user"]["login"]
     print(f"📦 Fetching repositories for: {username}")
 
-    await asyncio.sleep(0.3)
+    await asyncio.sleep(sim_delay(0.3))
 
     return {
         "repositories": [
@@ -60,7 +69,7 @@ async def mock_send_slack_message(ctx):
     message = f"New GitHub user analyzed: {user['name']} (@{user['login']}) - {user['public_repos']} repos, {user['followers']} followers"
 
     print(f"💬 Slack: {message}")
-    await asyncio.sleep(0.2)
+    await asyncio.sleep(sim_delay(0.2))
 
     return {
         "slack_sent": True,
@@ -74,7 +83,7 @@ async def mock_create_notion_page(ctx):
     user = ctx["github_user"]
     print(f"📄 Creating Notion page for: {user['name']}")
 
-    await asyncio.sleep(0.4)
+    await asyncio.sleep(sim_delay(0.4))
 
     return {
         "notion_page_created": True,
@@ -90,9 +99,9 @@ async def mock_send_email(ctx):
 
     print(f"📧 Sending email report about {user['name']}")
     print(f"   - Total repositories: {len(repos)}")
-    print(f"   - Most popular: {max(repos, key=lambda r: r['stars'])['name'] if repos else 'None'}")
+    print(f"   - Most popular: {max(repos, key=itemgetter('stars'))['name'] if repos else 'None'}")
 
-    await asyncio.sleep(0.3)
+    await asyncio.sleep(sim_delay(0.3))
 
     return {
         "email_sent": True,
@@ -105,16 +114,14 @@ def analyze_repo_languages(ctx):
     """Analyze programming languages in repositories"""
     repos = ctx.get("repositories", [])
 
-    language_stats = {}
-    for repo in repos:
-        lang = repo.get("language", "Unknown")
-        language_stats[lang] = language_stats.get(lang, 0) + 1
+    language_counts = Counter(repo.get("language", "Unknown") for repo in repos)
+    language_stats = dict(language_counts)
 
     print(f"💻 Language analysis: {language_stats}")
 
     return {
         "language_stats": language_stats,
-        "primary_language": max(language_stats.items(), key=lambda x: x[1])[0] if language_stats else "Unknown"
+        "primary_language": language_counts.most_common(1)[0][0] if language_counts else "Unknown"
     }
 
 
@@ -158,23 +165,6 @@ async def handle_regular_user(ctx):
 def create_api_workflow():
     """Create a workflow that mimics common API automation patterns"""
 
-    # Build the workflow DAG
-    mock_fetch_github_user >> mock_fetch_user_repos
-    mock_fetch_github_user >> check_influence
-
-    # Parallel processing based on influence
-    check_influence >> handle_influential_user
-    check_influence >> handle_regular_user
-
-    # Data analysis
-    mock_fetch_user_repos >> analyze_repo_languages
-
-    # Notifications and documentation (parallel)
-    handle_influential_user >> mock_send_slack_message
-    handle_regular_user >> mock_send_slack_message
-    analyze_repo_languages >> mock_create_notion_page
-    analyze_repo_languages >> mock_send_email
-
     all_tasks = [
         mock_fetch_github_user,
         mock_fetch_user_repos,
@@ -187,7 +177,23 @@ def create_api_workflow():
         mock_send_email
     ]
 
-    return Workflow(all_tasks, name="github_user_analysis")
+    workflow = Workflow(all_tasks, name="github_user_analysis")
+
+    # Build the workflow DAG
+    return workflow.add_edges([
+        (mock_fetch_github_user, mock_fetch_user_repos),
+        (mock_fetch_github_user, check_influence),
+        # Parallel processing based on influence
+        (check_influence, handle_influential_user),
+        (check_influence, handle_regular_user),
+        # Data analysis
+        (mock_fetch_user_repos, analyze_repo_languages),
+        # Notifications and documentation (parallel)
+        (handle_influential_user, mock_send_slack_message),
+        (handle_regular_user, mock_send_slack_message),
+        (analyze_repo_languages, mock_create_notion_page),
+        (analyze_repo_languages, mock_send_email),
+    ])
 
 
 # Real HTTP examples (commented out, can be used with real APIs)
@@ -226,6 +232,15 @@ create_notion_page = http_post(
     },
     name="create_notion_page"
 )
+
+# Share one pooled client across all HTTP nodes of the workflow
+http_client = create_http_client(max_connections=100, max_keepalive_connections=20)
+real_workflow = Workflow(
+    [fetch_github_user, send_slack_notification, create_notion_page],
+    name="github_user_analysis_live",
+    http_client=http_client,
+)
+# ... await real_workflow.run(...), then: await http_client.aclose()
 """
 
 
@@ -236,51 +251,49 @@ async def main():
     # Test different user types
     test_users = [
         {"github_username": "octocat"},      # Influential user (4000 followers)
-        {"github_username": "newbie_dev"}    # Regular user
+        {
+            "github_username": "newbie_dev",  # Regular user
+            "github_user_overrides": {
+                "name": "New Developer",
+                "followers": 15,  # Low followers
+                "public_repos": 3
+            }
+        }
     ]
 
-    store = JSONStateStore("./data")
+    store = JSONStateStore.get_or_create("./data")
 
-    for i, user_ctx in enumerate(test_users):
-        print(f"\n🔄 Processing user {i+1}: {user_ctx['github_username']}")
-        print("=" * 50)
+    # Build the workflow once; each run only differs by its initial context
+    workflow = create_api_workflow()
 
-        workflow = create_api_workflow()
-        run_id = f"api_workflow_{i+1:03d}"
-
-        # Modify mock data for different scenarios
-        if user_ctx['github_username'] == 'newbie_dev':
-            # Override for regular user scenario
-            original_fetch = mock_fetch_github_user.spec.fn
-
-            async def newbie_fetch(ctx):
-                result = await original_fetch(ctx)
-                result['github_user'].update({
-                    'name': 'New Developer',
-                    'login': 'newbie_dev',
-                    'followers': 15,  # Low followers
-                    'public_repos': 3
-                })
-                return result
-
-            mock_fetch_github_user.spec.fn = newbie_fetch
-
-        try:
-            final_ctx = await workflow.run(
-                run_id=run_id,
+    # Users are independent runs, so process them concurrently
+    print(f"🔄 Processing {len(test_users)} users concurrently")
+    results = await asyncio.gather(
+        *(
+            workflow.run(
+                run_id=f"api_workflow_{i+1:03d}",
                 store=store,
                 initial_ctx=user_ctx
             )
+            for i, user_ctx in enumerate(test_users)
+        ),
+        return_exceptions=True
+    )
+
+    for i, (user_ctx, final_ctx) in enumerate(zip(test_users, results)):
+        print(f"\n📊 User {i+1}: {user_ctx['github_username']}")
+        print("=" * 50)
 
-            print(f"\n✅ Workflow completed for {user_ctx['github_username']}!")
-            print(f"Influence level: {final_ctx.get('influence_level')}")
-            print(f"Primary language: {final_ctx.get('primary_language')}")
-            print(f"Notifications sent: {final_ctx.get('slack_sent', False)}")
-            print(f"Documentation created: {final_ctx.get('notion_page_created', False)}")
-            print(f"Report emailed: {final_ctx.get('email_sent', False)}")
+        if isinstance(final_ctx, Exception):
+            print(f"❌ Workflow failed for {user_ctx['github_username']}: {final_ctx}")
+            continue
 
-        except Exception as e:
-            print(f"❌ Workflow failed for {user_ctx['github_username']}: {e}")
+        print(f"✅ Workflow completed for {user_ctx['github_username']}!")
+        print(f"Influence level: {final_ctx.get('influence_level')}")
+        print(f"Primary language: {final_ctx.get('primary_language')}")
+        print(f"Notifications sent: {final_ctx.get('slack_sent', False)}")
+        print(f"Documentation created: {final_ctx.get('notion_page_created', False)}")
+        print(f"Report emailed: {final_ctx.get('email_sent', False)}")
 
     print(f"\n📋 View detailed logs at: {store.data_dir}/runs/")
     print("\n💡 Tips for real usage:")
@@ -291,4 +304,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_async(main())
\ No newline at end of file
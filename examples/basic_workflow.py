@@ -1,8 +1,12 @@
-"""Basic workflow example demonstrating microflow features"""
+"""Basic workflow example demonstrating microflow features
+
+Set MICROFLOW_FAST=1 to run without the simulated delays.
+"""
 
 import asyncio
 import random
-from microflow import Workflow, task, JSONStateStore
+from microflow import Workflow, task, JSONStateStore, run_async
+from _demo import sim_delay
 
 
 @task(name="fetch_data", max_retries=2, backoff_s=0.5, description="Fetch data from external source")
@@ -11,7 +15,7 @@ async def fetch_data(ctx):
     print(f"Fetching data...")
 
     # Simulate network delay
-    await asyncio.sleep(1)
+    await asyncio.sleep(sim_delay(1))
 
     # Simulate occasional failures for retry demonstration
     if random.random() < 0.3:
@@ -28,16 +32,17 @@ async def fetch_data(ctx):
 @task(name="transform_data", description="Transform and validate the fetched data")
 def transform_data(ctx):
     """Transform the fetched data"""
-    print(f"Transforming {len(ctx['items'])} items...")
-
     items = ctx["items"]
+    item_count = len(items)
+    print(f"Transforming {item_count} items...")
+
     total = sum(items)
-    average = total / len(items)
+    average = total / item_count
 
     return {
         "total": total,
         "average": average,
-        "item_count": len(items),
+        "item_count": item_count,
         "processed": True
     }
 
@@ -47,7 +52,7 @@ async def branch_high(ctx):
     """Branch for high values"""
     if ctx["total"] >= 10:
         print(f"High value path: total={ctx['total']}")
-        await asyncio.sleep(0.5)  # Simulate processing
+        await asyncio.sleep(sim_delay(0.5))  # Simulate processing
         return {"path": "high_value", "bonus": 100}
 
 
@@ -56,7 +61,7 @@ async def branch_low(ctx):
     """Branch for low values"""
     if ctx["total"] < 10:
         print(f"Low value path: total={ctx['total']}")
-        await asyncio.sleep(0.3)  # Simulate processing
+        await asyncio.sleep(sim_delay(0.3))  # Simulate processing
         return {"path": "low_value", "discount": 0.1}
 
 
@@ -69,7 +74,7 @@ async def notify(ctx):
     print(f"Sending notification: path={path}, total={total}")
 
     # Simulate notification service
-    await asyncio.sleep(0.2)
+    await asyncio.sleep(sim_delay(0.2))
 
     return {
         "notification_sent": True,
@@ -91,18 +96,20 @@ def audit_log(ctx):
 def create_workflow():
     """Create and configure the workflow DAG"""
 
-    # Build the DAG using the >> operator
-    fetch_data >> transform_data
-    transform_data >> branch_high
-    transform_data >> branch_low
-    branch_high >> notify
-    branch_low >> notify
-    notify >> audit_log
-
     # Create workflow with all tasks
     tasks = [fetch_data, transform_data, branch_high, branch_low, notify, audit_log]
     workflow = Workflow(tasks, name="basic_example")
 
+    # Build the DAG in one call (same as chaining with the >> operator)
+    workflow.add_edges([
+        (fetch_data, transform_data),
+        (transform_data, branch_high),
+        (transform_data, branch_low),
+        (branch_high, notify),
+        (branch_low, notify),
+        (notify, audit_log),
+    ])
+
     return workflow
 
 
@@ -118,7 +125,7 @@ async def main():
     print()
 
     # Create storage
-    store = JSONStateStore("./data")
+    store = JSONStateStore.get_or_create("./data")
 
     # Run workflow
     try:
@@ -160,4 +167,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_async(main())
\ No newline at end of file
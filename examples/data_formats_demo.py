@@ -1,11 +1,10 @@
 """Example demonstrating CSV and Excel data format operations"""
 
-import asyncio
 import os
 from pathlib import Path
 
 from microflow import (
-    Workflow, task, JSONStateStore,
+    Workflow, task, JSONStateStore, run_async,
     csv_read, csv_write, json_to_csv, csv_to_json,
     excel_read, excel_write, excel_to_json
 )
@@ -198,7 +197,7 @@ async def main():
 
     # Create and run workflow
     workflow = Workflow(all_tasks, name="data_formats_demo")
-    store = JSONStateStore("./data")
+    store = JSONStateStore.get_or_create("./data")
 
     try:
         print("\n🚀 Running data format workflow...")
@@ -215,4 +214,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_async(main())
\ No newline at end of file
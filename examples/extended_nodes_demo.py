@@ -1,22 +1,25 @@
 """
 Comprehensive example demonstrating all the new node types:
 Shell, File Operations, Data Transformation, Timing, and Notifications
+
+Set MICROFLOW_FAST=1 to run without the simulated delays.
 """
 
 import asyncio
-import json
+import sys
+from collections import Counter
 from pathlib import Path
 from microflow import (
-    Workflow, task, JSONStateStore,
+    Workflow, task, JSONStateStore, run_async,
 
     # Shell nodes
     shell_command, python_script, git_command,
 
     # File operation nodes
-    write_file, read_file, copy_file, list_directory,
+    read_file, copy_file, list_directory,
 
     # Data transformation nodes
-    json_parse, json_stringify, csv_parse, data_filter, data_transform,
+    json_parse, json_stringify, csv_parse, data_filter_transform,
 
     # Timing nodes
     delay, wait_for_condition,
@@ -27,6 +30,28 @@ from microflow import (
     # Notification nodes (mock for demo)
     simple_email
 )
+from microflow.nodes.file_ops import write_json_file
+from _demo import sim_delay
+
+
+# Shared read-only fallbacks for missing ctx keys (no fresh {} / [] per call)
+_EMPTY_DICT = {}
+_EMPTY_TUPLE = ()
+
+USER_CSV_COLUMNS = ("id", "name", "email", "score", "department")
+
+
+def compile_csv_row(columns):
+    """Generate a row formatter specialized for a fixed column list"""
+    fields = ",".join(f"{{row[{column!r}]}}" for column in columns)
+    source = f'def format_row(row):\n    return f"{fields}\\n"\n'
+    namespace = {}
+    exec(compile(source, "<csv_row>", "exec"), namespace)
+    return namespace["format_row"]
+
+
+USER_CSV_HEADER = ",".join(USER_CSV_COLUMNS) + "\n"
+format_user_row = compile_csv_row(USER_CSV_COLUMNS)
 
 
 # ========================================
@@ -91,18 +116,18 @@ check_git_status = git_command(
 # File Operations Demo
 # ========================================
 
-# Write users data to JSON file
-write_users_json = write_file(
+# Serialize users straight to a JSON file; only path/size metadata lands in ctx
+write_users_json = write_json_file(
     file_path="./data/demo_users.json",
-    content='{users_json}',  # Will be populated from context
+    data_key="users",
     create_dirs=True,
     name="write_users_file"
 )
 
-# Write metrics to JSON file
-write_metrics_json = write_file(
+# Serialize metrics straight to a JSON file
+write_metrics_json = write_json_file(
     file_path="./data/demo_metrics.json",
-    content='{metrics_json}',
+    data_key="metrics",
     create_dirs=True,
     name="write_metrics_file"
 )
@@ -140,20 +165,13 @@ parse_users_json = json_parse(
     name="parse_users_json"
 )
 
-# Filter users by department
-filter_engineering_users = data_filter(
+# Filter engineering users and add their grade in a single pass
+grade_engineering_users = data_filter_transform(
     data_key="users",
     filter_condition="item['department'] == 'Engineering'",
-    output_key="engineering_users",
-    name="filter_engineering_users"
-)
-
-# Transform users to add grade
-add_user_grades = data_transform(
-    data_key="engineering_users",
     transform_expression="{'id': item['id'], 'name': item['name'], 'score': item['score'], 'grade': 'A' if item['score'] >= 90 else 'B' if item['score'] >= 80 else 'C'}",
     output_key="graded_users",
-    name="add_user_grades"
+    name="grade_engineering_users"
 )
 
 # Generate CSV data
@@ -197,7 +215,7 @@ async def handle_unhealthy_system(ctx):
 
 # Add a delay between operations
 processing_delay = delay(
-    seconds=1.0,
+    seconds=sim_delay(1.0),
     name="processing_delay"
 )
 
@@ -216,18 +234,11 @@ wait_for_processing = wait_for_condition(
 
 @task(name="prepare_json_strings")
 def prepare_json_strings(ctx):
-    """Prepare JSON strings for file writing"""
-    users_json = json.dumps(ctx["users"], indent=2)
-    metrics_json = json.dumps(ctx["metrics"], indent=2)
-
-    # Create a simple CSV string
-    users_csv = "id,name,email,score,department\n"
-    for user in ctx["users"]:
-        users_csv += f"{user['id']},{user['name']},{user['email']},{user['score']},{user['department']}\n"
+    """Prepare the CSV string for the report (JSON files are written directly)"""
+    # Create a simple CSV string with the generated row formatter and one join
+    users_csv = USER_CSV_HEADER + "".join(map(format_user_row, ctx["users"]))
 
     return {
-        "users_json": users_json,
-        "metrics_json": metrics_json,
         "users_csv_string": users_csv
     }
 
@@ -235,15 +246,16 @@ def prepare_json_strings(ctx):
 async def mock_email_notification(ctx):
     """Mock email notification for demo"""
     status = ctx.get("system_status", "unknown")
-    user_count = len(ctx.get("engineering_users", []))
+    user_count = len(ctx.get("graded_users") or _EMPTY_TUPLE)
+    metrics = ctx.get("metrics") or _EMPTY_DICT
 
     print(f"📧 Mock Email Sent:")
     print(f"   To: admin@example.com")
     print(f"   Subject: System Report - Status: {status}")
     print(f"   Body: Engineering team has {user_count} members")
-    print(f"   System CPU: {ctx.get('metrics', {}).get('cpu_usage', 'N/A')}%")
+    print(f"   System CPU: {metrics.get('cpu_usage', 'N/A')}%")
 
-    await asyncio.sleep(0.2)  # Simulate email sending
+    await asyncio.sleep(sim_delay(0.2))  # Simulate email sending
 
     return {
         "email_sent": True,
@@ -254,33 +266,35 @@ async def mock_email_notification(ctx):
 @task(name="generate_final_report")
 def generate_final_report(ctx):
     """Generate a summary report of all operations"""
-    print("\n" + "="*60)
-    print("📋 MICROFLOW EXTENDED NODES DEMO REPORT")
-    print("="*60)
+    get = ctx.get  # Bound once; the report reads many keys
+    # Collect the report and write it once, so concurrent runs don't interleave
+    lines = ["", "="*60, "📋 MICROFLOW EXTENDED NODES DEMO REPORT", "="*60]
 
     # System info
-    if ctx.get("shell_stdout"):
-        print(f"🖥️  System: {ctx['shell_stdout'].split()[0] if ctx['shell_stdout'] else 'Unknown'}")
+    shell_stdout = get("shell_stdout")
+    if shell_stdout:
+        lines.append(f"🖥️  System: {shell_stdout.split()[0]}")
 
     # File operations
-    file_count = len(ctx.get("dir_files", []))
-    print(f"📁 Files created: {file_count}")
+    file_count = len(get("dir_files") or _EMPTY_TUPLE)
+    lines.append(f"📁 Files created: {file_count}")
 
     # Data processing
-    total_users = len(ctx.get("users", []))
-    eng_users = len(ctx.get("engineering_users", []))
-    print(f"👥 Total users: {total_users}, Engineering: {eng_users}")
+    total_users = len(get("users") or _EMPTY_TUPLE)
+    eng_users = len(get("graded_users") or _EMPTY_TUPLE)
+    lines.append(f"👥 Total users: {total_users}, Engineering: {eng_users}")
 
     # System health
-    system_status = ctx.get("system_status", "unknown")
-    print(f"🔍 System status: {system_status}")
+    system_status = get("system_status", "unknown")
+    lines.append(f"🔍 System status: {system_status}")
 
     # Notifications
-    email_sent = ctx.get("email_sent", False)
-    print(f"📧 Email notification: {'✅ Sent' if email_sent else '❌ Failed'}")
+    email_sent = get("email_sent", False)
+    lines.append(f"📧 Email notification: {'✅ Sent' if email_sent else '❌ Failed'}")
 
-    print("="*60)
-    print("✅ Demo completed successfully!")
+    lines.append("="*60)
+    lines.append("✅ Demo completed successfully!")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return {
         "report_generated": True,
@@ -309,16 +323,15 @@ def create_extended_demo_workflow():
     list_files >> check_git_status
 
     # 3. File operations
-    prepare_json_strings >> write_users_json
-    prepare_json_strings >> write_metrics_json
+    create_demo_data >> write_users_json
+    create_demo_data >> write_metrics_json
     write_users_json >> read_users_back
     write_users_json >> backup_users_file
     write_metrics_json >> list_data_dir
 
     # 4. Data transformation
     read_users_back >> parse_users_json
-    parse_users_json >> filter_engineering_users
-    filter_engineering_users >> add_user_grades
+    parse_users_json >> grade_engineering_users
 
     # 5. System health check
     create_demo_data >> processing_delay
@@ -327,7 +340,7 @@ def create_extended_demo_workflow():
     check_system_health >> handle_unhealthy_system
 
     # 6. Final reporting and notifications
-    add_user_grades >> mock_email_notification
+    grade_engineering_users >> mock_email_notification
     handle_healthy_system >> mock_email_notification
     handle_unhealthy_system >> mock_email_notification
     list_data_dir >> generate_final_report
@@ -347,8 +360,7 @@ def create_extended_demo_workflow():
         backup_users_file,
         list_data_dir,
         parse_users_json,
-        filter_engineering_users,
-        add_user_grades,
+        grade_engineering_users,
         processing_delay,
         check_system_health,
         handle_healthy_system,
@@ -362,18 +374,20 @@ def create_extended_demo_workflow():
 
 async def main():
     """Run the extended nodes demonstration"""
-    print("=== Microflow Extended Nodes Demo ===\n")
-    print("This demo showcases:")
-    print("🐚 Shell/Process execution")
-    print("📁 File operations")
-    print("🔄 Data transformations")
-    print("⏰ Timing and delays")
-    print("📧 Notifications")
-    print("🔀 Conditional logic")
-    print("\n" + "="*50)
+    sys.stdout.write(
+        "=== Microflow Extended Nodes Demo ===\n\n"
+        "This demo showcases:\n"
+        "🐚 Shell/Process execution\n"
+        "📁 File operations\n"
+        "🔄 Data transformations\n"
+        "⏰ Timing and delays\n"
+        "📧 Notifications\n"
+        "🔀 Conditional logic\n"
+        "\n" + "="*50 + "\n"
+    )
 
     workflow = create_extended_demo_workflow()
-    store = JSONStateStore("./data")
+    store = JSONStateStore.get_or_create("./data")
 
     try:
         print("\n🚀 Starting workflow execution...\n")
@@ -388,21 +402,30 @@ async def main():
             }
         )
 
-        print(f"\n🎉 Demo completed successfully!")
-        print(f"📊 Final summary: {final_ctx.get('summary', {})}")
+        lines = [
+            "\n🎉 Demo completed successfully!",
+            f"📊 Final summary: {final_ctx.get('summary', {})}",
+        ]
 
         # Show run information
         run_info = store.get_run_info("extended_demo_001")
-        successful_tasks = [name for name, info in run_info['tasks'].items() if info['status'] == 'success']
-        failed_tasks = [name for name, info in run_info['tasks'].items() if info['status'] == 'error']
-
-        print(f"\n📈 Execution Statistics:")
-        print(f"   ✅ Successful tasks: {len(successful_tasks)}")
-        print(f"   ❌ Failed tasks: {len(failed_tasks)}")
-        print(f"   ⏱️  Total execution time: {run_info['finished'] - run_info['started']:.2f}s")
+        # Single pass over the task table: tally statuses, keep failed names
+        status_counts = Counter()
+        failed_tasks = []
+        for name, info in run_info['tasks'].items():
+            status = info['status']
+            status_counts[status] += 1
+            if status == 'error':
+                failed_tasks.append(name)
+
+        lines.append("\n📈 Execution Statistics:")
+        lines.append(f"   ✅ Successful tasks: {status_counts['success']}")
+        lines.append(f"   ❌ Failed tasks: {len(failed_tasks)}")
+        lines.append(f"   ⏱️  Total execution time: {run_info['finished'] - run_info['started']:.2f}s")
 
         if failed_tasks:
-            print(f"\n⚠️  Failed tasks: {', '.join(failed_tasks)}")
+            lines.append(f"\n⚠️  Failed tasks: {', '.join(failed_tasks)}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     except Exception as e:
         print(f"\n❌ Demo failed: {e}")
@@ -419,4 +442,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_async(main())
\ No newline at end of file
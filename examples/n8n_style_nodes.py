@@ -4,7 +4,7 @@ Example demonstrating n8n-style nodes: IF, SWITCH, HTTP, and sub-workflows
 
 import asyncio
 from microflow import (
-    Workflow, task, JSONStateStore,
+    Workflow, task, JSONStateStore, run_async,
     if_node, switch_node, conditional_task,
     http_get, http_post, BearerAuth,
     subworkflow
@@ -235,7 +235,7 @@ async def main():
         }
     ]
 
-    store = JSONStateStore("./data")
+    store = JSONStateStore.get_or_create("./data")
 
     for i, test_case in enumerate(test_cases):
         print(f"\n🔄 Running Test Case {i+1}: {test_case['name']}")
@@ -279,4 +279,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_async(main())
\ No newline at end of file
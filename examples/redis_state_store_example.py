@@ -1,8 +1,6 @@
 """Example: RedisStateStore usage for workflow state persistence."""
 
-import asyncio
-
-from microflow import JSONStateStore, RedisStateStore, Workflow, task
+from microflow import JSONStateStore, RedisStateStore, Workflow, run_async, task
 
 
 @task(name="prepare")
@@ -35,4 +33,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
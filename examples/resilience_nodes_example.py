@@ -1,8 +1,6 @@
 """Example: retry_policy, circuit_breaker, and foreach nodes."""
 
-import asyncio
-
-from microflow import Workflow, circuit_breaker, foreach, retry_policy, task
+from microflow import Workflow, circuit_breaker, foreach, retry_policy, run_async, task
 
 
 @task(name="flaky_api")
@@ -32,4 +30,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
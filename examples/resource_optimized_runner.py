@@ -3,7 +3,7 @@
 import asyncio
 import time
 
-from microflow import Workflow, WorkflowRunner, task
+from microflow import Workflow, WorkflowRunner, run_async, task
 
 
 @task(name="io_step")
@@ -33,4 +33,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
@@ -4,7 +4,7 @@ Example demonstrating sub-workflow execution and parallel processing
 
 import asyncio
 from microflow import (
-    Workflow, task, JSONStateStore,
+    Workflow, WorkflowRunner, task, JSONStateStore, run_async,
     subworkflow, parallel_subworkflows,
     workflow_chain, if_node, conditional_task
 )
@@ -14,53 +14,36 @@ from microflow import (
 # Data Processing Sub-workflows
 # ========================================
 
+REQUIRED_FIELDS = ("user_id", "email", "data")
+
+
 def create_data_validation_workflow():
     """Sub-workflow for data validation"""
 
-    @task(name="check_required_fields")
-    def check_required_fields(ctx):
-        required = ['user_id', 'email', 'data']
-        missing = [field for field in required if not ctx.get(field)]
-
-        if missing:
-            return {
-                "validation_status": "failed",
-                "missing_fields": missing,
-                "is_valid": False
-            }
-        else:
-            return {
-                "validation_status": "passed",
-                "missing_fields": [],
-                "is_valid": True
-            }
-
-    @task(name="validate_email_format")
-    def validate_email_format(ctx):
+    # Required-field check, email check and sanitization fused into one task:
+    # each is trivial, so separate nodes would mostly pay scheduling/persistence
+    @task(name="validate_all")
+    def validate_all(ctx):
+        missing = [field for field in REQUIRED_FIELDS if not ctx.get(field)]
+
         email = ctx.get("email", "")
         is_valid_email = "@" in email and "." in email  # Simple validation
 
-        return {
-            "email_valid": is_valid_email,
-            "email_checked": True
-        }
-
-    @task(name="sanitize_data")
-    def sanitize_data(ctx):
-        data = ctx.get("data", {})
         # Simple sanitization
-        sanitized = {k: str(v).strip() if isinstance(v, str) else v for k, v in data.items()}
+        data = ctx.get("data", {})
+        sanitized = {k: v.strip() if isinstance(v, str) else v for k, v in data.items()}
 
         return {
+            "validation_status": "failed" if missing else "passed",
+            "missing_fields": missing,
+            "is_valid": not missing,
+            "email_valid": is_valid_email,
+            "email_checked": True,
             "data": sanitized,
             "data_sanitized": True
         }
 
-    # Build validation workflow
-    check_required_fields >> validate_email_format >> sanitize_data
-
-    return Workflow([check_required_fields, validate_email_format, sanitize_data],
-                   name="data_validation")
+    return Workflow([validate_all], name="data_validation")
 
 
 def create_notification_workflow():
@@ -104,16 +87,19 @@ def create_notification_workflow():
 def create_data_processing_workflow():
     """Sub-workflow for processing user data"""
 
-    @task(name="calculate_user_score")
-    def calculate_user_score(ctx):
+    # Scoring and tiering fused into one pure task: results are cached in the
+    # state store and replayed for identical input data
+    @task(name="score_user", pure=True, input_keys=["data"])
+    def score_user(ctx):
         data = ctx.get("data", {})
-        # Simple scoring algorithm
-        score = sum(int(v) if str(v).isdigit() else 0 for v in data.values())
-        return {"user_score": score}
-
-    @task(name="determine_user_tier")
-    def determine_user_tier(ctx):
-        score = ctx.get("user_score", 0)
+        # Simple scoring algorithm: non-negative ints and digit strings count
+        score = 0
+        for v in data.values():
+            if type(v) is int:
+                if v >= 0:
+                    score += v
+            elif type(v) is str and v.isdecimal():
+                score += int(v)
 
         if score >= 100:
             tier = "gold"
@@ -122,7 +108,7 @@ def create_data_processing_workflow():
         else:
             tier = "bronze"
 
-        return {"user_tier": tier}
+        return {"user_score": score, "user_tier": tier}
 
     @task(name="update_user_profile")
     async def update_user_profile(ctx):
@@ -135,10 +121,9 @@ def create_data_processing_workflow():
 
         return {"profile_updated": True}
 
-    calculate_user_score >> determine_user_tier >> update_user_profile
+    score_user >> update_user_profile
 
-    return Workflow([calculate_user_score, determine_user_tier, update_user_profile],
-                   name="data_processing")
+    return Workflow([score_user, update_user_profile], name="data_processing")
 
 
 # ========================================
@@ -153,7 +138,7 @@ async def receive_user_data(ctx):
 
     await asyncio.sleep(0.2)
 
-    return {
+    result = {
         "email": f"{user_id}@example.com",
         "data": {
             "activity_score": 75,
@@ -163,6 +148,9 @@ async def receive_user_data(ctx):
         "timestamp": "2024-01-01T10:00:00Z",
         "data_received": True
     }
+    if ctx.get("skip_email"):
+        del result["email"]  # Make data invalid
+    return result
 
 
 # Sub-workflow execution nodes
@@ -284,28 +272,37 @@ parallel_processing = parallel_subworkflows(
 )
 
 
+# Processor output key -> aggregate key
+_AGG_MAP = {
+    "ctr": "click_through_rate",
+    "engagement_score": "social_engagement",
+    "avg_session_duration": "session_duration",
+}
+
+
 @task(name="aggregate_parallel_results")
 def aggregate_parallel_results(ctx):
     """Aggregate results from parallel processing"""
     results = ctx.get("parallel_results", [])
-    successful = [r for r in results if r.get("subworkflow_success")]
 
-    print(f"📊 Parallel processing completed: {len(successful)}/{len(results)} successful")
+    # Single pass: count successes and merge the mapped keys
+    aggregate = {}
+    successful = 0
+    for result in results:
+        if not result.get("subworkflow_success"):
+            continue
+        successful += 1
+        for source_key, aggregate_key in _AGG_MAP.items():
+            if source_key in result:
+                aggregate[aggregate_key] = result[source_key]
+
+    print(f"📊 Parallel processing completed: {successful}/{len(results)} successful")
 
-    aggregate = {"parallel_processing_summary": {
+    aggregate["parallel_processing_summary"] = {
         "total_workflows": len(results),
-        "successful": len(successful),
-        "success_rate": len(successful) / len(results) if results else 0
-    }}
-
-    # Merge specific results
-    for result in successful:
-        if "ctr" in result:
-            aggregate["click_through_rate"] = result["ctr"]
-        if "engagement_score" in result:
-            aggregate["social_engagement"] = result["engagement_score"]
-        if "avg_session_duration" in result:
-            aggregate["session_duration"] = result["avg_session_duration"]
+        "successful": successful,
+        "success_rate": successful / len(results) if results else 0
+    }
 
     return aggregate
 
@@ -350,7 +347,7 @@ async def main():
     """Run the sub-workflow demonstration"""
     print("=== Sub-workflow and Parallel Processing Demo ===\n")
 
-    store = JSONStateStore("./data")
+    store = JSONStateStore.get_or_create("./data")
 
     # Test scenarios
     test_cases = [
@@ -364,41 +361,42 @@ async def main():
         }
     ]
 
-    for i, test_case in enumerate(test_cases):
-        print(f"\n🔄 Running Test Case {i+1}: {test_case['name']}")
-        print("=" * 60)
+    # The test cases are independent, so run them side by side under one runner.
+    # The DAG is built and compiled once; each run only carries its own state.
+    runner = WorkflowRunner(max_concurrent_workflows=2)
+    workflow = create_subworkflow_demo().compile()
 
-        workflow = create_subworkflow_demo()
+    async def run_case(i, test_case):
         run_id = f"subworkflow_demo_{i+1:03d}"
-
-        # Modify behavior for invalid data test
-        if "Invalid" in test_case['name']:
-            original_receive = receive_user_data.spec.fn
-
-            async def invalid_receive(ctx):
-                result = await original_receive(ctx)
-                if ctx.get("skip_email"):
-                    del result["email"]  # Make data invalid
-                return result
-
-            receive_user_data.spec.fn = invalid_receive
+        print(f"🔄 Starting Test Case {i+1}: {test_case['name']}")
 
         try:
-            final_ctx = await workflow.run(
+            final_ctx = await runner.run_workflow(
+                workflow,
                 run_id=run_id,
                 store=store,
                 initial_ctx=test_case['context']
             )
 
-            print(f"\n✅ Test Case {i+1} completed!")
-            print(f"Validation: {final_ctx.get('validation_status', 'unknown')}")
-            print(f"Processing approved: {final_ctx.get('processing_approved', False)}")
-            print(f"User tier: {final_ctx.get('user_tier', 'unknown')}")
-            print(f"Profile updated: {final_ctx.get('profile_updated', False)}")
-            print(f"Parallel success rate: {final_ctx.get('parallel_processing_summary', {}).get('success_rate', 0):.1%}")
+            summary = final_ctx.get('parallel_processing_summary', {})
+            return "\n".join([
+                f"\n✅ Test Case {i+1} completed: {test_case['name']}",
+                "=" * 60,
+                f"Validation: {final_ctx.get('validation_status', 'unknown')}",
+                f"Processing approved: {final_ctx.get('processing_approved', False)}",
+                f"User tier: {final_ctx.get('user_tier', 'unknown')}",
+                f"Profile updated: {final_ctx.get('profile_updated', False)}",
+                f"Parallel success rate: {summary.get('success_rate', 0):.1%}",
+            ])
 
         except Exception as e:
-            print(f"❌ Test Case {i+1} failed: {e}")
+            return f"❌ Test Case {i+1} failed: {e}"
+
+    reports = await asyncio.gather(
+        *(run_case(i, test_case) for i, test_case in enumerate(test_cases))
+    )
+    for report in reports:
+        print(report)
 
     print(f"\n📋 Sub-workflow execution details saved to: {store.data_dir}/runs/")
     print("\n💡 Key Features Demonstrated:")
@@ -410,4 +408,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_async(main())
\ No newline at end of file
@@ -6,9 +6,12 @@ __version__ = "0.1.0"
 __author__ = "Microflow Team"
 
 from .core.workflow import Workflow
-from .core.runner import WorkflowRunner
+from .core.runner import WorkflowRunner, run_async
 from .core.task_spec import TaskSpec, Task, task
+from .storage.buffered_store import BufferedStateStore
 from .storage.json_store import JSONStateStore
+from .storage.memory_store import MemoryStateStore
+from .storage.msgpack_store import MsgpackStateStore
 from .storage.redis_store import RedisStateStore
 from .queueing import (
     InMemoryWorkflowQueue,
@@ -34,6 +37,7 @@ from .nodes.http_request import (
     http_delete,
     webhook_call,
     rest_api_call,
+    create_http_client,
     BearerAuth,
     BasicAuth,
     APIKeyAuth,
@@ -53,6 +57,7 @@ from .nodes.data_transform import (
     csv_parse,
     data_filter,
     data_transform,
+    data_filter_transform,
 )
 from .nodes.timing import delay, wait_until, wait_for_condition, rate_limit
 from .nodes.notifications import send_email, slack_notification, simple_email
@@ -100,10 +105,14 @@ __all__ = [
     # Core components
     "Workflow",
     "WorkflowRunner",
+    "run_async",
     "task",
     "TaskSpec",
     "Task",
+    "BufferedStateStore",
     "JSONStateStore",
+    "MemoryStateStore",
+    "MsgpackStateStore",
     "RedisStateStore",
     "InMemoryWorkflowQueue",
     "RedisWorkflowQueue",
@@ -124,6 +133,7 @@ __all__ = [
     "http_delete",
     "webhook_call",
     "rest_api_call",
+    "create_http_client",
     "BearerAuth",
     "BasicAuth",
     "APIKeyAuth",
@@ -150,6 +160,7 @@ __all__ = [
     "csv_parse",
     "data_filter",
     "data_transform",
+    "data_filter_transform",
     # Timing nodes
     "delay",
     "wait_until",
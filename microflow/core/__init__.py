@@ -2,6 +2,6 @@
 
 from .task_spec import TaskSpec, Task, task
 from .workflow import Workflow
-from .runner import WorkflowRunner
+from .runner import WorkflowRunner, run_async
 
-__all__ = ["TaskSpec", "Task", "task", "Workflow", "WorkflowRunner"]
+__all__ = ["TaskSpec", "Task", "task", "Workflow", "WorkflowRunner", "run_async"]
@@ -0,0 +1,117 @@
+"""Cache keys for pure task results"""
+
+import hashlib
+from types import BuiltinFunctionType, CodeType, ModuleType
+from typing import Any, Dict, List, Optional, Set
+
+from .. import serialization
+from .expressions import CompiledExpression
+from .task_spec import TaskSpec
+
+class _Unhashable(Exception):
+    """A captured value has no stable representation; the task is not cached"""
+
+
+def _code_parts(code: CodeType, parts: List[bytes]) -> None:
+    """Append bytes identifying a code object, including nested code objects"""
+    parts.append(code.co_code)
+    parts.append(" ".join(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            # repr() of a code object contains its address, which changes per process
+            _code_parts(const, parts)
+        elif isinstance(const, frozenset):
+            # Set iteration order depends on hash randomization
+            parts.append(repr(sorted(map(repr, const))).encode("utf-8"))
+        else:
+            parts.append(repr(const).encode("utf-8"))
+
+
+def _value_parts(value: Any, parts: List[bytes], seen: Set[int]) -> None:
+    """Append bytes identifying a captured value, or raise ``_Unhashable``"""
+    if getattr(value, "__code__", None) is not None:
+        _fn_parts(value, parts, seen)
+    elif isinstance(value, ModuleType):
+        parts.append(value.__name__.encode("utf-8"))
+    elif isinstance(value, CompiledExpression):
+        parts.append(value.source.encode("utf-8"))
+    elif isinstance(value, (type, BuiltinFunctionType)):
+        parts.append(f"{value.__module__}.{value.__qualname__}".encode("utf-8"))
+    elif isinstance(value, bytes):
+        parts.append(value)
+    elif isinstance(value, frozenset):
+        parts.append(repr(sorted(map(repr, value))).encode("utf-8"))
+    else:
+        try:
+            parts.append(serialization.serialize_canonical(value, default=None))
+        except (TypeError, ValueError, RecursionError) as e:
+            raise _Unhashable(type(value).__qualname__) from e
+
+
+def _fn_parts(fn: Any, parts: List[bytes], seen: Set[int]) -> None:
+    """Append bytes for a function's code, default arguments and closure values"""
+    if id(fn) in seen:
+        # Recursive reference (e.g. a closure calling itself)
+        parts.append(b"<self>")
+        return
+    seen.add(id(fn))
+    _code_parts(fn.__code__, parts)
+    for value in getattr(fn, "__defaults__", None) or ():
+        _value_parts(value, parts, seen)
+    for name, value in sorted((getattr(fn, "__kwdefaults__", None) or {}).items()):
+        parts.append(name.encode("utf-8"))
+        _value_parts(value, parts, seen)
+    for cell in getattr(fn, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            # Empty cell
+            parts.append(b"<empty>")
+            continue
+        # Wrapped functions are hashed by their own code, other captured values
+        # (factory parameters, configs) by their canonical JSON
+        _value_parts(value, parts, seen)
+
+
+def _fn_fingerprint(fn: Any) -> Optional[bytes]:
+    """
+    Bytes identifying a function's code and the values it closes over.
+
+    None when a captured value has no stable representation (e.g. a client
+    object); such tasks are run every time instead of being cached.
+    """
+    parts: List[bytes] = []
+    try:
+        if getattr(fn, "__code__", None) is None:
+            _value_parts(fn, parts, set())
+        else:
+            _fn_parts(fn, parts, set())
+    except _Unhashable:
+        return None
+    return b"\0".join(parts)
+
+
+def task_cache_key(spec: TaskSpec, ctx: Dict[str, Any]) -> Optional[str]:
+    """
+    Hash a pure task's code and its inputs.
+
+    Only ``spec.input_keys`` are hashed when declared, otherwise every public
+    (non-underscore) ctx key. Returns None when the task's function cannot be
+    fingerprinted, in which case its result is not cached.
+    """
+    fingerprint = _fn_fingerprint(spec.fn)
+    if fingerprint is None:
+        return None
+
+    if spec.input_keys is not None:
+        inputs = {key: ctx[key] for key in spec.input_keys if key in ctx}
+    else:
+        inputs = {key: value for key, value in ctx.items() if not key.startswith("_")}
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(spec.name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(fingerprint)
+    digest.update(b"\0")
+    digest.update(serialization.serialize_canonical(inputs))
+    return digest.hexdigest()
@@ -0,0 +1,136 @@
+"""Compiled string expressions used by condition and data nodes"""
+
+import ast
+import operator
+from types import CodeType
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+# Shared globals for expressions evaluated with their variables as locals
+_SAFE_GLOBALS: Dict[str, Any] = {"__builtins__": {}}
+
+_COMPARE_OPS: Dict[Type[ast.cmpop], Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+}
+
+# (variable name, function of that variable's value)
+_Specialized = Tuple[str, Callable[[Any], Any]]
+
+
+def _key_lookup(node: ast.AST) -> Optional[_Specialized]:
+    """Match ``name['key']`` or ``name.get('key'[, default])`` with constant args."""
+    try:
+        if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name):
+            key_node = node.slice
+            if not isinstance(key_node, ast.expr):  # ast.Index on Python 3.8
+                key_node = key_node.value  # type: ignore[attr-defined]
+            if not isinstance(key_node, ast.Constant):
+                return None
+            return node.value.id, operator.itemgetter(key_node.value)
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "get"
+            and isinstance(node.func.value, ast.Name)
+            and not node.keywords
+            and 1 <= len(node.args) <= 2
+            # A list/dict/set default must be a new object on every call
+            and all(isinstance(arg, ast.Constant) for arg in node.args)
+        ):
+            args = [arg.value for arg in node.args]
+            return node.func.value.id, operator.methodcaller("get", *args)
+    except (ValueError, TypeError, SyntaxError):
+        pass
+    return None
+
+
+def _specialize(tree: ast.Expression) -> Optional[_Specialized]:
+    """
+    Build a direct function for the most common expression shapes: a key lookup
+    (``ctx['k']``, ``item.get('k')``) optionally compared against one literal.
+    """
+    body = tree.body
+    if not isinstance(body, ast.Compare):
+        return _key_lookup(body)
+    if len(body.ops) != 1:
+        return None
+    compare = _COMPARE_OPS.get(type(body.ops[0]))
+    lookup = _key_lookup(body.left)
+    if compare is None or lookup is None:
+        return None
+    try:
+        literal = ast.literal_eval(body.comparators[0])
+    except (ValueError, TypeError, SyntaxError):
+        return None
+    name, getter = lookup
+    return name, lambda value: compare(getter(value), literal)
+
+
+class CompiledExpression:
+    """
+    A Python expression compiled once and evaluated many times.
+
+    Syntax errors are kept and raised on evaluation, so a bad expression
+    surfaces through the node's usual error payload instead of at build time.
+    Simple lookups and single comparisons against a literal are evaluated by a
+    specialized function instead of ``eval``.
+    """
+
+    __slots__ = ("source", "code", "error", "specialized")
+
+    def __init__(self, source: str, filename: str = "<expression>"):
+        self.source = source
+        self.error: Optional[Exception] = None
+        self.specialized: Optional[_Specialized] = None
+        try:
+            tree = ast.parse(source, filename, "eval")
+            self.code = compile(tree, filename, "eval")
+        except (SyntaxError, ValueError) as e:
+            self.code = None
+            self.error = e
+            return
+        self.specialized = _specialize(tree)
+
+    def evaluate(self, namespace: Dict[str, Any]) -> Any:
+        """Evaluate against a globals namespace (include ``"__builtins__": {}``)."""
+        if self.specialized is not None:
+            name, fn = self.specialized
+            if name in namespace:
+                return fn(namespace[name])
+        if self.code is None:
+            raise self.error  # type: ignore[misc]
+        return eval(self.code, namespace)
+
+    def bind(self, name: str) -> Callable[[Any], Any]:
+        """
+        Return a function evaluating the expression with ``name`` bound to its argument.
+
+        Specialized expressions need no namespace at all. Expressions without
+        nested scopes share one empty-builtins globals dict and get ``name`` as a
+        local; comprehensions and generator expressions resolve free names through
+        globals, so those get a fresh globals dict per call.
+        """
+        if self.specialized is not None and self.specialized[0] == name:
+            return self.specialized[1]
+        code = self.code
+        if code is None:
+            error = self.error
+
+            def _raise(value: Any) -> Any:
+                raise error  # type: ignore[misc]
+
+            return _raise
+        if any(isinstance(const, CodeType) for const in code.co_consts):
+            return lambda value: eval(code, {name: value, "__builtins__": {}})
+        return lambda value: eval(code, _SAFE_GLOBALS, {name: value})
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.source!r})"
@@ -2,16 +2,58 @@
 
 import asyncio
 import os
-from typing import Any, Dict, Optional
+from collections import deque
+from typing import Any, Awaitable, Deque, Dict, Optional, TypeVar
 
 from .workflow import Workflow
 from ..storage.json_store import JSONStateStore
 
+uvloop: Any = None
+try:
+    import uvloop  # type: ignore[no-redef]
+except ImportError:
+    pass
+
+T = TypeVar("T")
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, preferring uvloop."""
+    return uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+
+
+def run_async(main: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion, like ``asyncio.run``.
+
+    Uses uvloop when installed. The loop keeps the default task factory;
+    ``Workflow.run`` starts its own tasks eagerly.
+    """
+    runner_cls = getattr(asyncio, "Runner", None)
+    if runner_cls is not None:
+        with runner_cls(loop_factory=_new_event_loop) as runner:
+            return runner.run(main)
+
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(main)  # type: ignore[arg-type]
+
 
 class WorkflowRunner:
-    """Run workflows with a process-wide concurrency cap."""
+    """
+    Run workflows with a process-wide concurrency cap.
 
-    def __init__(self, max_concurrent_workflows: Optional[int] = None):
+    With ``pool_http=True`` (or an explicit ``http_client``) every workflow run by
+    this runner shares one keep-alive HTTP client. A client the runner created
+    itself is closed by ``aclose()`` or when leaving ``async with runner:``.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_workflows: Optional[int] = None,
+        http_client: Optional[Any] = None,
+        pool_http: bool = False,
+    ):
         if max_concurrent_workflows is None:
             env_cap = os.getenv("MICROFLOW_MAX_CONCURRENT_WORKFLOWS")
             if env_cap:
@@ -23,7 +65,61 @@ class WorkflowRunner:
                 max_concurrent_workflows = max(1, os.cpu_count() or 1)
 
         self.max_concurrent_workflows = max(1, int(max_concurrent_workflows))
-        self._semaphore = asyncio.Semaphore(self.max_concurrent_workflows)
+        # Counter + waiter queue: an uncontended acquire never awaits
+        self._free_slots = self.max_concurrent_workflows
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self.http_client = http_client
+        self._pool_http = pool_http
+        self._owns_http_client = False
+
+    def _get_http_client(self, workflow: Workflow) -> Optional[Any]:
+        """Return the client to share with a run, creating the pooled one lazily."""
+        if self.http_client is None and self._pool_http:
+            from ..nodes.http_request import create_http_client
+
+            self.http_client = create_http_client()
+            self._owns_http_client = True
+        return workflow.http_client or self.http_client
+
+    async def _acquire(self) -> None:
+        """Take a workflow slot, waiting in FIFO order only when none are free."""
+        if self._free_slots > 0 and not self._waiters:
+            self._free_slots -= 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                self._waiters.remove(waiter)
+            else:
+                # The slot was handed over just before the cancellation
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the slot to the next waiter, or return it to the pool."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._free_slots += 1
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client if this runner created it."""
+        if self._owns_http_client and self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+            self._owns_http_client = False
+
+    async def __aenter__(self) -> "WorkflowRunner":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
 
     async def run_workflow(
         self,
@@ -33,7 +129,13 @@ class WorkflowRunner:
         initial_ctx: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Run a single workflow under the global concurrency guard."""
-        async with self._semaphore:
+        await self._acquire()
+        try:
             return await workflow.run(
-                run_id=run_id, store=store, initial_ctx=initial_ctx
+                run_id=run_id,
+                store=store,
+                initial_ctx=initial_ctx,
+                http_client=self._get_http_client(workflow),
             )
+        finally:
+            self._release()
@@ -0,0 +1,27 @@
+"""Lightweight notifications shared between the engine and nodes"""
+
+import asyncio
+from typing import Optional
+
+CTX_CHANGED_KEY = "_microflow_ctx_changed"
+
+
+class ContextChangeSignal:
+    """Wakes waiters whenever a task result is merged into the run context."""
+
+    def __init__(self):
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        """Wake all current waiters; later waiters wait for the next change."""
+        self._event.set()
+        self._event = asyncio.Event()
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the next change; returns False if the timeout elapsed first."""
+        event = self._event
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
@@ -1,10 +1,24 @@
 """Task specification and Task classes for workflow engine"""
 
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Optional, Set, Union
+from typing import Any, Awaitable, Callable, Iterable, Optional, Set, Tuple, Union
 
 
-@dataclass
+# Bumped whenever a dependency edge is added, so derived views can be cached
+_graph_version = 0
+
+
+def graph_version() -> int:
+    """Return the current task-graph version."""
+    return _graph_version
+
+
+# Slotted dataclasses need Python 3.10+; older versions keep a per-instance __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class TaskSpec:
     """Specification for a workflow task"""
 
@@ -15,11 +29,15 @@ class TaskSpec:
     timeout_s: Optional[float] = None
     tags: Set[str] = field(default_factory=set)
     description: str = ""
+    pure: bool = False
+    input_keys: Optional[Tuple[str, ...]] = None
 
 
 class Task:
     """A workflow task with dependencies"""
 
+    __slots__ = ("spec", "downstream", "upstream", "__weakref__")
+
     def __init__(self, spec: TaskSpec):
         self.spec = spec
         self.downstream: Set["Task"] = set()
@@ -27,6 +45,8 @@ class Task:
 
     def __rshift__(self, other: "Task") -> "Task":
         """Define task dependency using >> operator"""
+        global _graph_version
+        _graph_version += 1
         self.downstream.add(other)
         other.upstream.add(self)
         return other
@@ -35,6 +55,15 @@ class Task:
         return f"Task(name='{self.spec.name}')"
 
 
+def connect(edges: Iterable[Tuple[Task, Task]]) -> None:
+    """Add several ``upstream >> downstream`` edges in one call"""
+    global _graph_version
+    for upstream_task, downstream_task in edges:
+        upstream_task.downstream.add(downstream_task)
+        downstream_task.upstream.add(upstream_task)
+    _graph_version += 1
+
+
 def task(
     name: Optional[str] = None,
     max_retries: int = 0,
@@ -42,8 +71,16 @@ def task(
     timeout_s: Optional[float] = None,
     tags: Optional[Set[str]] = None,
     description: str = "",
+    pure: bool = False,
+    input_keys: Optional[Iterable[str]] = None,
 ) -> Callable:
-    """Decorator to create a workflow task"""
+    """
+    Decorator to create a workflow task.
+
+    ``pure=True`` marks the task as a function of its inputs only: results are
+    cached by the state store, keyed on the task code and the ``input_keys``
+    ctx values (all public ctx keys if not given).
+    """
 
     def decorator(fn: Union[Callable[..., Awaitable[Any]], Callable[..., Any]]) -> Task:
         spec = TaskSpec(
@@ -54,6 +91,11 @@ def task(
             timeout_s=timeout_s,
             tags=tags or set(),
             description=description,
+            pure=pure,
+            # Interned so lookups against ctx keys can match by identity
+            input_keys=(
+                tuple(map(sys.intern, input_keys)) if input_keys is not None else None
+            ),
         )
         return Task(spec)
 
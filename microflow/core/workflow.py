@@ -1,15 +1,61 @@
 """Core workflow engine implementation"""
 
 import asyncio
-import json
+import functools
 import os
+import sys
 import time
 import traceback
 import uuid
-from typing import Any, Dict, List, Optional, Set
-
-from .task_spec import Task
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .cache import task_cache_key
+from .signals import CTX_CHANGED_KEY, ContextChangeSignal
+from .task_spec import Task, connect, graph_version
+from .. import serialization
+from ..storage.buffered_store import BufferedStateStore
 from ..storage.json_store import JSONStateStore
+from ..storage.memory_store import MemoryStateStore
+
+
+class _Schedule(NamedTuple):
+    """Run-independent execution plan derived from the task graph"""
+
+    ordered_tasks: Tuple[Task, ...]
+    position: Dict[Task, int]
+    in_degree: Dict[Task, int]
+    initial_ready: Tuple[Task, ...]
+    # task -> its only downstream task, when that task has no other upstream
+    chain_next: Dict[Task, Task]
+
+
+def _task_starter() -> Callable[[Coroutine[Any, Any, Any]], "asyncio.Future[Any]"]:
+    """
+    Return a function that starts the workflow's own tasks on the running loop.
+
+    On Python 3.12+ tasks are created with ``asyncio.eager_task_factory``, so
+    tasks that finish without suspending skip the scheduler round-trip. The
+    loop's task factory is never replaced, and a loop that already has a
+    custom task factory keeps using it.
+    """
+    loop = asyncio.get_running_loop()
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is None or loop.get_task_factory() is not None:
+        return loop.create_task
+    return functools.partial(eager_task_factory, loop)
 
 
 class Workflow:
@@ -20,8 +66,13 @@ class Workflow:
         tasks: List[Task],
         name: str = "",
         max_concurrent_tasks: Optional[int] = None,
+        http_client: Optional[Any] = None,
+        offload_store_io: bool = False,
     ):
         self.tasks = tasks
+        self.http_client = http_client
+        # Coalesce state writes and perform them on a background thread
+        self.offload_store_io = offload_store_io
         self.name = name or f"workflow_{uuid.uuid4().hex[:8]}"
         if max_concurrent_tasks is None:
             env_cap = os.getenv("MICROFLOW_MAX_CONCURRENT_TASKS")
@@ -33,102 +84,258 @@ class Workflow:
             else:
                 max_concurrent_tasks = max(1, os.cpu_count() or 1)
         self.max_concurrent_tasks = max(1, int(max_concurrent_tasks))
+        self._visualize_cache: Optional[Tuple[Tuple[Any, ...], str]] = None
+        self._schedule_cache: Optional[Tuple[Tuple[Any, ...], "_Schedule"]] = None
+
+    def add_edges(self, edges: Iterable[Tuple[Task, Task]]) -> "Workflow":
+        """
+        Add dependency edges in bulk, e.g. ``wf.add_edges([(a, b), (a, c)])``.
+
+        Equivalent to ``a >> b`` for each pair; both tasks must belong to the workflow.
+        """
+        edges = list(edges)
+        members = set(self.tasks)
+        for upstream_task, downstream_task in edges:
+            for edge_task in (upstream_task, downstream_task):
+                if edge_task not in members:
+                    raise ValueError(f"Task {edge_task!r} is not part of workflow {self.name}")
+
+        connect(edges)
+        return self
+
+    def compile(self) -> "Workflow":
+        """
+        Build the execution plan now instead of on the first run.
+
+        The plan is cached and reused by every run until edges are added or the
+        task list changes; cycles raise ``RuntimeError`` here.
+        """
+        self._schedule()
+        return self
 
     def topo_sort(self) -> List[Task]:
-        """Topological sort using Kahn's algorithm"""
-        # Create a copy of upstream dependencies for each task
-        incoming = {task: set(task.upstream) for task in self.tasks}
-        ready = [task for task in self.tasks if not incoming[task]]
-        order = []
+        """Topological order of the tasks (cached until the graph changes)"""
+        return list(self._schedule().ordered_tasks)
+
+    def _kahn_order(self) -> Tuple[Task, ...]:
+        """Kahn's algorithm over task indices with an integer in-degree array"""
+        tasks = self.tasks
+        index = {task: i for i, task in enumerate(tasks)}
+        in_degree = array("i", [len(task.upstream) for task in tasks])
+        ready = deque(i for i, degree in enumerate(in_degree) if not degree)
+        order: List[int] = []
 
         while ready:
-            current = ready.pop()
+            current = ready.popleft()
             order.append(current)
 
-            # Remove this task from its downstream tasks' incoming edges
-            for downstream_task in list(current.downstream):
-                incoming[downstream_task].discard(current)
-                if not incoming[downstream_task]:
-                    ready.append(downstream_task)
-
-        if len(order) != len(self.tasks):
-            cycle_tasks = [task for task in self.tasks if task not in order]
+            # Release downstream tasks once all their upstream edges are done
+            for downstream_task in tasks[current].downstream:
+                downstream_index = index.get(downstream_task)
+                if downstream_index is None:
+                    continue
+                in_degree[downstream_index] -= 1
+                if not in_degree[downstream_index]:
+                    ready.append(downstream_index)
+
+        if len(order) != len(tasks):
+            ordered = set(order)
+            cycle_tasks = [task for i, task in enumerate(tasks) if i not in ordered]
             raise RuntimeError(
                 f"Cycle detected in workflow. Tasks in cycle: {cycle_tasks}"
             )
 
-        return order
+        return tuple(tasks[i] for i in order)
+
+    @staticmethod
+    def _run_clock() -> Callable[[], float]:
+        """
+        Epoch-seconds clock for task timestamps, anchored to the loop's monotonic time.
+
+        Timestamps stay comparable with ``time.time()`` values, but durations
+        within a run are not affected by wall-clock (NTP) adjustments.
+        """
+        loop_time = asyncio.get_running_loop().time
+        offset = time.time() - loop_time()
+        return lambda: loop_time() + offset
+
+    @staticmethod
+    def _merge_result(
+        store: JSONStateStore, run_id: str, ctx: Dict[str, Any], result: Dict[str, Any]
+    ) -> None:
+        """Merge a task's dict result into ctx and the store"""
+        ctx.update(result)
+        store.update_ctx(run_id, result)
+        ctx_changed = ctx.get(CTX_CHANGED_KEY)
+        if ctx_changed is not None:
+            ctx_changed.notify()
+
+    def _schedule(self) -> "_Schedule":
+        """
+        Topological order and initial in-degrees, computed once per graph shape.
+
+        Recomputed only when edges are added or the task list changes.
+        """
+        # Keyed on the tasks themselves, so in-place replacement is detected
+        cache_key = (graph_version(), tuple(self.tasks))
+        if self._schedule_cache is not None and self._schedule_cache[0] == cache_key:
+            return self._schedule_cache[1]
+
+        ordered_tasks = self._kahn_order()
+        position = {task: index for index, task in enumerate(ordered_tasks)}
+
+        # Linear 1-in/1-out links run back to back without a dispatcher round-trip
+        chain_next = {}
+        for task in ordered_tasks:
+            if len(task.downstream) == 1:
+                (downstream_task,) = task.downstream
+                if downstream_task in position and len(downstream_task.upstream) == 1:
+                    chain_next[task] = downstream_task
+
+        schedule = _Schedule(
+            ordered_tasks=ordered_tasks,
+            position=position,
+            in_degree={task: len(task.upstream) for task in ordered_tasks},
+            initial_ready=tuple(task for task in ordered_tasks if not task.upstream),
+            chain_next=chain_next,
+        )
+        self._schedule_cache = (cache_key, schedule)
+        return schedule
 
     async def _run_task(
-        self, store: JSONStateStore, run_id: str, task: Task, ctx: Dict[str, Any]
+        self,
+        store: JSONStateStore,
+        run_id: str,
+        task: Task,
+        ctx: Dict[str, Any],
+        clock: Callable[[], float] = time.time,
     ) -> None:
         """Execute a single task with retries and error handling"""
+        # Bind the spec fields and store methods used on every attempt once
         spec = task.spec
+        fn = spec.fn
+        name = spec.name
+        timeout_s = spec.timeout_s
+        max_retries = spec.max_retries
+        backoff_s = spec.backoff_s
+        upsert_task = store.upsert_task
         attempt = 0
+        # Ephemeral stores keep no input/output snapshots, so skip serializing them
+        record_io = getattr(store, "durable", True)
+
+        # Pure tasks replay a stored result for identical inputs
+        cache_key = None
+        if spec.pure and hasattr(store, "get_cached_result"):
+            cache_key = task_cache_key(spec, ctx)
+            cached = (
+                store.get_cached_result(cache_key) if cache_key is not None else None
+            )
+            if cached is not None:
+                now = clock()
+                self._merge_result(store, run_id, ctx, cached)
+                upsert_task(
+                    run_id,
+                    name,
+                    status="success",
+                    attempt=0,
+                    output=(
+                        serialization.dumps(cached, default=str) if record_io else None
+                    ),
+                    cached=True,
+                    started=now,
+                    finished=now,
+                )
+                return
+
+        # The input snapshot is taken once per task, not once per attempt
+        input_json = serialization.dumps(ctx, default=str) if record_io else None
 
         while True:
             attempt += 1
-            store.upsert_task(
-                run_id,
-                spec.name,
-                status="running",
-                attempt=attempt,
-                input=json.dumps(ctx, default=str),
-                output=None,
-                error=None,
-                started=time.time(),
-                finished=None,
-            )
+            started = clock()
+            running_recorded = False
 
             try:
                 # Execute the task function
-                result = spec.fn(ctx)
+                result = fn(ctx)
 
                 # Handle async functions
                 if asyncio.iscoroutine(result):
-                    if spec.timeout_s:
-                        result = await asyncio.wait_for(result, timeout=spec.timeout_s)
+                    # Only a task that can suspend is observable while running;
+                    # sync tasks get a single terminal write below
+                    upsert_task(
+                        run_id,
+                        name,
+                        status="running",
+                        attempt=attempt,
+                        input=input_json,
+                        output=None,
+                        error=None,
+                        started=started,
+                        finished=None,
+                    )
+                    running_recorded = True
+                    if timeout_s:
+                        result = await asyncio.wait_for(result, timeout=timeout_s)
                     else:
                         result = await result
 
-                # Merge result into context if it's a dict
-                if isinstance(result, dict):
-                    ctx.update(result)
-                    store.update_ctx(run_id, result)
-
-                # Mark task as successful
-                store.upsert_task(
+                # Merge result into context if it's a mapping; the exact-type
+                # check keeps the common plain-dict case off the ABC machinery
+                if type(result) is not dict and isinstance(result, Mapping):
+                    result = dict(result)
+                if type(result) is dict:
+                    self._merge_result(store, run_id, ctx, result)
+                    if cache_key is not None:
+                        store.set_cached_result(cache_key, result)
+
+                # Mark task as successful (with the start fields if not yet written)
+                start_fields = (
+                    {} if running_recorded else {"input": input_json, "started": started}
+                )
+                upsert_task(
                     run_id,
-                    spec.name,
+                    name,
                     status="success",
                     attempt=attempt,
-                    output=json.dumps(result, default=str),
+                    output=(
+                        serialization.dumps(result, default=str) if record_io else None
+                    ),
                     error=None,
-                    finished=time.time(),
+                    finished=clock(),
+                    **start_fields,
                 )
                 return
 
             except Exception as e:
-                error_msg = "".join(
-                    traceback.format_exception(type(e), e, e.__traceback__)
-                )
-                store.upsert_task(
+                # Full tracebacks are only formatted for the final failure;
+                # attempts that will be retried record the exception repr
+                final_attempt = attempt > max_retries
+                if final_attempt:
+                    error_msg = "".join(
+                        traceback.format_exception(type(e), e, e.__traceback__)
+                    )
+                else:
+                    error_msg = repr(e)
+                upsert_task(
                     run_id,
-                    spec.name,
+                    name,
                     status="error",
                     attempt=attempt,
+                    input=input_json,
                     output=None,
                     error=error_msg,
-                    finished=time.time(),
+                    started=started,
+                    finished=clock(),
                 )
 
                 # Check if we should retry
-                if attempt > spec.max_retries:
+                if final_attempt:
                     raise
 
                 # Apply backoff before retry
-                if spec.backoff_s > 0:
-                    backoff_time = spec.backoff_s * (
+                if backoff_s > 0:
+                    backoff_time = backoff_s * (
                         2 ** (attempt - 1)
                     )  # Exponential backoff
                     await asyncio.sleep(backoff_time)
@@ -138,13 +345,30 @@ class Workflow:
         run_id: Optional[str] = None,
         store: Optional[JSONStateStore] = None,
         initial_ctx: Optional[Dict[str, Any]] = None,
+        http_client: Optional[Any] = None,
+        durable: Optional[bool] = None,
     ) -> Dict[str, Any]:
-        """Execute the workflow"""
+        """
+        Execute the workflow.
+
+        ``http_client`` overrides the workflow's own pooled client for this run.
+        ``durable=False`` keeps run state in memory only (``MemoryStateStore``);
+        by default a run is ephemeral only when neither ``run_id`` nor ``store``
+        is given, as nothing then refers to the persisted run afterwards.
+        """
+        if durable is None:
+            durable = run_id is not None or store is not None
+
         if run_id is None:
             run_id = f"{self.name}_{uuid.uuid4().hex[:8]}"
 
-        if store is None:
-            store = JSONStateStore()
+        if not durable:
+            store = MemoryStateStore()
+        elif store is None:
+            store = JSONStateStore.get_or_create()
+
+        if self.offload_store_io and not isinstance(store, BufferedStateStore):
+            store = BufferedStateStore(store, background=True)
 
         if initial_ctx is None:
             initial_ctx = {}
@@ -153,54 +377,101 @@ class Workflow:
         store.init_run(run_id, initial_ctx)
 
         try:
-            # Get topological order
-            ordered_tasks = self.topo_sort()
-
-            # Track which tasks have completed successfully
-            completed_tasks: Set[Task] = set()
-            remaining_tasks = set(ordered_tasks)
-            ctx = store.get_ctx(run_id)
+            # Precomputed topological order; cycles raise here
+            schedule = self._schedule()
+            ordered_tasks = schedule.ordered_tasks
+            position = schedule.position
+
+            # In-degree of each task; a task becomes ready when it drops to zero
+            pending = dict(schedule.in_degree)
+            completed_count = 0
+            # Keys decoded from the store are fresh strings; interning them lets
+            # lookups with literal keys in task code match by identity
+            ctx = {
+                sys.intern(key) if type(key) is str else key: value
+                for key, value in store.get_ctx(run_id).items()
+            }
 
             # Add storage instance to context for sub-workflows
             ctx["_microflow_store"] = store
 
-            while remaining_tasks:
-                # Find tasks whose dependencies are all satisfied
-                ready_tasks = [
-                    task
-                    for task in remaining_tasks
-                    if all(
-                        upstream_task in completed_tasks
-                        for upstream_task in task.upstream
-                    )
-                ]
+            # Lets waiting nodes (e.g. wait_for_condition) react to merges
+            ctx[CTX_CHANGED_KEY] = ContextChangeSignal()
 
-                if not ready_tasks:
-                    store.set_run_status(run_id, "stalled")
-                    raise RuntimeError(
-                        "No runnable tasks; upstream failures or circular dependencies"
-                    )
+            # Share a pooled HTTP client with HTTP nodes
+            http_client = http_client or self.http_client
+            if http_client is not None:
+                ctx["_microflow_http_client"] = http_client
 
-                # Execute ready tasks in parallel
-                try:
-                    semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
+            semaphore = asyncio.Semaphore(self.max_concurrent_tasks)
 
-                    async def run_limited(current_task: Task) -> None:
-                        async with semaphore:
-                            await self._run_task(store, run_id, current_task, ctx)
+            chain_next = schedule.chain_next
+            clock = self._run_clock()
 
-                    await asyncio.gather(
-                        *[run_limited(current_task) for current_task in ready_tasks]
-                    )
+            async def run_limited(current_task: Task) -> Task:
+                """Run a task and any linear chain after it; return the chain's last task"""
+                nonlocal completed_count
+                async with semaphore:
+                    while True:
+                        await self._run_task(store, run_id, current_task, ctx, clock)
+                        next_task = chain_next.get(current_task)
+                        if next_task is None:
+                            return current_task
+                        # Its only dependency just finished; keep the slot
+                        completed_count += 1
+                        current_task = next_task
 
-                    # Mark tasks as completed and remove from remaining
-                    completed_tasks.update(ready_tasks)
-                    for task in ready_tasks:
-                        remaining_tasks.remove(task)
+            # Dependency-driven dispatch: each task starts as soon as its last
+            # upstream task finishes, not when its whole "wave" has finished
+            in_flight: Dict["asyncio.Future[Task]", Task] = {}
 
-                except Exception:
-                    store.set_run_status(run_id, "failed")
-                    raise
+            start_task = _task_starter()
+
+            def start(current_task: Task) -> None:
+                future = start_task(run_limited(current_task))
+                in_flight[future] = current_task
+
+            for current_task in schedule.initial_ready:
+                start(current_task)
+
+            try:
+                while in_flight:
+                    done, _ = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    # Handle simultaneous completions in topological order
+                    next_ready = []
+                    for future in sorted(
+                        done, key=lambda future: position[in_flight[future]]
+                    ):
+                        in_flight.pop(future)
+                        # Re-raise a task failure; otherwise the chain's last task
+                        task = future.result()
+                        completed_count += 1
+
+                        # Release downstream tasks whose dependencies are now satisfied
+                        for downstream_task in task.downstream:
+                            if downstream_task in pending:
+                                pending[downstream_task] -= 1
+                                if not pending[downstream_task]:
+                                    next_ready.append(downstream_task)
+                    next_ready.sort(key=position.__getitem__)
+                    for downstream_task in next_ready:
+                        start(downstream_task)
+            except BaseException:
+                # Stop the rest of the run; no task outlives a failed workflow
+                for future in in_flight:
+                    future.cancel()
+                if in_flight:
+                    await asyncio.gather(*in_flight, return_exceptions=True)
+                store.set_run_status(run_id, "failed")
+                raise
+
+            if completed_count != len(ordered_tasks):
+                store.set_run_status(run_id, "stalled")
+                raise RuntimeError(
+                    "No runnable tasks; upstream failures or circular dependencies"
+                )
 
             # All tasks completed successfully
             store.set_run_status(run_id, "success")
@@ -213,6 +484,10 @@ class Workflow:
 
     def visualize(self) -> str:
         """Generate a simple text visualization of the workflow DAG"""
+        cache_key = (graph_version(), tuple(self.tasks), self.name)
+        if self._visualize_cache is not None and self._visualize_cache[0] == cache_key:
+            return self._visualize_cache[1]
+
         lines = [f"Workflow: {self.name}"]
         lines.append("=" * 40)
 
@@ -221,4 +496,6 @@ class Workflow:
             deps_str = f" (depends on: {', '.join(deps)})" if deps else ""
             lines.append(f"- {task.spec.name}{deps_str}")
 
-        return "\n".join(lines)
+        rendered = "\n".join(lines)
+        self._visualize_cache = (cache_key, rendered)
+        return rendered
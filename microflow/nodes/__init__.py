@@ -11,6 +11,7 @@ from .data_transform import (
     csv_parse,
     data_filter,
     data_transform,
+    data_filter_transform,
 )
 from .timing import delay, wait_until, wait_for_condition, rate_limit
 from .notifications import send_email, slack_notification, simple_email
@@ -71,6 +72,7 @@ __all__ = [
     "csv_parse",
     "data_filter",
     "data_transform",
+    "data_filter_transform",
     # Timing nodes
     "delay",
     "wait_until",
@@ -1,8 +1,10 @@
 """Conditional execution nodes (IF and SWITCH)"""
 
 import asyncio
+import sys
 from typing import Any, Callable, Dict, Optional, Union
 
+from ..core.expressions import CompiledExpression
 from ..core.task_spec import task
 
 
@@ -39,30 +41,29 @@ def if_node(
         if_check >> handle_false
     """
     node_name = name or "if_condition"
+    # Result keys depend only on the node name; interned so routers reading
+    # them hit identical string objects
+    route_key = sys.intern(f"_route_{node_name}")
+    result_key = sys.intern(f"_condition_result_{node_name}")
+    error_key = sys.intern(f"_condition_error_{node_name}")
+    # String conditions are compiled once and bound to ``ctx``
+    evaluate = (
+        CompiledExpression(condition, f"<if:{node_name}>").bind("ctx")
+        if isinstance(condition, str)
+        else condition
+    )
 
     @task(name=node_name, description=f"IF condition: {condition}")
     def _if_node(ctx):
         try:
-            if isinstance(condition, str):
-                # Evaluate string expression safely
-                result = eval(condition, {"ctx": ctx, "__builtins__": {}})
-            else:
-                # Call function with context
-                result = condition(ctx)
+            result = evaluate(ctx)
 
             route = true_route if result else false_route
 
-            return {
-                f"_route_{node_name}": route,
-                f"_condition_result_{node_name}": result,
-            }
+            return {route_key: route, result_key: result}
 
         except Exception as e:
-            return {
-                f"_route_{node_name}": false_route,
-                f"_condition_result_{node_name}": False,
-                f"_condition_error_{node_name}": str(e),
-            }
+            return {route_key: false_route, result_key: False, error_key: str(e)}
 
     return _if_node
 
@@ -100,31 +101,27 @@ def switch_node(
         def process_approved(ctx): ...
     """
     node_name = name or "switch_expression"
+    route_key = sys.intern(f"_route_{node_name}")
+    value_key = sys.intern(f"_switch_value_{node_name}")
+    matched_key = sys.intern(f"_matched_case_{node_name}")
+    error_key = sys.intern(f"_switch_error_{node_name}")
+    evaluate = (
+        CompiledExpression(expression, f"<switch:{node_name}>").bind("ctx")
+        if isinstance(expression, str)
+        else expression
+    )
 
     @task(name=node_name, description=f"SWITCH on: {expression}")
     def _switch_node(ctx):
         try:
-            if isinstance(expression, str):
-                # Evaluate string expression safely
-                value = eval(expression, {"ctx": ctx, "__builtins__": {}})
-            else:
-                # Call function with context
-                value = expression(ctx)
+            value = evaluate(ctx)
 
             route = cases.get(value, default_route)
 
-            return {
-                f"_route_{node_name}": route,
-                f"_switch_value_{node_name}": value,
-                f"_matched_case_{node_name}": value in cases,
-            }
+            return {route_key: route, value_key: value, matched_key: value in cases}
 
         except Exception as e:
-            return {
-                f"_route_{node_name}": default_route,
-                f"_switch_value_{node_name}": None,
-                f"_switch_error_{node_name}": str(e),
-            }
+            return {route_key: default_route, value_key: None, error_key: str(e)}
 
     return _switch_node
 
@@ -159,27 +156,37 @@ def conditional_task(route: str, condition_node: Optional[str] = None, **task_kw
             original_task = task(**task_kwargs)(func)
             original_fn = original_task.spec.fn
 
+        is_coro = asyncio.iscoroutinefunction(original_fn)
+        skip_reason = f"Route {route} not active"
+
+        # With no condition_node, the auto-detected route key is remembered and
+        # only searched for again when a context does not contain it
+        detected_route_key = (
+            sys.intern(f"_route_{condition_node}") if condition_node else None
+        )
+
         async def conditional_wrapper(ctx):
+            nonlocal detected_route_key
             # Find the route information in context
-            route_key = None
-            if condition_node:
-                route_key = f"_route_{condition_node}"
-            else:
+            route_key = detected_route_key
+            if not condition_node and (route_key is None or route_key not in ctx):
+                route_key = None
                 # Auto-detect by looking for any route key
-                for key in ctx.keys():
+                for key in ctx:
                     if key.startswith("_route_"):
-                        route_key = key
+                        route_key = detected_route_key = key
                         break
 
             if route_key and ctx.get(route_key) == route:
                 # Route matches, execute the task
-                if asyncio.iscoroutinefunction(original_fn):
+                if is_coro:
                     return await original_fn(ctx)
                 else:
                     return original_fn(ctx)
             else:
-                # Route doesn't match, skip execution
-                return {"_skipped": True, "_reason": f"Route {route} not active"}
+                # Route doesn't match, skip execution. A fresh dict each time:
+                # wrappers (retry, timeout, tracing) update results in place
+                return {"_skipped": True, "_reason": skip_reason}
 
         # Create new task with conditional wrapper
         new_spec = original_task.spec
@@ -190,22 +197,36 @@ def conditional_task(route: str, condition_node: Optional[str] = None, **task_kw
     return decorator
 
 
-# Convenience functions for common patterns
+# Convenience functions for common patterns. They pass plain predicates to
+# if_node/switch_node (no expression evaluation); key and value are bound as
+# default arguments, and the description keeps the equivalent expression.
 def if_equals(key: str, value: Any, name: Optional[str] = None):
     """Create an IF node that checks if a context key equals a specific value"""
-    return if_node(
-        f"ctx.get('{key}') == {repr(value)}", name or f"if_{key}_equals_{value}"
+    node = if_node(
+        lambda ctx, _key=key, _value=value: ctx.get(_key) == _value,
+        name or f"if_{key}_equals_{value}",
     )
+    node.spec.description = f"IF condition: ctx.get('{key}') == {repr(value)}"
+    return node
 
 
 def if_greater_than(key: str, value: Union[int, float], name: Optional[str] = None):
     """Create an IF node that checks if a context key is greater than a value"""
-    return if_node(f"ctx.get('{key}', 0) > {value}", name or f"if_{key}_gt_{value}")
+    node = if_node(
+        lambda ctx, _key=key, _value=value: ctx.get(_key, 0) > _value,
+        name or f"if_{key}_gt_{value}",
+    )
+    node.spec.description = f"IF condition: ctx.get('{key}', 0) > {value}"
+    return node
 
 
 def if_exists(key: str, name: Optional[str] = None):
     """Create an IF node that checks if a context key exists and is truthy"""
-    return if_node(f"bool(ctx.get('{key}'))", name or f"if_{key}_exists")
+    node = if_node(
+        lambda ctx, _key=key: bool(ctx.get(_key)), name or f"if_{key}_exists"
+    )
+    node.spec.description = f"IF condition: bool(ctx.get('{key}'))"
+    return node
 
 
 def switch_on_key(
@@ -215,6 +236,11 @@ def switch_on_key(
     name: Optional[str] = None,
 ):
     """Create a SWITCH node that switches on a context key value"""
-    return switch_node(
-        f"ctx.get('{key}')", cases, default_route, name or f"switch_on_{key}"
+    node = switch_node(
+        lambda ctx, _key=key: ctx.get(_key),
+        cases,
+        default_route,
+        name or f"switch_on_{key}",
     )
+    node.spec.description = f"SWITCH on: ctx.get('{key}')"
+    return node
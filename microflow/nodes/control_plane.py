@@ -1,16 +1,140 @@
 """Control-plane and observability nodes."""
 
 import asyncio
+import functools
 import os
+import threading
 import time
-from typing import Any, Dict, Optional
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from typing import Any, Deque, Dict, NamedTuple, Optional, Tuple
 
 from ..core.task_spec import Task, task
 from ..queueing import create_workflow_queue_from_env
 
-_MEMORY_METRICS: Dict[str, Dict[str, Any]] = {}
-_MEMORY_TRACES = []
-_MEMORY_IDEMPOTENCY: Dict[str, Optional[float]] = {}
+
+class _Metric:
+    """Mutable in-memory metric series"""
+
+    __slots__ = ("name", "labels", "type", "value", "count", "sum")
+
+    def __init__(self, name: str, labels: Dict[str, Any], metric_type: str):
+        self.name = name
+        self.labels = labels
+        self.type = metric_type
+        self.value = 0.0
+        self.count = 0
+        self.sum = 0.0
+
+    def current(self) -> float:
+        """Current value; timers report the mean, computed on read"""
+        if self.type == "timer":
+            return self.sum / self.count if self.count else 0.0
+        return self.value
+
+    def to_dict(self) -> Dict[str, Any]:
+        snapshot = {attr: getattr(self, attr) for attr in self.__slots__}
+        snapshot["value"] = self.current()
+        return snapshot
+
+
+class _Span(NamedTuple):
+    """Finished trace span (append-only)"""
+
+    span_name: str
+    start_time: float
+    end_time: float
+    duration_s: float
+    success: bool
+    error: Optional[str]
+    attributes: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+def _env_limit(name: str, default: int) -> int:
+    """Positive int from an environment variable; empty or invalid values use the default"""
+    value = os.getenv(name)
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            pass
+    return default
+
+
+# Spans kept in memory; the oldest are dropped once the cap is reached
+_MAX_MEMORY_TRACES = _env_limit("MICROFLOW_TRACE_LIMIT", 10000)
+# Idempotency keys kept in memory before expired and then TTL-less keys are dropped
+_MAX_IDEMPOTENCY_KEYS = _env_limit("MICROFLOW_IDEMPOTENCY_LIMIT", 10000)
+# Idempotency entries checked for expiry on each memory-provider guard call
+_IDEMPOTENCY_SWEEP = 4
+
+_MEMORY_METRICS: Dict[str, _Metric] = {}
+# Guards series creation and read-modify-write updates across threads
+_METRICS_LOCK = threading.Lock()
+_MEMORY_TRACES: Deque[_Span] = deque(maxlen=_MAX_MEMORY_TRACES)
+# Key -> time.monotonic() expiry (None = never expires)
+_MEMORY_IDEMPOTENCY: "OrderedDict[str, Optional[float]]" = OrderedDict()
+# Keys without a TTL in insertion order, the only ones evicted while still live
+_IDEMPOTENCY_NO_TTL: "OrderedDict[str, None]" = OrderedDict()
+
+
+def _sweep_idempotency(now: float) -> None:
+    """Drop expired entries from the oldest end; live entries rotate to the back"""
+    for _ in range(min(_IDEMPOTENCY_SWEEP, len(_MEMORY_IDEMPOTENCY))):
+        key = next(iter(_MEMORY_IDEMPOTENCY))
+        expires_at = _MEMORY_IDEMPOTENCY[key]
+        if expires_at is not None and expires_at <= now:
+            del _MEMORY_IDEMPOTENCY[key]
+        else:
+            _MEMORY_IDEMPOTENCY.move_to_end(key)
+
+
+def _cap_idempotency(now: float) -> None:
+    """Bound the memory provider: drop expired keys, then the oldest TTL-less keys"""
+    if len(_MEMORY_IDEMPOTENCY) <= _MAX_IDEMPOTENCY_KEYS:
+        return
+    expired = [
+        key
+        for key, expires_at in _MEMORY_IDEMPOTENCY.items()
+        if expires_at is not None and expires_at <= now
+    ]
+    for key in expired:
+        del _MEMORY_IDEMPOTENCY[key]
+    while len(_MEMORY_IDEMPOTENCY) > _MAX_IDEMPOTENCY_KEYS and _IDEMPOTENCY_NO_TTL:
+        key, _ = _IDEMPOTENCY_NO_TTL.popitem(last=False)
+        _MEMORY_IDEMPOTENCY.pop(key, None)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_queue(provider: Optional[str], kwargs_items: Tuple) -> Tuple[str, object]:
+    return create_workflow_queue_from_env(provider=provider, **dict(kwargs_items))
+
+
+def _get_queue(
+    provider: Optional[str], queue_kwargs: Optional[Dict[str, Any]]
+) -> Tuple[str, object]:
+    """
+    Return ``(provider, queue)``, reusing the queue client across calls.
+
+    Clients are cached per provider and kwargs, so environment variables are
+    read when a configuration is first used. Unhashable kwargs skip the cache.
+    """
+    kwargs_items = tuple(sorted((queue_kwargs or {}).items()))
+    try:
+        return _cached_queue(provider, kwargs_items)
+    except TypeError:
+        return create_workflow_queue_from_env(provider=provider, **dict(kwargs_items))
+
+
+@functools.lru_cache(maxsize=8)
+def _redis_client(url: str) -> Any:
+    """Redis client per URL, so guards share one connection pool"""
+    import redis  # type: ignore[import-not-found]
+
+    return redis.Redis.from_url(url)
 
 
 def _safe_numeric(value: Any, default: float) -> float:
@@ -42,6 +166,8 @@ def metrics_emit(
 ):
     """Emit metrics to configured provider (memory currently supported)."""
     node_name = name or f"metrics_emit_{metric_name}"
+    # Labels are fixed per node, so the series key is built once
+    metric_key = _metric_key(metric_name, labels)
 
     @task(name=node_name, description=f"Emit metric '{metric_name}'")
     def _metrics_emit(ctx):
@@ -51,42 +177,35 @@ def metrics_emit(
                 "metric_error": f"Unsupported provider: {provider}",
             }
 
-        metric_key = _metric_key(metric_name, labels)
-        metric = _MEMORY_METRICS.setdefault(
-            metric_key,
-            {
-                "name": metric_name,
-                "labels": labels or {},
-                "type": metric_type,
-                "value": 0.0,
-                "count": 0,
-                "sum": 0.0,
-            },
-        )
-
-        value = _safe_numeric(ctx.get(value_key) if value_key else None, 1.0)
-
-        if metric_type == "counter":
-            metric["value"] += value
-        elif metric_type == "gauge":
-            metric["value"] = value
-        elif metric_type == "timer":
-            metric["count"] += 1
-            metric["sum"] += value
-            metric["value"] = (
-                metric["sum"] / metric["count"] if metric["count"] else 0.0
-            )
-        else:
+        if metric_type not in ("counter", "gauge", "timer"):
             return {
                 "metric_success": False,
                 "metric_error": f"Unsupported metric_type: {metric_type}",
             }
 
+        value = _safe_numeric(ctx.get(value_key) if value_key else None, 1.0)
+
+        with _METRICS_LOCK:
+            metric = _MEMORY_METRICS.get(metric_key)
+            if metric is None:
+                metric = _MEMORY_METRICS[metric_key] = _Metric(
+                    metric_name, labels or {}, metric_type
+                )
+
+            if metric_type == "counter":
+                metric.value += value
+            elif metric_type == "gauge":
+                metric.value = value
+            else:
+                metric.count += 1
+                metric.sum += value
+            current = metric.current()
+
         return {
             output_key: {
                 "metric_name": metric_name,
                 "metric_type": metric_type,
-                "metric_value": metric["value"],
+                "metric_value": current,
                 "labels": labels or {},
             },
             "metric_success": True,
@@ -103,44 +222,48 @@ def trace_span(
     provider: str = "memory",
     name: Optional[str] = None,
 ):
-    """Wrap a task with tracing span metadata."""
+    """
+    Wrap a task with tracing span metadata.
+
+    The span node is async only when the wrapped task is, so synchronous tasks
+    are traced without a coroutine round-trip.
+    """
     span_label = span_name or wrapped_task.spec.name
     node_name = name or f"trace_span_{wrapped_task.spec.name}"
-
-    @task(name=node_name, description=f"Trace span for {wrapped_task.spec.name}")
-    async def _trace_span(ctx):
-        start = time.time()
-        error = None
-        wrapped_result: Any = None
-
-        try:
-            wrapped_result = wrapped_task.spec.fn(ctx)
-            if asyncio.iscoroutine(wrapped_result):
-                wrapped_result = await wrapped_result
-            success = True
-        except Exception as e:
-            success = False
-            error = str(e)
-
-        end = time.time()
-        span = {
-            "span_name": span_label,
-            "start_time": start,
-            "end_time": end,
-            "duration_s": end - start,
-            "success": success,
-            "error": error,
-            "attributes": attributes or {},
-        }
+    span_attributes = attributes or {}
+
+    def _finish_span(
+        start: float,
+        started: float,
+        wrapped_result: Any,
+        success: bool,
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        # Wall-clock start for the record, perf_counter for the duration
+        duration = time.perf_counter() - started
+        record = _Span(
+            span_label,
+            start,
+            start + duration,
+            duration,
+            success,
+            error,
+            span_attributes,
+        )
 
         if provider == "memory":
-            _MEMORY_TRACES.append(span)
+            _MEMORY_TRACES.append(record)
         else:
             return {
                 "trace_success": False,
                 "trace_error": f"Unsupported provider: {provider}",
             }
 
+        span = record.to_dict()
+
+        if isinstance(wrapped_result, Mapping) and not isinstance(wrapped_result, dict):
+            # Read-only results (e.g. skipped conditional tasks) are copied
+            wrapped_result = dict(wrapped_result)
         if isinstance(wrapped_result, dict):
             wrapped_result.update(
                 {
@@ -158,20 +281,67 @@ def trace_span(
             "trace_provider": provider,
         }
 
-    return _trace_span
+    description = f"Trace span for {wrapped_task.spec.name}"
+
+    async def _await_span(start: float, started: float, pending: Any):
+        try:
+            wrapped_result = await pending
+        except Exception as e:
+            return _finish_span(start, started, None, False, str(e))
+        return _finish_span(start, started, wrapped_result, True)
+
+    if asyncio.iscoroutinefunction(wrapped_task.spec.fn):
+
+        @task(name=node_name, description=description)
+        async def _trace_span(ctx):
+            start, started = time.time(), time.perf_counter()
+            try:
+                wrapped_result = wrapped_task.spec.fn(ctx)
+            except Exception as e:
+                return _finish_span(start, started, None, False, str(e))
+            if asyncio.iscoroutine(wrapped_result):
+                return await _await_span(start, started, wrapped_result)
+            return _finish_span(start, started, wrapped_result, True)
+
+        return _trace_span
+
+    @task(name=node_name, description=description)
+    def _trace_span_sync(ctx):
+        start, started = time.time(), time.perf_counter()
+        try:
+            wrapped_result = wrapped_task.spec.fn(ctx)
+        except Exception as e:
+            return _finish_span(start, started, None, False, str(e))
+        if asyncio.iscoroutine(wrapped_result):
+            # spec.fn was swapped for an async function after wrapping;
+            # the engine awaits the returned coroutine
+            return _await_span(start, started, wrapped_result)
+        return _finish_span(start, started, wrapped_result, True)
+
+    return _trace_span_sync
+
+
+_DECISION_MAP: Dict[str, bool] = {
+    "approve": True,
+    "approved": True,
+    "yes": True,
+    "y": True,
+    "true": True,
+    "1": True,
+    "reject": False,
+    "rejected": False,
+    "no": False,
+    "n": False,
+    "false": False,
+    "0": False,
+}
 
 
 def _resolve_decision(raw: Any) -> Optional[bool]:
-    if isinstance(raw, bool):
-        return raw
-    if isinstance(raw, (int, float)):
-        return bool(raw)
     if isinstance(raw, str):
-        lowered = raw.strip().lower()
-        if lowered in {"approve", "approved", "yes", "y", "true", "1"}:
-            return True
-        if lowered in {"reject", "rejected", "no", "n", "false", "0"}:
-            return False
+        return _DECISION_MAP.get(raw.strip().lower())
+    if isinstance(raw, (bool, int, float)):
+        return bool(raw)
     return None
 
 
@@ -186,21 +356,16 @@ def human_approval(
 ):
     """Evaluate approval decision from context keys."""
     node_name = name or "human_approval"
+    default_approved = _DECISION_MAP.get(default_decision.strip().lower()) is True
+    node_decision_key = f"{decision_key}_{node_name}"
 
     @task(name=node_name, description="Human approval gate")
     def _human_approval(ctx):
-        raw_decision = ctx.get(f"{decision_key}_{node_name}", ctx.get(decision_key))
+        raw_decision = ctx.get(node_decision_key, ctx.get(decision_key))
         parsed = _resolve_decision(raw_decision)
 
         if parsed is None:
-            parsed = default_decision.strip().lower() in {
-                "approve",
-                "approved",
-                "yes",
-                "y",
-                "true",
-                "1",
-            }
+            parsed = default_approved
             status = "defaulted"
         else:
             status = "provided"
@@ -245,10 +410,7 @@ def queue_publish(
         if not isinstance(payload, dict):
             payload = {"value": payload}
 
-        queue_provider, queue = create_workflow_queue_from_env(
-            provider=provider,
-            **(queue_kwargs or {}),
-        )
+        queue_provider, queue = _get_queue(provider, queue_kwargs)
         message_id = queue.enqueue(payload)
 
         return {
@@ -273,10 +435,7 @@ def queue_consume(
 
     @task(name=node_name, description="Consume message from queue")
     def _queue_consume(ctx):
-        queue_provider, queue = create_workflow_queue_from_env(
-            provider=provider,
-            **(queue_kwargs or {}),
-        )
+        queue_provider, queue = _get_queue(provider, queue_kwargs)
 
         msg = queue.reserve(block_timeout_s=block_timeout_s)
         if msg is None:
@@ -320,9 +479,9 @@ def idempotency_guard(
         except Exception:
             resolved_key = key
 
-        now = time.time()
-
         if provider == "memory":
+            # Monotonic clock: wall-clock steps cannot revive or expire guards
+            now = time.monotonic()
             expires_at = _MEMORY_IDEMPOTENCY.get(resolved_key)
             if expires_at is not None and expires_at > now:
                 duplicate = True
@@ -333,19 +492,23 @@ def idempotency_guard(
 
             if not duplicate:
                 _MEMORY_IDEMPOTENCY[resolved_key] = (now + ttl_s) if ttl_s else None
+                _MEMORY_IDEMPOTENCY.move_to_end(resolved_key)
+                if not ttl_s:
+                    _IDEMPOTENCY_NO_TTL[resolved_key] = None
+                _cap_idempotency(now)
+            _sweep_idempotency(now)
 
         elif provider == "redis":
             try:
-                import redis  # type: ignore[import-not-found]
+                client = _redis_client(
+                    os.getenv("REDIS_URL", "redis://localhost:6379/0")
+                )
             except ImportError:
                 return {
                     "idempotency_success": False,
                     "idempotency_error": "redis is required for provider='redis'",
                 }
 
-            client = redis.Redis.from_url(
-                os.getenv("REDIS_URL", "redis://localhost:6379/0")
-            )
             redis_key = f"microflow:idempotency:{resolved_key}"
             if ttl_s:
                 was_set = client.set(redis_key, "1", ex=ttl_s, nx=True)
@@ -1,27 +1,150 @@
 """Data format conversion nodes for CSV, Excel, and JSON operations"""
 
 import csv
-import json
+import importlib.metadata
+import importlib.util
 import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from ..core.task_spec import task
+from ..serialization import dumps_bytes
 
-# Note: pandas and openpyxl are optional dependencies for Excel support
-try:
-    import pandas as pd  # type: ignore[import-untyped]
 
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
+def _installed(module: str) -> bool:
+    """Whether a module can be imported, without importing it"""
+    return importlib.util.find_spec(module) is not None
+
+
+# Note: pandas and openpyxl are optional dependencies for Excel support. They
+# are only located here and imported on first use (see _pandas), so CSV-only
+# workflows do not pay their import time
+pd: Any = None
+PANDAS_AVAILABLE = _installed("pandas")
+OPENPYXL_AVAILABLE = _installed("openpyxl")
+
+# openpyxl reads and writes workbook XML through lxml when it is importable and
+# falls back to much slower pure-Python serialization otherwise
+LXML_AVAILABLE = _installed("lxml")
+
+_lxml_warned = False
 
+# xlsxwriter, when installed, writes workbooks in constant-memory mode
+xlsxwriter: Any = None
 try:
-    import openpyxl  # type: ignore[import-untyped]  # noqa: F401
+    import xlsxwriter  # type: ignore[import-not-found,no-redef]
+except ImportError:
+    pass
+
+XLSXWRITER_AVAILABLE = xlsxwriter is not None
 
-    OPENPYXL_AVAILABLE = True
+# rustpy-xlsxwriter (Rust xlsx writer) is used for engine="rustpy"
+rustpy_xlsxwriter: Any = None
+try:
+    import rustpy_xlsxwriter  # type: ignore[import-not-found,no-redef]
 except ImportError:
-    OPENPYXL_AVAILABLE = False
+    pass
+
+EXCEL_WRITE_ENGINES = ("auto", "rustpy")
+
+# python-calamine (Rust xlsx/xls parser) is read through pandas >= 2.2 when
+# installed, and then openpyxl is not needed for reading
+CALAMINE_AVAILABLE = _installed("python_calamine")
+
+EXCEL_READ_ENGINE: Optional[str] = (
+    "calamine"
+    if CALAMINE_AVAILABLE
+    and PANDAS_AVAILABLE
+    and tuple(
+        int(part) for part in importlib.metadata.version("pandas").split(".")[:2]
+    )
+    >= (2, 2)
+    else None
+)
+
+# pyarrow is optional: engine="pyarrow" uses its multi-threaded CSV parser, and
+# excel_write's pandas fallback builds its DataFrame through an Arrow table.
+# Like pandas, it is imported on first use (see _pyarrow)
+pa: Any = None
+pacsv: Any = None
+PYARROW_AVAILABLE = _installed("pyarrow")
+
+CSV_ENGINES = ("python", "pyarrow")
+
+# Suffixes pyarrow decompresses transparently when given a path
+_ARROW_COMPRESSED_SUFFIXES = (".gz", ".bz2", ".lz4", ".zst", ".br")
+
+# CSV files are written through a 1 MiB buffer instead of the default 8 KiB,
+# so large exports issue far fewer write() calls
+CSV_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _pandas() -> Any:
+    """Import pandas on first use"""
+    global pd
+    if pd is None:
+        import pandas as pd  # type: ignore[import-untyped,no-redef]
+    return pd
+
+
+def _pyarrow() -> Tuple[Any, Any]:
+    """Import pyarrow and pyarrow.csv on first use"""
+    global pa, pacsv
+    if pacsv is None:
+        import pyarrow as pa  # type: ignore[import-not-found,no-redef]
+        import pyarrow.csv as pacsv  # type: ignore[import-not-found,no-redef]
+    return pa, pacsv
+
+
+def _csv_engine_error(engine: str) -> Optional[str]:
+    """Error message for an unusable CSV engine, or None"""
+    if engine not in CSV_ENGINES:
+        return f"Unknown CSV engine: {engine!r} (expected one of {CSV_ENGINES})"
+    if engine == "pyarrow" and not PYARROW_AVAILABLE:
+        return "pyarrow is required for engine='pyarrow'. Install with: pip install pyarrow"
+    return None
+
+
+def _read_csv_pyarrow(
+    file_path: str, delimiter: str, encoding: str, has_header: bool
+) -> List[Any]:
+    """
+    Read a CSV file with pyarrow into row dicts (or row lists without a header).
+
+    Uncompressed files are memory-mapped, so the parser reads straight from the
+    page cache instead of copying the file through read() buffers.
+    """
+    pa, pacsv = _pyarrow()
+    read_options = pacsv.ReadOptions(
+        encoding=encoding, autogenerate_column_names=not has_header
+    )
+    parse_options = pacsv.ParseOptions(delimiter=delimiter)
+    if file_path.lower().endswith(_ARROW_COMPRESSED_SUFFIXES):
+        # Let pyarrow detect and decompress by extension
+        table = pacsv.read_csv(
+            file_path, read_options=read_options, parse_options=parse_options
+        )
+    else:
+        with pa.memory_map(file_path, "r") as source:
+            table = pacsv.read_csv(
+                source, read_options=read_options, parse_options=parse_options
+            )
+    if has_header:
+        return table.to_pylist()
+    return [list(row) for row in zip(*table.to_pydict().values())]
+
+
+def _read_csv_python(
+    file_path: str, delimiter: str, encoding: str, has_header: bool
+) -> List[Any]:
+    """Read a CSV file with the stdlib csv module"""
+    with open(file_path, "r", encoding=encoding, newline="") as csvfile:
+        if has_header:
+            return list(csv.DictReader(csvfile, delimiter=delimiter))
+        return [list(row) for row in csv.reader(csvfile, delimiter=delimiter)]
 
 
 def csv_read(
@@ -31,6 +154,7 @@ def csv_read(
     has_header: bool = True,
     output_key: str = "csv_data",
     name: Optional[str] = None,
+    engine: str = "python",
 ):
     """
     Read CSV file and convert to list of dictionaries.
@@ -42,27 +166,26 @@ def csv_read(
         has_header: Whether first row contains headers
         output_key: Context key to store data
         name: Node name
+        engine: "python" (stdlib csv, all values are strings) or "pyarrow"
+            (requires pyarrow; much faster on large files, infers column types)
     """
     node_name = name or f"csv_read_{Path(file_path).stem}"
 
     @task(name=node_name, description=f"Read CSV: {file_path}")
     def _csv_read(ctx):
         try:
-            if not os.path.exists(file_path):
+            engine_error = _csv_engine_error(engine)
+            if engine_error:
                 return {
                     "csv_success": False,
-                    "csv_error": f"File not found: {file_path}",
+                    "csv_error": engine_error,
                     "file_path": file_path,
                 }
 
-            data = []
-            with open(file_path, "r", encoding=encoding, newline="") as csvfile:
-                if has_header:
-                    reader = csv.DictReader(csvfile, delimiter=delimiter)
-                    data = list(reader)
-                else:
-                    reader = csv.reader(csvfile, delimiter=delimiter)
-                    data = [list(row) for row in reader]
+            if engine == "pyarrow":
+                data = _read_csv_pyarrow(file_path, delimiter, encoding, has_header)
+            else:
+                data = _read_csv_python(file_path, delimiter, encoding, has_header)
 
             return {
                 output_key: data,
@@ -72,6 +195,12 @@ def csv_read(
                 "csv_has_header": has_header,
             }
 
+        except FileNotFoundError:
+            return {
+                "csv_success": False,
+                "csv_error": f"File not found: {file_path}",
+                "file_path": file_path,
+            }
         except Exception as e:
             return {
                 "csv_success": False,
@@ -122,21 +251,7 @@ def csv_write(
             # Ensure output directory exists
             Path(file_path).parent.mkdir(parents=True, exist_ok=True)
 
-            with open(file_path, "w", encoding=encoding, newline="") as csvfile:
-                if isinstance(data[0], dict):
-                    # Write dictionary data
-                    fieldnames = data[0].keys()
-                    writer = csv.DictWriter(
-                        csvfile, fieldnames=fieldnames, delimiter=delimiter
-                    )
-
-                    if write_header:
-                        writer.writeheader()
-                    writer.writerows(data)
-                else:
-                    # Write list data
-                    writer = csv.writer(csvfile, delimiter=delimiter)
-                    writer.writerows(data)
+            _write_csv_rows(file_path, data, delimiter, encoding, write_header)
 
             return {
                 "csv_success": True,
@@ -157,22 +272,27 @@ def csv_write(
 
 def excel_read(
     file_path: str,
-    sheet_name: Union[str, int] = 0,
+    sheet_name: Union[str, int, None] = 0,
     has_header: bool = True,
     output_key: str = "excel_data",
     name: Optional[str] = None,
+    parallel_sheets: bool = False,
 ):
     """
     Read Excel file and convert to list of dictionaries.
 
     Args:
         file_path: Path to Excel file
-        sheet_name: Sheet name or index (0-based)
+        sheet_name: Sheet name or index (0-based); None reads every sheet into
+            a ``{sheet name: rows}`` dict
         has_header: Whether first row contains headers
         output_key: Context key to store data
         name: Node name
+        parallel_sheets: With sheet_name=None, parse each sheet in its own
+            worker process (pays off for large multi-sheet workbooks)
 
-    Note: Requires pandas and openpyxl to be installed
+    Note: Requires pandas and openpyxl to be installed; openpyxl is much faster
+    with lxml installed (a warning is emitted once when it is missing)
     """
     node_name = name or f"excel_read_{Path(file_path).stem}"
 
@@ -185,39 +305,41 @@ def excel_read(
                     "excel_error": "pandas is required for Excel operations. Install with: pip install pandas",
                 }
 
-            if not OPENPYXL_AVAILABLE:
+            if not OPENPYXL_AVAILABLE and EXCEL_READ_ENGINE is None:
                 return {
                     "excel_success": False,
                     "excel_error": "openpyxl is required for Excel operations. Install with: pip install openpyxl",
                 }
 
-            if not os.path.exists(file_path):
-                return {
-                    "excel_success": False,
-                    "excel_error": f"File not found: {file_path}",
-                    "file_path": file_path,
-                }
+            if EXCEL_READ_ENGINE is None:
+                _warn_if_lxml_missing()
 
             # Read Excel file
-            header = 0 if has_header else None
-            df = pd.read_excel(file_path, sheet_name=sheet_name, header=header)
-
-            # Convert to list of dictionaries
-            if has_header:
-                data = df.to_dict("records")
+            if sheet_name is None:
+                sheets = _read_excel_all_sheets(file_path, has_header, parallel_sheets)
+                data: Any = {sheet: rows for sheet, (rows, _) in sheets.items()}
+                row_count = sum(len(rows) for rows in data.values())
+                columns: Any = {sheet: count for sheet, (_, count) in sheets.items()}
             else:
-                data = df.values.tolist()
+                data, columns = _read_excel_sheet(file_path, sheet_name, has_header)
+                row_count = len(data)
 
             return {
                 output_key: data,
                 "excel_success": True,
-                "excel_rows": len(data),
-                "excel_columns": len(df.columns),
+                "excel_rows": row_count,
+                "excel_columns": columns,
                 "excel_file_path": file_path,
                 "excel_sheet_name": sheet_name,
                 "excel_has_header": has_header,
             }
 
+        except FileNotFoundError:
+            return {
+                "excel_success": False,
+                "excel_error": f"File not found: {file_path}",
+                "file_path": file_path,
+            }
         except Exception as e:
             return {
                 "excel_success": False,
@@ -234,6 +356,7 @@ def excel_write(
     sheet_name: str = "Sheet1",
     write_header: bool = True,
     name: Optional[str] = None,
+    engine: str = "auto",
 ):
     """
     Write data to Excel file.
@@ -244,26 +367,39 @@ def excel_write(
         sheet_name: Sheet name
         write_header: Whether to write header row
         name: Node name
+        engine: "auto" (xlsxwriter if installed, else pandas + openpyxl) or
+            "rustpy" (rustpy-xlsxwriter; used for dict rows with a header row,
+            other data falls back to "auto")
 
-    Note: Requires pandas and openpyxl to be installed
+    Note: Requires xlsxwriter, or pandas and openpyxl, to be installed. With
+    xlsxwriter, rows are streamed to disk in constant-memory mode; the openpyxl
+    path is much faster with lxml installed.
     """
     node_name = name or f"excel_write_{Path(file_path).stem}"
 
     @task(name=node_name, description=f"Write Excel: {file_path}")
     def _excel_write(ctx):
         try:
-            if not PANDAS_AVAILABLE:
+            if engine not in EXCEL_WRITE_ENGINES:
                 return {
                     "excel_success": False,
-                    "excel_error": "pandas is required for Excel operations. Install with: pip install pandas",
+                    "excel_error": f"Unknown Excel engine: {engine!r} (expected one of {EXCEL_WRITE_ENGINES})",
                 }
 
-            if not OPENPYXL_AVAILABLE:
+            if engine == "rustpy" and rustpy_xlsxwriter is None:
                 return {
                     "excel_success": False,
-                    "excel_error": "openpyxl is required for Excel operations. Install with: pip install openpyxl",
+                    "excel_error": (
+                        "rustpy-xlsxwriter is required for engine='rustpy'. "
+                        "Install with: pip install rustpy-xlsxwriter"
+                    ),
                 }
 
+            if engine == "auto":
+                dependency_error = _excel_write_dependency_error()
+                if dependency_error:
+                    return {"excel_success": False, "excel_error": dependency_error}
+
             data = ctx.get(data_key)
             if data is None:
                 return {
@@ -280,20 +416,34 @@ def excel_write(
             # Ensure output directory exists
             Path(file_path).parent.mkdir(parents=True, exist_ok=True)
 
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
-
-            # Write to Excel
-            df.to_excel(
-                file_path, sheet_name=sheet_name, index=False, header=write_header
+            use_rustpy = (
+                engine == "rustpy" and write_header and isinstance(data[0], dict)
             )
+            if engine == "rustpy" and not use_rustpy:
+                dependency_error = _excel_write_dependency_error()
+                if dependency_error:
+                    return {"excel_success": False, "excel_error": dependency_error}
+
+            if use_rustpy:
+                columns_written = _write_xlsx_rustpy(file_path, sheet_name, data)
+            elif XLSXWRITER_AVAILABLE:
+                columns_written = _write_xlsx_streaming(
+                    file_path, sheet_name, data, write_header
+                )
+            else:
+                _warn_if_lxml_missing()
+                df = _rows_to_dataframe(data)
+                df.to_excel(
+                    file_path, sheet_name=sheet_name, index=False, header=write_header
+                )
+                columns_written = len(df.columns)
 
             return {
                 "excel_success": True,
                 "excel_file_path": file_path,
                 "excel_sheet_name": sheet_name,
                 "excel_rows_written": len(data),
-                "excel_columns_written": len(df.columns),
+                "excel_columns_written": columns_written,
                 "excel_write_header": write_header,
             }
 
@@ -348,33 +498,12 @@ def json_to_csv(
                     "conversion_error": "Data list is empty",
                 }
 
-            # Flatten nested objects if requested
-            if flatten_nested:
-                flattened_data = []
-                for item in data:
-                    if isinstance(item, dict):
-                        flat_item = {}
-                        _flatten_dict(item, flat_item)
-                        flattened_data.append(flat_item)
-                    else:
-                        flattened_data.append(item)
-                data = flattened_data
-
             # Ensure output directory exists
             Path(output_file).parent.mkdir(parents=True, exist_ok=True)
 
-            # Write CSV
-            with open(output_file, "w", newline="", encoding="utf-8") as csvfile:
-                if isinstance(data[0], dict):
-                    fieldnames = data[0].keys()
-                    writer = csv.DictWriter(
-                        csvfile, fieldnames=fieldnames, delimiter=delimiter
-                    )
-                    writer.writeheader()
-                    writer.writerows(data)
-                else:
-                    writer = csv.writer(csvfile, delimiter=delimiter)
-                    writer.writerows(data)
+            # Write CSV, flattening nested objects row by row if requested
+            rows = _flattened_rows(data) if flatten_nested else data
+            _write_csv_rows(output_file, rows, delimiter, "utf-8", True)
 
             return {
                 "conversion_success": True,
@@ -399,6 +528,7 @@ def csv_to_json(
     output_key: str = "json_data",
     delimiter: str = ",",
     name: Optional[str] = None,
+    engine: str = "python",
 ):
     """
     Convert CSV file to JSON format.
@@ -409,24 +539,26 @@ def csv_to_json(
         output_key: Context key to store JSON data
         delimiter: CSV delimiter
         name: Node name
+        engine: "python" (stdlib csv) or "pyarrow" (see ``csv_read``)
     """
     node_name = name or f"csv_to_json_{Path(file_path).stem}"
 
     @task(name=node_name, description=f"Convert CSV to JSON: {file_path}")
     def _csv_to_json(ctx):
         try:
-            if not os.path.exists(file_path):
+            engine_error = _csv_engine_error(engine)
+            if engine_error:
                 return {
                     "conversion_success": False,
-                    "conversion_error": f"File not found: {file_path}",
+                    "conversion_error": engine_error,
                     "file_path": file_path,
                 }
 
             # Read CSV
-            data = []
-            with open(file_path, "r", encoding="utf-8", newline="") as csvfile:
-                reader = csv.DictReader(csvfile, delimiter=delimiter)
-                data = list(reader)
+            if engine == "pyarrow":
+                data = _read_csv_pyarrow(file_path, delimiter, "utf-8", True)
+            else:
+                data = _read_csv_python(file_path, delimiter, "utf-8", True)
 
             result = {
                 output_key: data,
@@ -437,13 +569,17 @@ def csv_to_json(
 
             # Write JSON file if requested
             if output_file:
-                Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-                with open(output_file, "w", encoding="utf-8") as jsonfile:
-                    json.dump(data, jsonfile, indent=2, ensure_ascii=False)
+                _write_json_file(output_file, data)
                 result["output_file"] = output_file
 
             return result
 
+        except FileNotFoundError:
+            return {
+                "conversion_success": False,
+                "conversion_error": f"File not found: {file_path}",
+                "file_path": file_path,
+            }
         except Exception as e:
             return {
                 "conversion_success": False,
@@ -456,22 +592,27 @@ def csv_to_json(
 
 def excel_to_json(
     file_path: str,
-    sheet_name: Union[str, int] = 0,
+    sheet_name: Union[str, int, None] = 0,
     output_file: Optional[str] = None,
     output_key: str = "json_data",
     name: Optional[str] = None,
+    parallel_sheets: bool = False,
 ):
     """
     Convert Excel file to JSON format.
 
     Args:
         file_path: Input Excel file path
-        sheet_name: Sheet name or index
+        sheet_name: Sheet name or index; None converts every sheet into a
+            ``{sheet name: rows}`` dict
         output_file: Output JSON file path (optional)
         output_key: Context key to store JSON data
         name: Node name
+        parallel_sheets: With sheet_name=None, parse each sheet in its own
+            worker process
 
-    Note: Requires pandas and openpyxl to be installed
+    Note: Requires pandas and openpyxl to be installed; openpyxl is much faster
+    with lxml installed (a warning is emitted once when it is missing)
     """
     node_name = name or f"excel_to_json_{Path(file_path).stem}"
 
@@ -484,40 +625,45 @@ def excel_to_json(
                     "conversion_error": "pandas is required for Excel operations. Install with: pip install pandas",
                 }
 
-            if not OPENPYXL_AVAILABLE:
+            if not OPENPYXL_AVAILABLE and EXCEL_READ_ENGINE is None:
                 return {
                     "conversion_success": False,
                     "conversion_error": "openpyxl is required for Excel operations. Install with: pip install openpyxl",
                 }
 
-            if not os.path.exists(file_path):
-                return {
-                    "conversion_success": False,
-                    "conversion_error": f"File not found: {file_path}",
-                    "file_path": file_path,
-                }
+            if EXCEL_READ_ENGINE is None:
+                _warn_if_lxml_missing()
 
             # Read Excel
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
-            data = df.to_dict("records")
+            if sheet_name is None:
+                sheets = _read_excel_all_sheets(file_path, True, parallel_sheets)
+                data: Any = {sheet: rows for sheet, (rows, _) in sheets.items()}
+                row_count = sum(len(rows) for rows in data.values())
+            else:
+                data, _ = _read_excel_sheet(file_path, sheet_name, True)
+                row_count = len(data)
 
             result = {
                 output_key: data,
                 "conversion_success": True,
-                "rows_converted": len(data),
+                "rows_converted": row_count,
                 "input_file": file_path,
                 "sheet_name": sheet_name,
             }
 
             # Write JSON file if requested
             if output_file:
-                Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-                with open(output_file, "w", encoding="utf-8") as jsonfile:
-                    json.dump(data, jsonfile, indent=2, ensure_ascii=False)
+                _write_json_file(output_file, data)
                 result["output_file"] = output_file
 
             return result
 
+        except FileNotFoundError:
+            return {
+                "conversion_success": False,
+                "conversion_error": f"File not found: {file_path}",
+                "file_path": file_path,
+            }
         except Exception as e:
             return {
                 "conversion_success": False,
@@ -528,16 +674,239 @@ def excel_to_json(
     return _excel_to_json
 
 
+def _frame_rows(df: Any, has_header: bool) -> List[Any]:
+    """DataFrame rows as dicts (or as lists without a header)"""
+    return df.to_dict("records") if has_header else df.values.tolist()
+
+
+def _read_excel_sheet(
+    file_path: str, sheet_name: Union[str, int], has_header: bool
+) -> Tuple[List[Any], int]:
+    """Read one sheet into rows plus its column count"""
+    df = _pandas().read_excel(
+        file_path,
+        sheet_name=sheet_name,
+        header=0 if has_header else None,
+        engine=EXCEL_READ_ENGINE,
+    )
+    return _frame_rows(df, has_header), len(df.columns)
+
+
+_excel_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _shared_excel_pool() -> ProcessPoolExecutor:
+    """Process pool shared by every node reading sheets with parallel_sheets=True"""
+    global _excel_pool
+    if _excel_pool is None:
+        _excel_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _excel_pool
+
+
+def _read_excel_all_sheets(
+    file_path: str, has_header: bool, parallel: bool
+) -> Dict[str, Tuple[List[Any], int]]:
+    """
+    Read every sheet into ``{sheet name: (rows, column count)}``.
+
+    Sequential reads parse the workbook once. Parallel reads open the workbook
+    in one worker process per sheet, so XML parsing is not serialized by the GIL.
+    """
+    if parallel:
+        with _pandas().ExcelFile(file_path, engine=EXCEL_READ_ENGINE) as workbook:
+            sheet_names = list(workbook.sheet_names)
+        if len(sheet_names) > 1:
+            results = _shared_excel_pool().map(
+                _read_excel_sheet, repeat(file_path), sheet_names, repeat(has_header)
+            )
+            return dict(zip(sheet_names, results))
+
+    frames = _pandas().read_excel(
+        file_path,
+        sheet_name=None,
+        header=0 if has_header else None,
+        engine=EXCEL_READ_ENGINE,
+    )
+    return {
+        sheet: (_frame_rows(df, has_header), len(df.columns))
+        for sheet, df in frames.items()
+    }
+
+
+def _warn_if_lxml_missing() -> None:
+    """Warn once per process when openpyxl has to run without lxml"""
+    global _lxml_warned
+    if LXML_AVAILABLE or _lxml_warned:
+        return
+    _lxml_warned = True
+    warnings.warn(
+        "lxml is not installed, so openpyxl Excel I/O runs on its slower "
+        "pure-Python XML path. Install with: pip install lxml",
+        stacklevel=2,
+    )
+
+
+def _excel_write_dependency_error() -> Optional[str]:
+    """Missing-dependency message for the default Excel writers, or None"""
+    if XLSXWRITER_AVAILABLE:
+        return None
+    if not PANDAS_AVAILABLE:
+        return "pandas is required for Excel operations. Install with: pip install pandas"
+    if not OPENPYXL_AVAILABLE:
+        return "openpyxl is required for Excel operations. Install with: pip install openpyxl"
+    return None
+
+
+def _xlsx_cell(value: Any) -> Any:
+    """Cell value for xlsxwriter: NaN as blank, containers as their text"""
+    if isinstance(value, float) and value != value:
+        return None
+    if isinstance(value, (dict, list, tuple, set)):
+        return str(value)
+    return value
+
+
+def _write_xlsx_streaming(
+    file_path: str, sheet_name: str, data: List[Any], write_header: bool
+) -> int:
+    """
+    Write rows with xlsxwriter in constant-memory mode and return the column count.
+
+    Rows are written strictly in order, so only the current row is held in
+    memory. Columns follow ``pd.DataFrame(data)``: the union of dict keys in
+    first-seen order, or positional indices for list rows.
+    """
+    if isinstance(data[0], dict):
+        columns: List[Any] = list(dict.fromkeys(key for row in data for key in row))
+        rows = ([row.get(column) for column in columns] for row in data)
+    else:
+        columns = list(range(max(len(row) for row in data)))
+        rows = (row for row in data)
+
+    workbook = xlsxwriter.Workbook(
+        file_path,
+        {"constant_memory": True, "default_date_format": "yyyy-mm-dd hh:mm:ss"},
+    )
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        row_index = 0
+        if write_header:
+            worksheet.write_row(0, 0, [str(column) for column in columns])
+            row_index = 1
+        for row in rows:
+            worksheet.write_row(row_index, 0, [_xlsx_cell(value) for value in row])
+            row_index += 1
+    finally:
+        workbook.close()
+    return len(columns)
+
+
+def _write_xlsx_rustpy(file_path: str, sheet_name: str, data: List[Any]) -> int:
+    """
+    Write dict rows with rustpy-xlsxwriter and return the column count.
+
+    The writer maps values by position using the first row's keys, so rows
+    whose keys differ from the column union are re-keyed first.
+    """
+    columns = list(dict.fromkeys(key for row in data for key in row))
+    if not all(list(row) == columns for row in data):
+        data = [{column: row.get(column) for column in columns} for row in data]
+    rustpy_xlsxwriter.write_worksheet(data, file_path, sheet_name=sheet_name)
+    return len(columns)
+
+
+def _rows_to_dataframe(data: List[Any]) -> Any:
+    """
+    Build a DataFrame equivalent to ``pd.DataFrame(data)``.
+
+    With pyarrow installed, dict rows are converted column by column through an
+    Arrow table, which infers each column's type in C instead of pandas walking
+    every cell. Columns Arrow cannot type (mixed values) fall back to pandas.
+    """
+    if PYARROW_AVAILABLE and all(isinstance(row, dict) for row in data):
+        columns = list(dict.fromkeys(key for row in data for key in row))
+        if all(isinstance(column, str) for column in columns):
+            pa, _ = _pyarrow()
+            try:
+                table = pa.table(
+                    {column: [row.get(column) for row in data] for column in columns}
+                )
+            except (pa.ArrowException, TypeError, ValueError):
+                pass
+            else:
+                return table.to_pandas()
+    return _pandas().DataFrame(data)
+
+
+def _write_csv_rows(
+    file_path: str,
+    data: Iterable[Any],
+    delimiter: str,
+    encoding: str,
+    write_header: bool,
+) -> None:
+    """Write non-empty dict rows (keyed by the first row) or list rows as CSV"""
+    rows = iter(data)
+    first = next(rows)
+    with open(
+        file_path, "w", encoding=encoding, newline="", buffering=CSV_WRITE_BUFFER_SIZE
+    ) as csvfile:
+        if isinstance(first, dict):
+            writer = csv.DictWriter(
+                csvfile, fieldnames=first.keys(), delimiter=delimiter
+            )
+            if write_header:
+                writer.writeheader()
+        else:
+            writer = csv.writer(csvfile, delimiter=delimiter)
+        writer.writerow(first)
+        writer.writerows(rows)
+
+
+def _flattened_rows(data: Iterable[Any]) -> Iterator[Any]:
+    """Yield rows with nested dicts flattened, one at a time"""
+    for item in data:
+        if isinstance(item, dict):
+            flat_item: dict = {}
+            _flatten_dict(item, flat_item)
+            yield flat_item
+        else:
+            yield item
+
+
+def _write_json_file(output_file: str, data: Any) -> None:
+    """
+    Write rows as indented UTF-8 JSON.
+
+    orjson (when installed) encodes numpy scalars/arrays natively; values neither
+    encoder supports (pandas Timestamps, Decimals, ...) are written as strings.
+    """
+    path = Path(output_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(dumps_bytes(data, indent=2, default=str))
+
+
 def _flatten_dict(
     nested_dict: dict, flat_dict: dict, parent_key: str = "", separator: str = "."
 ):
-    """Helper function to flatten nested dictionaries"""
-    for key, value in nested_dict.items():
-        new_key = f"{parent_key}{separator}{key}" if parent_key else key
-        if isinstance(value, dict):
-            _flatten_dict(value, flat_dict, new_key, separator)
-        else:
+    """
+    Helper function to flatten nested dictionaries.
+
+    Walks the dict with an explicit stack of item iterators instead of recursing,
+    so keys keep their depth-first order and deep nesting cannot hit the
+    recursion limit.
+    """
+    stack = [(parent_key, iter(nested_dict.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            new_key = f"{prefix}{separator}{key}" if prefix else key
+            if isinstance(value, dict):
+                stack.append((new_key, iter(value.items())))
+                break
             flat_dict[new_key] = value
+        else:
+            stack.pop()
 
 
 # Convenience functions for common operations
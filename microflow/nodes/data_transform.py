@@ -6,7 +6,9 @@ import json
 import xml.etree.ElementTree as ET
 from typing import Any, Dict, List, Optional
 
+from ..core.expressions import CompiledExpression
 from ..core.task_spec import task
+from .. import serialization
 
 
 def json_parse(
@@ -34,7 +36,7 @@ def json_parse(
             }
 
         try:
-            parsed_data = json.loads(json_string)
+            parsed_data = serialization.loads(json_string)
             return {
                 output_key: parsed_data,
                 "json_parsed": True,
@@ -76,7 +78,10 @@ def json_stringify(
             }
 
         try:
-            json_string = json.dumps(data, indent=indent, ensure_ascii=ensure_ascii)
+            if ensure_ascii:
+                json_string = json.dumps(data, indent=indent, ensure_ascii=True)
+            else:
+                json_string = serialization.dumps(data, indent=indent)
             return {
                 output_key: json_string,
                 "json_serialized": True,
@@ -376,6 +381,7 @@ def data_filter(
         name: Node name
     """
     node_name = name or "data_filter"
+    compiled = CompiledExpression(filter_condition, f"<filter:{node_name}>")
 
     @task(name=node_name, description=f"Filter data: {filter_condition}")
     def _data_filter(ctx):
@@ -391,11 +397,12 @@ def data_filter(
 
         try:
             filtered_items = []
+            # Safe evaluation context, reused across items
+            eval_context = {"ctx": ctx, "__builtins__": {}}
             for item in data:
-                # Create safe evaluation context
-                eval_context = {"item": item, "ctx": ctx, "__builtins__": {}}
+                eval_context["item"] = item
 
-                if eval(filter_condition, eval_context):
+                if compiled.evaluate(eval_context):
                     filtered_items.append(item)
 
             return {
@@ -432,6 +439,7 @@ def data_transform(
         name: Node name
     """
     node_name = name or "data_transform"
+    compiled = CompiledExpression(transform_expression, f"<transform:{node_name}>")
 
     @task(name=node_name, description=f"Transform data: {transform_expression}")
     def _data_transform(ctx):
@@ -450,11 +458,12 @@ def data_transform(
 
         try:
             transformed_items = []
+            # Safe evaluation context, reused across items
+            eval_context = {"ctx": ctx, "__builtins__": {}}
             for item in data:
-                # Create safe evaluation context
-                eval_context = {"item": item, "ctx": ctx, "__builtins__": {}}
+                eval_context["item"] = item
 
-                transformed_item = eval(transform_expression, eval_context)
+                transformed_item = compiled.evaluate(eval_context)
                 transformed_items.append(transformed_item)
 
             return {
@@ -474,6 +483,80 @@ def data_transform(
     return _data_transform
 
 
+def data_filter_transform(
+    filter_condition: str,
+    transform_expression: str,
+    data_key: str = "data",
+    output_key: str = "transformed_data",
+    name: Optional[str] = None,
+):
+    """
+    Filter and transform list items in a single pass.
+
+    Equivalent to ``data_filter`` followed by ``data_transform`` without
+    materializing the intermediate filtered list.
+
+    Args:
+        filter_condition: Python expression for filtering (item available as 'item')
+        transform_expression: Python expression applied to each kept item
+        data_key: Context key containing list to process
+        output_key: Context key to store transformed data
+        name: Node name
+    """
+    node_name = name or "data_filter_transform"
+    compiled_filter = CompiledExpression(filter_condition, f"<filter:{node_name}>")
+    compiled_transform = CompiledExpression(
+        transform_expression, f"<transform:{node_name}>"
+    )
+
+    @task(
+        name=node_name,
+        description=f"Filter data: {filter_condition}; transform: {transform_expression}",
+    )
+    def _data_filter_transform(ctx):
+        data = ctx.get(data_key)
+        if data is None:
+            return {
+                "transform_success": False,
+                "transform_error": f"No data found in context key: {data_key}",
+            }
+
+        if not isinstance(data, list):
+            return {
+                "transform_success": False,
+                "transform_error": "Data must be a list",
+            }
+
+        try:
+            transformed_items = []
+            # Safe evaluation context, reused across items
+            eval_context = {"ctx": ctx, "__builtins__": {}}
+            for item in data:
+                eval_context["item"] = item
+
+                if compiled_filter.evaluate(eval_context):
+                    transformed_items.append(compiled_transform.evaluate(eval_context))
+
+            return {
+                output_key: transformed_items,
+                "transform_success": True,
+                "original_count": len(data),
+                "item_count": len(transformed_items),
+                "filter_condition": filter_condition,
+                "transform_expression": transform_expression,
+            }
+
+        except Exception as e:
+            return {
+                "transform_success": False,
+                "transform_error": f"Filter/transform error: {e}",
+                "filter_condition": filter_condition,
+                "transform_expression": transform_expression,
+            }
+
+    return _data_filter_transform
+
+
 def data_aggregate(
     data_key: str = "data",
     group_by: Optional[str] = None,
@@ -1,14 +1,42 @@
 """File and directory operation nodes"""
 
 import asyncio
+import functools
 import json
+import os
 import shutil
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Callable, Dict, Optional, Union
 
+from .. import serialization
 from ..core.task_spec import task
 
 
+def _offload(fn):
+    """Run a blocking file operation on the default thread pool"""
+
+    @functools.wraps(fn)
+    async def _run_in_thread(ctx):
+        # Pass a snapshot so concurrent tasks can keep updating ctx
+        return await asyncio.to_thread(fn, dict(ctx))
+
+    return _run_in_thread
+
+
+def _write_bytes(path: Path, data: bytes, append: bool) -> int:
+    """Write bytes with raw os.write calls, bypassing Python-level buffering"""
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    flags |= os.O_APPEND if append else os.O_TRUNC
+    fd = os.open(path, flags, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+    return len(data)
+
+
 def read_file(
     file_path: str,
     encoding: str = "utf-8",
@@ -33,6 +61,7 @@ def read_file(
     node_name = name or f"read_{Path(file_path).name}"
 
     @task(name=node_name, description=f"Read file: {file_path}")
+    @_offload
     def _read_file(ctx):
         # Resolve file path from context
         resolved_path = (
@@ -78,7 +107,7 @@ def read_file(
 
 def write_file(
     file_path: str,
-    content: Union[str, bytes],
+    content: Union[str, bytes, Callable[[Dict[str, Any]], Union[str, bytes]]],
     encoding: str = "utf-8",
     append_mode: bool = False,
     create_dirs: bool = True,
@@ -89,7 +118,8 @@ def write_file(
 
     Args:
         file_path: Path to file to write
-        content: Content to write (string or bytes)
+        content: Content to write (string or bytes), or a callable that builds it from
+            ctx. String content containing "{...}" is formatted with ctx.
         encoding: Text encoding (ignored for bytes)
         append_mode: Whether to append instead of overwrite
         create_dirs: Whether to create parent directories
@@ -104,6 +134,7 @@ def write_file(
     node_name = name or f"write_{Path(file_path).name}"
 
     @task(name=node_name, description=f"Write file: {file_path}")
+    @_offload
     def _write_file(ctx):
         # Resolve file path and content from context
         resolved_path = (
@@ -122,15 +153,17 @@ def write_file(
         path_obj = Path(resolved_path)
 
         try:
+            # Build content from context
+            if callable(content):
+                resolved_content = content(ctx)
+
             # Create parent directories if needed
             if create_dirs:
                 path_obj.parent.mkdir(parents=True, exist_ok=True)
 
             # Write content
-            if isinstance(resolved_content, bytes):
-                mode = "ab" if append_mode else "wb"
-                with open(path_obj, mode) as f:
-                    bytes_written = f.write(resolved_content)
+            if isinstance(resolved_content, (bytes, bytearray)):
+                bytes_written = _write_bytes(path_obj, resolved_content, append_mode)
             else:
                 mode = "a" if append_mode else "w"
                 with open(path_obj, mode, encoding=encoding) as f:
@@ -177,6 +210,7 @@ def copy_file(
     node_name = name or "copy_file"
 
     @task(name=node_name, description=f"Copy {source_path} to {dest_path}")
+    @_offload
     def _copy_file(ctx):
         # Resolve paths
         resolved_source = (
@@ -248,6 +282,7 @@ def move_file(
     node_name = name or "move_file"
 
     @task(name=node_name, description=f"Move {source_path} to {dest_path}")
+    @_offload
     def _move_file(ctx):
         # Resolve paths
         resolved_source = (
@@ -313,6 +348,7 @@ def delete_file(file_path: str, missing_ok: bool = True, name: Optional[str] = N
     node_name = name or "delete_file"
 
     @task(name=node_name, description=f"Delete file: {file_path}")
+    @_offload
     def _delete_file(ctx):
         # Resolve path
         resolved_path = (
@@ -375,6 +411,7 @@ def list_directory(
     node_name = name or "list_directory"
 
     @task(name=node_name, description=f"List directory: {dir_path}")
+    @_offload
     def _list_directory(ctx):
         # Resolve directory path
         resolved_path = (
@@ -471,6 +508,7 @@ def create_directory(
     node_name = name or "create_directory"
 
     @task(name=node_name, description=f"Create directory: {dir_path}")
+    @_offload
     def _create_directory(ctx):
         # Resolve path
         resolved_path = (
@@ -585,9 +623,9 @@ def read_json_file(file_path: str, **kwargs):
     @task(
         name=f"read_json_{Path(file_path).stem}", description=f"Read JSON: {file_path}"
     )
-    def _read_json_file(ctx):
+    async def _read_json_file(ctx):
         # First read the file
-        result = read_task.spec.fn(ctx)
+        result = await read_task.spec.fn(ctx)
 
         if not result.get("file_exists") or result.get("file_error"):
             return result
@@ -614,10 +652,10 @@ def write_json_file(
     """Write data as JSON file"""
 
     @task(
-        name=f"write_json_{Path(file_path).stem}",
+        name=kwargs.get("name") or f"write_json_{Path(file_path).stem}",
         description=f"Write JSON: {file_path}",
     )
-    def _write_json_file(ctx):
+    async def _write_json_file(ctx):
         # Get data from context
         data = ctx.get(data_key)
         if data is None:
@@ -628,12 +666,12 @@ def write_json_file(
             }
 
         try:
-            # Convert to JSON
-            json_content = json.dumps(data, indent=indent, ensure_ascii=False)
+            # Serialize straight to UTF-8 bytes, skipping the intermediate str
+            json_content = serialization.dumps_bytes(data, indent=indent)
 
             # Write file
             write_task = write_file(file_path, json_content, **kwargs)
-            return write_task.spec.fn(ctx)
+            return await write_task.spec.fn(ctx)
 
         except (TypeError, ValueError) as e:
             return {
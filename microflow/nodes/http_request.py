@@ -12,6 +12,71 @@ except ImportError:
     pass
 
 
+def create_http_client(
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    timeout: float = 30.0,
+    http2: bool = False,
+    **kwargs,
+):
+    """
+    Create a pooled ``httpx.AsyncClient`` to share across HTTP nodes.
+
+    Pass the result to ``Workflow(http_client=...)`` or to the ``client``
+    argument of ``http_request`` so connections are kept alive between requests.
+    The caller owns the client and should close it with ``await client.aclose()``.
+    Nodes only use it when their ``verify_ssl`` matches the client's ``verify``.
+    """
+    if httpx is None:
+        raise ImportError(
+            "httpx is required for HTTP requests. Install with: pip install httpx"
+        )
+
+    verify = kwargs.pop("verify", True)
+    client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+        timeout=timeout,
+        http2=http2,
+        verify=verify,
+        **kwargs,
+    )
+    client._microflow_verify_ssl = bool(verify)
+    return client
+
+
+def _client_verifies_ssl(client: Any) -> bool:
+    """Whether a shared client checks certificates (assumed for foreign clients)"""
+    return getattr(client, "_microflow_verify_ssl", True)
+
+
+def _parse_response(response, response_format: str) -> Dict[str, Any]:
+    """Convert an httpx response into the node's context payload"""
+    response_data = None
+    try:
+        if response_format == "json":
+            response_data = response.json()
+        elif response_format == "text":
+            response_data = response.text
+        else:  # raw
+            response_data = response.content
+    except Exception as e:
+        response_data = {"parse_error": str(e), "raw_content": response.text}
+
+    # Check if request was successful
+    is_success = 200 <= response.status_code < 300
+
+    return {
+        "http_status_code": response.status_code,
+        "http_headers": dict(response.headers),
+        "http_data": response_data,
+        "http_success": is_success,
+        "http_url": str(response.url),
+    }
+
+
 class HTTPAuth:
     """Base class for HTTP authentication"""
 
@@ -72,6 +137,7 @@ def http_request(
     name: Optional[str] = None,
     max_retries: int = 0,
     backoff_s: float = 1.0,
+    client: Optional[Any] = None,
 ):
     """
     Create an HTTP request node.
@@ -91,6 +157,11 @@ def http_request(
         name: Node name
         max_retries: Number of retry attempts
         backoff_s: Backoff time between retries
+        client: Shared ``httpx.AsyncClient`` to reuse connections. When omitted the
+            workflow's client (``Workflow(http_client=...)``) is used if set,
+            otherwise a short-lived client is created per request. A shared
+            client whose certificate verification differs from ``verify_ssl``
+            is not used; the request then gets its own client.
 
     Returns HTTP response data in context with keys:
         - http_status_code: Response status code
@@ -154,42 +225,32 @@ def http_request(
                     else:
                         resolved_json[key] = value
 
+        request_kwargs = dict(
+            method=method.upper(),
+            url=request_url,
+            headers=request_headers,
+            params=resolved_params,
+            json=resolved_json,
+            data=form_data,
+        )
+
+        # Reuse a pooled client when one is available and verifies like this node
+        shared_client = client or ctx.get("_microflow_http_client")
+        if (
+            shared_client is not None
+            and _client_verifies_ssl(shared_client) == verify_ssl
+        ):
+            response = await shared_client.request(
+                timeout=timeout, follow_redirects=follow_redirects, **request_kwargs
+            )
+            return _parse_response(response, response_format)
+
         # Make the request
         async with httpx.AsyncClient(
             timeout=timeout, follow_redirects=follow_redirects, verify=verify_ssl
-        ) as client:
-
-            response = await client.request(
-                method=method.upper(),
-                url=request_url,
-                headers=request_headers,
-                params=resolved_params,
-                json=resolved_json,
-                data=form_data,
-            )
-
-            # Parse response based on format
-            response_data = None
-            try:
-                if response_format == "json":
-                    response_data = response.json()
-                elif response_format == "text":
-                    response_data = response.text
-                else:  # raw
-                    response_data = response.content
-            except Exception as e:
-                response_data = {"parse_error": str(e), "raw_content": response.text}
-
-            # Check if request was successful
-            is_success = 200 <= response.status_code < 300
-
-            return {
-                "http_status_code": response.status_code,
-                "http_headers": dict(response.headers),
-                "http_data": response_data,
-                "http_success": is_success,
-                "http_url": str(response.url),
-            }
+        ) as per_call_client:
+            response = await per_call_client.request(**request_kwargs)
+            return _parse_response(response, response_format)
 
     return _http_request
 
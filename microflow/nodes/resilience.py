@@ -198,6 +198,19 @@ def circuit_breaker(
     return _circuit_breaker
 
 
+def _item_detail(
+    index: int, item: Any, result: Any = None, error: Optional[Exception] = None
+) -> Dict[str, Any]:
+    """Per-item entry of foreach_details."""
+    return {
+        "index": index,
+        "item": item,
+        "success": error is None,
+        "result": result,
+        "error": str(error) if error is not None else None,
+    }
+
+
 def foreach(
     wrapped_task: Task,
     data_key: str = "data",
@@ -208,6 +221,7 @@ def foreach(
 ):
     """Execute a task for each item in a list with bounded concurrency."""
     node_name = name or f"foreach_{wrapped_task.spec.name}"
+    is_async = asyncio.iscoroutinefunction(wrapped_task.spec.fn)
 
     @task(name=node_name, description=f"For-each wrapper for {wrapped_task.spec.name}")
     async def _foreach(ctx):
@@ -228,38 +242,49 @@ def foreach(
                 "foreach_error": "max_concurrent must be greater than 0",
             }
 
-        semaphore = asyncio.Semaphore(max_concurrent)
-        details = []
-
-        async def run_item(index: int, item: Any) -> Dict[str, Any]:
-            async with semaphore:
-                item_ctx = dict(ctx)
-                item_ctx[item_key] = item
-                item_ctx["_foreach_index"] = index
-
+        def item_context(index: int, item: Any) -> Dict[str, Any]:
+            item_ctx = dict(ctx)
+            item_ctx[item_key] = item
+            item_ctx["_foreach_index"] = index
+            return item_ctx
+
+        if not is_async:
+            # Sync tasks cannot overlap anyway; run them inline without
+            # scheduling one asyncio task per item
+            details = []
+            for index, item in enumerate(data):
                 try:
-                    result = wrapped_task.spec.fn(item_ctx)
+                    result = wrapped_task.spec.fn(item_context(index, item))
                     if asyncio.iscoroutine(result):
                         result = await result
-                    return {
-                        "index": index,
-                        "item": item,
-                        "success": True,
-                        "result": result,
-                        "error": None,
-                    }
+                    details.append(_item_detail(index, item, result=result))
                 except Exception as e:
-                    return {
-                        "index": index,
-                        "item": item,
-                        "success": False,
-                        "result": None,
-                        "error": str(e),
-                    }
+                    details.append(_item_detail(index, item, error=e))
+        else:
+
+            async def run_item(index: int, item: Any) -> Dict[str, Any]:
+                try:
+                    result = await wrapped_task.spec.fn(item_context(index, item))
+                    return _item_detail(index, item, result=result)
+                except Exception as e:
+                    return _item_detail(index, item, error=e)
 
-        details = await asyncio.gather(
-            *[run_item(i, item) for i, item in enumerate(data)]
-        )
+            # One gather dispatches every item; the semaphore is only needed
+            # when there are more items than slots
+            if len(data) <= max_concurrent:
+                details = await asyncio.gather(
+                    *[run_item(i, item) for i, item in enumerate(data)]
+                )
+            else:
+                semaphore = asyncio.Semaphore(max_concurrent)
+
+                async def run_limited(index: int, item: Any) -> Dict[str, Any]:
+                    async with semaphore:
+                        return await run_item(index, item)
+
+                details = await asyncio.gather(
+                    *[run_limited(i, item) for i, item in enumerate(data)]
+                )
 
         successful = [d for d in details if d["success"]]
         failed = [d for d in details if not d["success"]]
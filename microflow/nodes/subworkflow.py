@@ -3,13 +3,21 @@
 import asyncio
 import importlib
 import importlib.util
+import os
+import sys
+import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+from ..core.runner import run_async
 from ..core.task_spec import task
 from ..core.workflow import Workflow
 from ..storage.json_store import JSONStateStore
+from ..storage.memory_store import MemoryStateStore
 
 
 class WorkflowLoader:
@@ -57,6 +65,108 @@ class WorkflowLoader:
             raise ImportError(f"Could not import module {module_path}: {e}")
 
 
+# Workflows built from factories or files, shared by every subworkflow node.
+# Workflow instances hold no per-run state, so one build can serve all runs.
+# Least recently used builds are dropped beyond _WORKFLOW_CACHE_SIZE entries.
+_WORKFLOW_CACHE_SIZE = 128
+_workflow_cache: "OrderedDict[Any, Workflow]" = OrderedDict()
+_workflow_cache_lock = threading.Lock()
+
+
+def _resolve_workflow(
+    workflow_source: Union[str, Workflow, Callable[[], Workflow]],
+    cache_key: Any = None,
+    fresh: bool = False,
+) -> Workflow:
+    """Return the workflow for a source, building factories/files only once"""
+    if isinstance(workflow_source, Workflow):
+        return workflow_source
+    if not callable(workflow_source) and not isinstance(workflow_source, str):
+        raise ValueError(f"Invalid workflow_source type: {type(workflow_source)}")
+
+    key = (workflow_source, cache_key)
+    if not fresh:
+        with _workflow_cache_lock:
+            cached = _workflow_cache.get(key)
+            if cached is not None:
+                _workflow_cache.move_to_end(key)
+                return cached
+
+    if callable(workflow_source):
+        workflow = workflow_source()
+    else:
+        workflow = WorkflowLoader.load_from_file(workflow_source)
+
+    if not fresh:
+        with _workflow_cache_lock:
+            _workflow_cache[key] = workflow
+            if len(_workflow_cache) > _WORKFLOW_CACHE_SIZE:
+                _workflow_cache.popitem(last=False)
+    return workflow
+
+
+def _run_subworkflow_in_worker(
+    workflow_source: Union[str, Callable[[], Workflow]],
+    cache_key: Any,
+    fresh: bool,
+    child_ctx: Dict[str, Any],
+    child_run_id: str,
+    data_dir: Optional[str],
+) -> Dict[str, Any]:
+    """Build and run a child workflow inside an executor worker"""
+    child_workflow = _resolve_workflow(workflow_source, cache_key, fresh)
+    store = (
+        JSONStateStore.get_or_create(data_dir)
+        if data_dir is not None
+        else MemoryStateStore()
+    )
+    return run_async(
+        child_workflow.run(run_id=child_run_id, store=store, initial_ctx=child_ctx)
+    )
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _shared_process_pool() -> ProcessPoolExecutor:
+    """Process pool shared by every parallel_subworkflows(executor="process") node"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _process_pool
+
+
+def _public_ctx(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of ctx without private (underscore-prefixed) keys"""
+    return {k: v for k, v in ctx.items() if not k.startswith("_")}
+
+
+def _key_projector(
+    keys: Optional[List[str]],
+) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    """Build ``source -> {key: source[key]}`` for the keys present, or None for no filter"""
+    if not keys:
+        return None
+
+    # Keys from configs (YAML, JSON) are fresh strings; intern them so lookups
+    # against the workflow's interned ctx keys match by identity
+    key_tuple: Tuple[str, ...] = tuple(map(sys.intern, keys))
+    getter = itemgetter(*key_tuple)
+    single = len(key_tuple) == 1
+
+    def project(source: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            values = getter(source)
+        except KeyError:
+            # Some keys are missing: keep only the ones present
+            return {key: source[key] for key in key_tuple if key in source}
+        if single:
+            return {key_tuple[0]: values}
+        return dict(zip(key_tuple, values))
+
+    return project
+
+
 def subworkflow(
     workflow_source: Union[str, Workflow, Callable[[], Workflow]],
     context_mapping: Optional[Dict[str, str]] = None,
@@ -67,6 +177,10 @@ def subworkflow(
     timeout_s: Optional[float] = None,
     max_retries: int = 0,
     backoff_s: float = 1.0,
+    cache_key: Any = None,
+    fresh: bool = False,
+    executor: Optional[Executor] = None,
+    durable: bool = True,
 ):
     """
     Create a sub-workflow execution node.
@@ -85,6 +199,15 @@ def subworkflow(
         timeout_s: Sub-workflow execution timeout
         max_retries: Number of retry attempts
         backoff_s: Backoff time between retries
+        cache_key: Extra key for the built-workflow cache, for factories that
+            close over parameters
+        fresh: Rebuild the workflow from its source on every execution
+        executor: Run the child workflow in this executor (e.g. a process pool
+            for CPU-bound children) instead of on the parent's event loop.
+            The source must then be a picklable factory or a file path, and
+            the child persists to a JSONStateStore in the parent store's data_dir.
+        durable: Persist the child run; with False it runs against an in-memory
+            store (its results still come back through the parent's context)
 
     Returns sub-workflow results in context with keys:
         - subworkflow_success: Boolean indicating if sub-workflow succeeded
@@ -93,6 +216,16 @@ def subworkflow(
         - (plus any output_keys specified)
     """
     node_name = name or f"subworkflow_{uuid.uuid4().hex[:8]}"
+    project_input = _key_projector(input_keys)
+    project_output = _key_projector(output_keys)
+    mapping_items = (
+        tuple(
+            (sys.intern(parent_key), sys.intern(child_key))
+            for parent_key, child_key in context_mapping.items()
+        )
+        if context_mapping
+        else ()
+    )
 
     @task(
         name=node_name,
@@ -101,33 +234,22 @@ def subworkflow(
         timeout_s=timeout_s,
         description="Execute sub-workflow",
     )
-    async def _subworkflow(ctx):
-        # Load the workflow
-        if isinstance(workflow_source, Workflow):
-            child_workflow = workflow_source
-        elif callable(workflow_source):
-            child_workflow = workflow_source()
-        elif isinstance(workflow_source, str):
-            child_workflow = WorkflowLoader.load_from_file(workflow_source)
-        else:
-            raise ValueError(f"Invalid workflow_source type: {type(workflow_source)}")
-
+    async def _subworkflow(ctx, public_ctx=None):
         # Prepare child context
-        child_ctx = {}
-
-        if input_keys:
+        if project_input is not None:
             # Only pass specified keys
-            for key in input_keys:
-                if key in ctx:
-                    child_ctx[key] = ctx[key]
+            child_ctx = project_input(ctx)
+        elif public_ctx is not None:
+            # Public keys already projected once by a fan-out node
+            child_ctx = dict(public_ctx)
         else:
             # Pass all non-private context data
-            child_ctx = {k: v for k, v in ctx.items() if not k.startswith("_")}
+            child_ctx = _public_ctx(ctx)
 
         # Apply context mapping
-        if context_mapping:
+        if mapping_items:
             mapped_ctx = {}
-            for parent_key, child_key in context_mapping.items():
+            for parent_key, child_key in mapping_items:
                 if parent_key in child_ctx:
                     mapped_ctx[child_key] = child_ctx[parent_key]
                     if child_key != parent_key:
@@ -135,36 +257,53 @@ def subworkflow(
             child_ctx.update(mapped_ctx)
 
         # Set up storage for child workflow
-        if inherit_store:
+        if not durable:
+            child_store = MemoryStateStore()
+        elif inherit_store:
             # Use the same storage instance as parent
             # We'll need to pass this from the parent workflow execution
             child_store = ctx.get("_microflow_store")
             if child_store is None:
-                child_store = JSONStateStore()
+                child_store = JSONStateStore.get_or_create()
         else:
-            child_store = JSONStateStore()
+            child_store = JSONStateStore.get_or_create()
 
         # Generate unique run ID for child
         child_run_id = f"{node_name}_{uuid.uuid4().hex[:8]}"
 
         try:
-            # Execute child workflow
-            child_result = await child_workflow.run(
-                run_id=child_run_id, store=child_store, initial_ctx=child_ctx
-            )
+            if executor is None:
+                # Load the workflow (factories and files are built once and reused)
+                child_workflow = _resolve_workflow(workflow_source, cache_key, fresh)
+
+                # Execute child workflow
+                child_result = await child_workflow.run(
+                    run_id=child_run_id, store=child_store, initial_ctx=child_ctx
+                )
+            else:
+                # Execute child workflow in a worker with its own event loop
+                child_result = await asyncio.get_running_loop().run_in_executor(
+                    executor,
+                    _run_subworkflow_in_worker,
+                    workflow_source,
+                    cache_key,
+                    fresh,
+                    child_ctx,
+                    child_run_id,
+                    (
+                        str(getattr(child_store, "data_dir", "./data"))
+                        if getattr(child_store, "durable", True)
+                        else None
+                    ),
+                )
 
             # Extract output data
-            output_data = {}
-            if output_keys:
+            if project_output is not None:
                 # Only extract specified keys
-                for key in output_keys:
-                    if key in child_result:
-                        output_data[key] = child_result[key]
+                output_data = project_output(child_result)
             else:
                 # Extract all non-private data
-                output_data = {
-                    k: v for k, v in child_result.items() if not k.startswith("_")
-                }
+                output_data = _public_ctx(child_result)
 
             # Return results
             result = {
@@ -192,6 +331,8 @@ def parallel_subworkflows(
     name: Optional[str] = None,
     max_concurrent: int = 5,
     timeout_s: Optional[float] = None,
+    executor: Union[str, Executor] = "async",
+    durable: bool = True,
 ):
     """
     Execute multiple sub-workflows in parallel.
@@ -203,9 +344,16 @@ def parallel_subworkflows(
             - input_keys: Optional input keys filter
             - output_keys: Optional output keys filter
             - name: Optional workflow name
+            - durable: Optional per-child override of ``durable``
         name: Node name
         max_concurrent: Maximum number of concurrent sub-workflows
         timeout_s: Total timeout for all sub-workflows
+        executor: "async" runs children on the event loop (I/O-bound work);
+            "process" runs them in a shared process pool sized to the CPU count
+            (CPU-bound work, sources must be picklable factories or file paths);
+            an Executor instance is used as-is, e.g. one pool shared by a WorkflowRunner
+        durable: Persist each child run; False keeps children in memory, since
+            their results are aggregated into the parent run anyway
 
     Returns:
         - parallel_results: List of results from each sub-workflow
@@ -214,37 +362,58 @@ def parallel_subworkflows(
     """
     node_name = name or "parallel_subworkflows"
 
+    if executor == "async":
+        child_executor = None
+    elif executor == "process":
+        child_executor = _shared_process_pool()
+    elif isinstance(executor, Executor):
+        child_executor = executor
+    else:
+        raise ValueError(f"Invalid executor: {executor!r}")
+
+    # Build the sub-workflow nodes once, not on every execution
+    sub_nodes = [
+        subworkflow(
+            workflow_source=wf_config["source"],
+            context_mapping=wf_config.get("context_mapping"),
+            input_keys=wf_config.get("input_keys"),
+            output_keys=wf_config.get("output_keys"),
+            name=wf_config.get("name", f"parallel_{i}"),
+            cache_key=wf_config.get("cache_key"),
+            fresh=wf_config.get("fresh", False),
+            executor=child_executor,
+            durable=wf_config.get("durable", durable),
+        )
+        for i, wf_config in enumerate(workflows)
+    ]
+    # Children without input_keys all start from the same public ctx
+    needs_public_ctx = any(not wf_config.get("input_keys") for wf_config in workflows)
+
     @task(
         name=node_name,
         timeout_s=timeout_s,
         description="Execute parallel sub-workflows",
     )
     async def _parallel_subworkflows(ctx):
+        # Project the public ctx once for the whole fan-out, not once per child
+        public_ctx = _public_ctx(ctx) if needs_public_ctx else None
+
         # Create sub-workflow tasks
-        subworkflow_tasks = []
-        for i, wf_config in enumerate(workflows):
-            sub_name = wf_config.get("name", f"parallel_{i}")
-            sub_task = subworkflow(
-                workflow_source=wf_config["source"],
-                context_mapping=wf_config.get("context_mapping"),
-                input_keys=wf_config.get("input_keys"),
-                output_keys=wf_config.get("output_keys"),
-                name=sub_name,
-            )
-            subworkflow_tasks.append(sub_task.spec.fn(ctx))
+        subworkflow_tasks = [sub_node.spec.fn(ctx, public_ctx) for sub_node in sub_nodes]
 
-        # Execute with concurrency limit
-        semaphore = asyncio.Semaphore(max_concurrent)
+        # Execute with concurrency limit (only needed when there are more
+        # sub-workflows than slots)
+        if len(subworkflow_tasks) > max_concurrent:
+            semaphore = asyncio.Semaphore(max_concurrent)
 
-        async def run_with_semaphore(task):
-            async with semaphore:
-                return await task
+            async def run_with_semaphore(task):
+                async with semaphore:
+                    return await task
+
+            subworkflow_tasks = [run_with_semaphore(task) for task in subworkflow_tasks]
 
         # Run all sub-workflows
-        results = await asyncio.gather(
-            *[run_with_semaphore(task) for task in subworkflow_tasks],
-            return_exceptions=True,
-        )
+        results = await asyncio.gather(*subworkflow_tasks, return_exceptions=True)
 
         # Process results
         successful_results = []
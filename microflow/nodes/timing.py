@@ -5,6 +5,8 @@ import time
 from datetime import datetime, timedelta
 from typing import Optional
 
+from ..core.expressions import CompiledExpression
+from ..core.signals import CTX_CHANGED_KEY
 from ..core.task_spec import task
 
 
@@ -111,11 +113,14 @@ def wait_for_condition(
 
     Args:
         condition_expression: Python expression to evaluate (ctx available)
-        check_interval: How often to check condition (seconds)
+        check_interval: How often to re-check the condition (seconds). Inside a
+            workflow run the condition is also re-checked as soon as another
+            task's result is merged into ctx.
         max_wait_time: Maximum time to wait (None for no limit)
         name: Node name
     """
     node_name = name or "wait_for_condition"
+    compiled = CompiledExpression(condition_expression, f"<wait:{node_name}>")
 
     @task(
         name=node_name,
@@ -125,15 +130,14 @@ def wait_for_condition(
     async def _wait_for_condition(ctx):
         start_time = time.time()
         checks = 0
+        eval_context = {"ctx": ctx, "__builtins__": {}}
 
         while True:
             checks += 1
 
             try:
                 # Evaluate condition
-                eval_context = {"ctx": ctx, "__builtins__": {}}
-
-                if eval(condition_expression, eval_context):
+                if compiled.evaluate(eval_context):
                     end_time = time.time()
                     return {
                         "condition_met": True,
@@ -160,7 +164,11 @@ def wait_for_condition(
                     "condition_expression": condition_expression,
                 }
 
-            await asyncio.sleep(check_interval)
+            ctx_changed = ctx.get(CTX_CHANGED_KEY)
+            if ctx_changed is not None:
+                await ctx_changed.wait(timeout=check_interval)
+            else:
+                await asyncio.sleep(check_interval)
 
     return _wait_for_condition
 
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
 from ..core.task_spec import task
+from ..serialization import serialize_canonical
 from .http_request import HTTPAuth, httpx
 
 try:
@@ -240,7 +241,7 @@ def deduplicate(
                             getattr(item, field, None) for field in key_fields
                         )
                 else:
-                    fingerprint = json.dumps(item, sort_keys=True, default=str)
+                    fingerprint = serialize_canonical(item, default=str)
 
                 if fingerprint in seen:
                     continue
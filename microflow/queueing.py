@@ -1,6 +1,5 @@
 """Queue abstractions for workflow job dispatching."""
 
-import json
 import os
 import time
 import uuid
@@ -8,6 +7,8 @@ from collections import deque
 from dataclasses import dataclass
 from typing import Any, Deque, Dict, Optional, Tuple
 
+from .serialization import get_codec
+
 
 @dataclass
 class QueueMessage:
@@ -71,7 +72,10 @@ class RedisWorkflowQueue:
         dlq_stream: str = "microflow:queue:dlq",
         max_attempts: int = 5,
         client: Optional[Any] = None,
+        serializer: str = "json",
     ):
+        # Producers and consumers of a stream must agree on the serializer
+        self._dumps, self._loads = get_codec(serializer)
         if client is None:
             try:
                 import redis  # type: ignore[import-not-found]
@@ -98,7 +102,7 @@ class RedisWorkflowQueue:
     def enqueue(self, payload: Dict[str, Any], message_id: Optional[str] = None) -> str:
         msg_id = message_id or "*"
         fields = {
-            "payload": json.dumps(payload, default=str),
+            "payload": self._dumps(payload, default=str),
             "attempts": "0",
         }
         created = self.client.xadd(self.stream, fields, id=msg_id)
@@ -124,12 +128,10 @@ class RedisWorkflowQueue:
         payload_raw = fields.get(b"payload") or fields.get("payload")
         attempts_raw = fields.get(b"attempts") or fields.get("attempts") or b"0"
 
-        if isinstance(payload_raw, bytes):
-            payload_raw = payload_raw.decode("utf-8")
         if isinstance(attempts_raw, bytes):
             attempts_raw = attempts_raw.decode("utf-8")
 
-        payload = json.loads(payload_raw) if payload_raw else {}
+        payload = self._loads(payload_raw) if payload_raw else {}
         attempts = int(attempts_raw) + 1
 
         # Persist incremented attempts on the same stream entry by appending metadata entry.
@@ -146,7 +148,7 @@ class RedisWorkflowQueue:
             self.client.xadd(
                 self.dlq_stream,
                 {
-                    "payload": json.dumps(payload, default=str),
+                    "payload": self._dumps(payload, default=str),
                     "attempts": str(attempts),
                     "source_message_id": message_id,
                 },
@@ -158,7 +160,7 @@ class RedisWorkflowQueue:
         self.client.xadd(
             self.stream,
             {
-                "payload": json.dumps(payload, default=str),
+                "payload": self._dumps(payload, default=str),
                 "attempts": str(attempts),
             },
         )
@@ -199,6 +201,9 @@ def create_workflow_queue_from_env(**overrides: Any) -> Tuple[str, object]:
         if max_attempts_raw is None:
             max_attempts_raw = os.getenv("QUEUE_MAX_ATTEMPTS", "5")
         max_attempts = int(str(max_attempts_raw))
+        serializer = str(
+            overrides.get("serializer") or os.getenv("QUEUE_SERIALIZER", "json")
+        ).lower()
 
         queue = RedisWorkflowQueue(
             redis_url=redis_url,
@@ -208,6 +213,7 @@ def create_workflow_queue_from_env(**overrides: Any) -> Tuple[str, object]:
             dlq_stream=dlq_stream,
             max_attempts=max_attempts,
             client=overrides.get("client"),
+            serializer=serializer,
         )
         return provider, queue
 
@@ -0,0 +1,140 @@
+"""JSON serialization helpers with an optional orjson fast path."""
+
+import dataclasses
+import json
+from typing import Any, Callable, Optional, Tuple, Union
+
+orjson: Any = None
+try:
+    import orjson  # type: ignore[no-redef]
+except ImportError:
+    pass
+
+msgpack: Any = None
+try:
+    import msgpack  # type: ignore[no-redef]
+except ImportError:
+    pass
+
+ORJSON_AVAILABLE = orjson is not None
+
+
+def _orjson_options(indent: Optional[int], sort_keys: bool) -> int:
+    # numpy arrays/scalars and dataclasses are encoded natively, not via ``default``
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if indent == 2:
+        option |= orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return option
+
+
+def _stdlib_default(
+    default: Optional[Callable[[Any], Any]],
+) -> Callable[[Any], Any]:
+    """Match orjson's native types (dataclasses, numpy) before falling back to ``default``"""
+
+    def _default(obj: Any) -> Any:
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return dataclasses.asdict(obj)
+        tolist = getattr(obj, "tolist", None)
+        if tolist is not None and type(obj).__module__ == "numpy":
+            return tolist()
+        if default is None:
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        return default(obj)
+
+    return _default
+
+
+def dumps_bytes(
+    obj: Any,
+    indent: Optional[int] = None,
+    sort_keys: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> bytes:
+    """Serialize to UTF-8 encoded JSON bytes (non-ASCII is kept as-is)."""
+    if orjson is not None and indent in (None, 2):
+        try:
+            return orjson.dumps(
+                obj, default=default, option=_orjson_options(indent, sort_keys)
+            )
+        except TypeError:
+            # Values orjson rejects (e.g. >64-bit ints) go through the stdlib
+            pass
+
+    return json.dumps(
+        obj,
+        indent=indent,
+        sort_keys=sort_keys,
+        default=_stdlib_default(default),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def dumps(
+    obj: Any,
+    indent: Optional[int] = None,
+    sort_keys: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> str:
+    """Serialize to a JSON string (non-ASCII is kept as-is)."""
+    return dumps_bytes(obj, indent=indent, sort_keys=sort_keys, default=default).decode(
+        "utf-8"
+    )
+
+
+def serialize_canonical(
+    obj: Any, default: Optional[Callable[[Any], Any]] = repr
+) -> bytes:
+    """
+    Serialize to compact JSON bytes with sorted keys.
+
+    Dict key order does not affect the output, and the same value encodes to
+    the same bytes as long as the same encoder is used (orjson when installed,
+    else the stdlib), so the output can be hashed for cache keys and
+    fingerprints. It is not a normal form: values that compare equal but have
+    different types (``1``, ``1.0``, ``True``) encode differently, and the orjson
+    and stdlib outputs differ in formatting. Unsupported values fall back to
+    ``default``.
+    """
+    return dumps_bytes(obj, sort_keys=True, default=default)
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Deserialize JSON from str or bytes."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # The stdlib also accepts NaN/Infinity and arbitrary-size ints
+            pass
+
+    return json.loads(data)
+
+
+def _msgpack_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True, default=default)
+
+
+def _msgpack_loads(data: Union[bytes, bytearray]) -> Any:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def get_codec(
+    name: str,
+) -> Tuple[Callable[..., bytes], Callable[[Union[str, bytes, bytearray]], Any]]:
+    """
+    Return ``(dumps, loads)`` for a payload format: "json" or "msgpack".
+
+    ``dumps(obj, default=None)`` returns bytes; decode errors raise ValueError.
+    """
+    if name == "json":
+        return dumps_bytes, loads
+    if name == "msgpack":
+        if msgpack is None:
+            raise ImportError(
+                "msgpack is required for serializer='msgpack'. Install with: pip install msgpack"
+            )
+        return _msgpack_dumps, _msgpack_loads
+    raise ValueError(f"Unknown serializer: {name!r}")
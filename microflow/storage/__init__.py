@@ -1,6 +1,15 @@
 """Storage backends for workflow state"""
 
+from .buffered_store import BufferedStateStore
 from .json_store import JSONStateStore
+from .memory_store import MemoryStateStore
+from .msgpack_store import MsgpackStateStore
 from .redis_store import RedisStateStore
 
-__all__ = ["JSONStateStore", "RedisStateStore"]
+__all__ = [
+    "BufferedStateStore",
+    "JSONStateStore",
+    "MemoryStateStore",
+    "MsgpackStateStore",
+    "RedisStateStore",
+]
@@ -0,0 +1,211 @@
+"""Write-coalescing wrapper for state stores."""
+
+import asyncio
+import atexit
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+_writer_pool: Optional[ThreadPoolExecutor] = None
+_writer_pool_lock = Lock()
+
+# Stores with possibly unflushed writes, flushed when the interpreter exits
+_open_stores: "weakref.WeakSet[BufferedStateStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    for store in list(_open_stores):
+        # The writer thread pool is already shut down at this point
+        store.background = False
+        try:
+            store._sync()
+        except Exception:
+            # Nothing left to report the error to at exit
+            pass
+
+
+def _shared_writer() -> ThreadPoolExecutor:
+    """Single background thread shared by all background stores, so writes stay ordered"""
+    global _writer_pool
+    with _writer_pool_lock:
+        if _writer_pool is None:
+            _writer_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="microflow-store-writer"
+            )
+        return _writer_pool
+
+
+class BufferedStateStore:
+    """
+    Buffer ``update_ctx`` / ``upsert_task`` writes in memory and flush them in batches.
+
+    Repeated writes for the same run or task collapse into one write to the wrapped
+    store (last write wins per field). Pending writes are flushed ``flush_interval_s``
+    after the first buffered write, once ``max_pending`` entries accumulate, and
+    before any read, status change, or delete, so readers always see the latest state.
+    ``close()`` (and interpreter exit) flushes whatever is still pending.
+
+    Useful in front of stores where each write rewrites the whole run
+    (e.g. ``RedisStateStore``). Other attributes are delegated to the wrapped store.
+
+    With ``background=True`` flushed batches are written by a background thread, so
+    disk or network I/O does not block the event loop; reads wait for it to catch up.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        flush_interval_s: float = 0.01,
+        max_pending: int = 64,
+        background: bool = False,
+    ):
+        self.store = store
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self.background = background
+        self._inflight: List[Future] = []
+        self._ctx_updates: Dict[str, Dict[str, Any]] = {}
+        self._task_updates: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = Lock()
+        _open_stores.add(self)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not defined here (data_dir, close, ...)
+        return getattr(self.store, name)
+
+    def _schedule_flush(self) -> None:
+        if len(self._ctx_updates) + len(self._task_updates) >= self.max_pending:
+            self.flush()
+            return
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if self._flush_handle is not None:
+            if self._flush_loop is loop:
+                return
+            # The timer belongs to another (possibly closed) event loop and may
+            # never fire: replace it
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if loop is None:
+            # No event loop to defer to: write through
+            self.flush()
+            return
+        self._flush_loop = loop
+        self._flush_handle = loop.call_later(self.flush_interval_s, self.flush)
+
+    def _write_batch(
+        self,
+        ctx_updates: Dict[str, Dict[str, Any]],
+        task_updates: Dict[Tuple[str, str], Dict[str, Any]],
+    ) -> None:
+        try:
+            for run_id, ctx_update in ctx_updates.items():
+                self.store.update_ctx(run_id, ctx_update)
+            for (run_id, name), fields in task_updates.items():
+                self.store.upsert_task(run_id, name, **fields)
+        except Exception:
+            # Put the batch back (under any newer updates) so the next flush retries it
+            self._requeue(ctx_updates, task_updates)
+            raise
+
+    def _requeue(
+        self,
+        ctx_updates: Dict[str, Dict[str, Any]],
+        task_updates: Dict[Tuple[str, str], Dict[str, Any]],
+    ) -> None:
+        with self._lock:
+            for run_id, ctx_update in ctx_updates.items():
+                ctx_update.update(self._ctx_updates.get(run_id, {}))
+                self._ctx_updates[run_id] = ctx_update
+            for key, fields in task_updates.items():
+                fields.update(self._task_updates.get(key, {}))
+                self._task_updates[key] = fields
+
+    def flush(self) -> None:
+        """Send all pending updates to the wrapped store (in the background if enabled)."""
+        with self._lock:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            ctx_updates, self._ctx_updates = self._ctx_updates, {}
+            task_updates, self._task_updates = self._task_updates, {}
+            if not (ctx_updates or task_updates):
+                return
+            if self.background:
+                self._inflight.append(
+                    _shared_writer().submit(self._write_batch, ctx_updates, task_updates)
+                )
+                return
+
+        self._write_batch(ctx_updates, task_updates)
+
+    def _sync(self) -> None:
+        """Flush and wait until every write has reached the wrapped store."""
+        self.flush()
+        with self._lock:
+            inflight, self._inflight = self._inflight, []
+        for future in inflight:
+            future.result()
+
+    async def drain(self) -> None:
+        """Flush pending updates and wait for background writes without blocking the loop."""
+        self.flush()
+        with self._lock:
+            inflight, self._inflight = self._inflight, []
+        for future in inflight:
+            await asyncio.wrap_future(future)
+
+    def close(self) -> None:
+        """Flush pending writes, then close the wrapped store if it supports it."""
+        self._sync()
+        close = getattr(self.store, "close", None)
+        if close is not None:
+            close()
+
+    def init_run(self, run_id: str, ctx: Dict[str, Any]) -> None:
+        self._sync()
+        self.store.init_run(run_id, ctx)
+
+    def set_run_status(self, run_id: str, status: str) -> None:
+        self._sync()
+        self.store.set_run_status(run_id, status)
+
+    def update_ctx(self, run_id: str, ctx_update: Dict[str, Any]) -> None:
+        with self._lock:
+            self._ctx_updates.setdefault(run_id, {}).update(ctx_update)
+        self._schedule_flush()
+
+    def upsert_task(self, run_id: str, name: str, **kwargs) -> None:
+        with self._lock:
+            self._task_updates.setdefault((run_id, name), {}).update(kwargs)
+        self._schedule_flush()
+
+    def get_ctx(self, run_id: str) -> Dict[str, Any]:
+        self._sync()
+        return self.store.get_ctx(run_id)
+
+    def get_task(self, run_id: str, name: str) -> Optional[Dict[str, Any]]:
+        self._sync()
+        return self.store.get_task(run_id, name)
+
+    def get_run_info(self, run_id: str) -> Dict[str, Any]:
+        self._sync()
+        return self.store.get_run_info(run_id)
+
+    def list_runs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        self._sync()
+        return self.store.list_runs(status=status)
+
+    def delete_run(self, run_id: str) -> bool:
+        self._sync()
+        return self.store.delete_run(run_id)
+
+    def cleanup_old_runs(self, days: int = 30) -> int:
+        self._sync()
+        return self.store.cleanup_old_runs(days=days)
@@ -1,45 +1,141 @@
 """JSON file-based state storage for workflows"""
 
-import json
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from threading import RLock
+from typing import Any, BinaryIO, ClassVar, Dict, List, Optional, Tuple
+from threading import Lock, RLock
+
+from .. import serialization
 
 
 class JSONStateStore:
-    """File-based state store using JSON files"""
+    """File-based state store using JSON files.
+
+    Task and ctx updates are appended to a per-run JSONL event log and folded
+    into the run snapshot when the run status changes, so each update costs
+    one small append instead of a full snapshot rewrite.
+    """
+
+    # Serialization hooks; subclasses may swap the on-disk format
+    file_suffix: ClassVar[str] = ".json"
+
+    _instances: ClassVar[Dict[Any, "JSONStateStore"]] = {}
+    _instances_lock: ClassVar[Lock] = Lock()
+
+    # Upper bound on event-log file handles kept open per store
+    max_open_event_logs: ClassVar[int] = 64
+
+    @classmethod
+    def get_or_create(cls, data_dir: str = "./data") -> "JSONStateStore":
+        """Return a shared store for ``data_dir``, creating it on first use"""
+        key = (cls, Path(data_dir).resolve())
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None:
+                store = cls(data_dir)
+                cls._instances[key] = store
+            return store
 
     def __init__(self, data_dir: str = "./data"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.runs_dir = self.data_dir / "runs"
         self.runs_dir.mkdir(exist_ok=True)
+        self.cache_dir = self.data_dir / "cache"
         self._lock = RLock()
+        # Open append handles for in-progress event logs, least recently used first
+        self._event_logs: "OrderedDict[str, BinaryIO]" = OrderedDict()
+
+    def _encode(self, data: Dict[str, Any]) -> bytes:
+        """Serialize run data for storage"""
+        return serialization.dumps_bytes(data, indent=2, default=str)
+
+    def _decode(self, raw: bytes) -> Dict[str, Any]:
+        """Deserialize stored run data"""
+        return serialization.loads(raw)
 
     def _run_file(self, run_id: str) -> Path:
-        """Get the JSON file path for a workflow run"""
-        return self.runs_dir / f"{run_id}.json"
+        """Get the file path for a workflow run"""
+        return self.runs_dir / f"{run_id}{self.file_suffix}"
+
+    def _events_file(self, run_id: str) -> Path:
+        """Get the JSONL event log path for a workflow run"""
+        return self.runs_dir / f"{run_id}.jsonl"
+
+    def _read_file(self, run_file: Path) -> Dict[str, Any]:
+        """Read and decode a run file"""
+        with open(run_file, "rb") as f:
+            return self._decode(f.read())
+
+    def _append_event(self, run_id: str, event: Tuple[Any, ...]) -> None:
+        """Append one state change to the run's event log.
+
+        Events are compact arrays: ``["ctx", update]`` or ``["task", name, fields]``.
+        """
+        line = serialization.dumps_bytes(event, default=str) + b"\n"
+        with self._lock:
+            handle = self._event_logs.get(run_id)
+            if handle is None:
+                # Unbuffered, so every append is visible to readers right away
+                handle = open(self._events_file(run_id), "ab", buffering=0)
+                self._event_logs[run_id] = handle
+                if len(self._event_logs) > self.max_open_event_logs:
+                    self._event_logs.popitem(last=False)[1].close()
+            else:
+                self._event_logs.move_to_end(run_id)
+            handle.write(line)
+
+    def _close_event_log(self, run_id: str) -> None:
+        """Close the run's cached append handle, if any"""
+        with self._lock:
+            handle = self._event_logs.pop(run_id, None)
+            if handle is not None:
+                handle.close()
+
+    def close(self) -> None:
+        """Close event-log handles of runs that are still in progress"""
+        with self._lock:
+            while self._event_logs:
+                self._event_logs.popitem()[1].close()
+
+    def _apply_events(self, run_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Replay logged events on top of a run snapshot"""
+        try:
+            with open(self._events_file(run_id), "rb") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return data
+
+        for line in lines:
+            try:
+                event = serialization.loads(line)
+            except ValueError:
+                # Torn trailing line from an interrupted append
+                continue
+
+            op = event[0]
+            if op == "ctx":
+                data.setdefault("ctx", {}).update(event[1])
+            elif op == "task":
+                tasks = data.setdefault("tasks", {})
+                tasks.setdefault(event[1], {}).update(event[2])
+
+        return data
 
     def _load_run_data(self, run_id: str) -> Dict[str, Any]:
         """Load run data from JSON file"""
         run_file = self._run_file(run_id)
-        if not run_file.exists():
-            return {
-                "id": run_id,
-                "status": "pending",
-                "started": None,
-                "finished": None,
-                "ctx": {},
-                "tasks": {},
-            }
+        data = None
+        if run_file.exists():
+            try:
+                data = self._read_file(run_file)
+            except (ValueError, IOError):
+                # Fall back to the default structure if file is corrupted
+                pass
 
-        try:
-            with open(run_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            # Return default structure if file is corrupted
-            return {
+        if data is None:
+            data = {
                 "id": run_id,
                 "status": "pending",
                 "started": None,
@@ -48,20 +144,24 @@ class JSONStateStore:
                 "tasks": {},
             }
 
+        return self._apply_events(run_id, data)
+
     def _save_run_data(self, run_id: str, data: Dict[str, Any]) -> None:
-        """Save run data to JSON file"""
+        """Save a run snapshot and drop the events it now contains"""
         run_file = self._run_file(run_id)
         with self._lock:
             # Atomic write using temporary file
             temp_file = run_file.with_suffix(".tmp")
             try:
-                with open(temp_file, "w") as f:
-                    json.dump(data, f, indent=2, default=str)
+                with open(temp_file, "wb") as f:
+                    f.write(self._encode(data))
                 temp_file.replace(run_file)
             except Exception:
                 if temp_file.exists():
                     temp_file.unlink()
                 raise
+            self._close_event_log(run_id)
+            self._events_file(run_id).unlink(missing_ok=True)
 
     def init_run(self, run_id: str, ctx: Dict[str, Any]) -> None:
         """Initialize a new workflow run"""
@@ -76,12 +176,13 @@ class JSONStateStore:
         self._save_run_data(run_id, data)
 
     def set_run_status(self, run_id: str, status: str) -> None:
-        """Update workflow run status"""
-        data = self._load_run_data(run_id)
-        data["status"] = status
-        if status in ["success", "failed", "stalled"]:
-            data["finished"] = time.time()
-        self._save_run_data(run_id, data)
+        """Update workflow run status (compacts the event log)"""
+        with self._lock:
+            data = self._load_run_data(run_id)
+            data["status"] = status
+            if status in ["success", "failed", "stalled"]:
+                data["finished"] = time.time()
+            self._save_run_data(run_id, data)
 
     def get_ctx(self, run_id: str) -> Dict[str, Any]:
         """Get workflow context"""
@@ -90,26 +191,12 @@ class JSONStateStore:
 
     def update_ctx(self, run_id: str, ctx_update: Dict[str, Any]) -> None:
         """Update workflow context"""
-        with self._lock:
-            data = self._load_run_data(run_id)
-            data["ctx"].update(ctx_update)
-            self._save_run_data(run_id, data)
+        self._append_event(run_id, ("ctx", ctx_update))
 
     def upsert_task(self, run_id: str, name: str, **kwargs) -> None:
         """Insert or update task state"""
-        with self._lock:
-            data = self._load_run_data(run_id)
-
-            if name not in data["tasks"]:
-                data["tasks"][name] = {}
-
-            # Update task data
-            task_data = data["tasks"][name]
-            for key, value in kwargs.items():
-                if value is not None:
-                    task_data[key] = value
-
-            self._save_run_data(run_id, data)
+        fields = {key: value for key, value in kwargs.items() if value is not None}
+        self._append_event(run_id, ("task", name, fields))
 
     def get_task(self, run_id: str, name: str) -> Optional[Dict[str, Any]]:
         """Get task state"""
@@ -124,13 +211,12 @@ class JSONStateStore:
         """List all workflow runs, optionally filtered by status"""
         runs = []
 
-        for run_file in self.runs_dir.glob("*.json"):
+        for run_file in self.runs_dir.glob(f"*{self.file_suffix}"):
             try:
-                with open(run_file, "r") as f:
-                    data = json.load(f)
-                    if status is None or data.get("status") == status:
-                        runs.append(data)
-            except (json.JSONDecodeError, IOError):
+                data = self._apply_events(run_file.stem, self._read_file(run_file))
+                if status is None or data.get("status") == status:
+                    runs.append(data)
+            except (ValueError, IOError):
                 continue
 
         # Sort by started time, newest first
@@ -140,25 +226,48 @@ class JSONStateStore:
     def delete_run(self, run_id: str) -> bool:
         """Delete a workflow run"""
         run_file = self._run_file(run_id)
-        if run_file.exists():
-            run_file.unlink()
-            return True
-        return False
+        events_file = self._events_file(run_id)
+        self._close_event_log(run_id)
+        existed = run_file.exists() or events_file.exists()
+        run_file.unlink(missing_ok=True)
+        events_file.unlink(missing_ok=True)
+        return existed
+
+    def get_cached_result(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached pure-task result"""
+        try:
+            return serialization.loads((self.cache_dir / f"{key}.json").read_bytes())
+        except (ValueError, IOError):
+            return None
+
+    def set_cached_result(self, key: str, result: Dict[str, Any]) -> None:
+        """Cache a pure-task result (skipped if it is not JSON-serializable)"""
+        try:
+            payload = serialization.dumps_bytes(result)
+        except (TypeError, ValueError):
+            return
+
+        self.cache_dir.mkdir(exist_ok=True)
+        cache_file = self.cache_dir / f"{key}.json"
+        temp_file = cache_file.with_suffix(".tmp")
+        temp_file.write_bytes(payload)
+        temp_file.replace(cache_file)
 
     def cleanup_old_runs(self, days: int = 30) -> int:
         """Clean up runs older than specified days"""
         cutoff = time.time() - (days * 24 * 60 * 60)
         deleted_count = 0
 
-        for run_file in self.runs_dir.glob("*.json"):
+        for run_file in self.runs_dir.glob(f"*{self.file_suffix}"):
             try:
-                with open(run_file, "r") as f:
-                    data = json.load(f)
-                    started = data.get("started", 0)
-                    if started < cutoff:
-                        run_file.unlink()
-                        deleted_count += 1
-            except (json.JSONDecodeError, IOError):
+                data = self._read_file(run_file)
+                started = data.get("started", 0)
+                if started < cutoff:
+                    run_file.unlink()
+                    self._close_event_log(run_file.stem)
+                    self._events_file(run_file.stem).unlink(missing_ok=True)
+                    deleted_count += 1
+            except (ValueError, IOError):
                 continue
 
         return deleted_count
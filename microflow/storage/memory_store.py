@@ -0,0 +1,95 @@
+"""In-memory state storage for ephemeral workflow runs"""
+
+import time
+from typing import Any, ClassVar, Dict, List, Optional
+
+
+class MemoryStateStore:
+    """
+    State store that keeps runs in process memory only.
+
+    Nothing is written to disk or the network, and the workflow engine skips
+    serializing task input/output snapshots for non-durable stores. Use it for
+    short-lived runs that need no recovery; state is lost with the process.
+    """
+
+    durable: ClassVar[bool] = False
+
+    def __init__(self):
+        self._runs: Dict[str, Dict[str, Any]] = {}
+
+    def _get_run(self, run_id: str) -> Dict[str, Any]:
+        run = self._runs.get(run_id)
+        if run is None:
+            run = self._runs[run_id] = {
+                "id": run_id,
+                "status": "pending",
+                "started": None,
+                "finished": None,
+                "ctx": {},
+                "tasks": {},
+            }
+        return run
+
+    def init_run(self, run_id: str, ctx: Dict[str, Any]) -> None:
+        """Initialize a new workflow run"""
+        self._runs[run_id] = {
+            "id": run_id,
+            "status": "running",
+            "started": time.time(),
+            "finished": None,
+            "ctx": dict(ctx),
+            "tasks": {},
+        }
+
+    def set_run_status(self, run_id: str, status: str) -> None:
+        """Update run status"""
+        run = self._get_run(run_id)
+        run["status"] = status
+        if status in ("success", "failed", "stalled"):
+            run["finished"] = time.time()
+
+    def get_ctx(self, run_id: str) -> Dict[str, Any]:
+        """Get a copy of the run context"""
+        return dict(self._get_run(run_id)["ctx"])
+
+    def update_ctx(self, run_id: str, ctx_update: Dict[str, Any]) -> None:
+        """Update run context"""
+        self._get_run(run_id)["ctx"].update(ctx_update)
+
+    def upsert_task(self, run_id: str, name: str, **kwargs) -> None:
+        """Insert or update task state"""
+        fields = {key: value for key, value in kwargs.items() if value is not None}
+        self._get_run(run_id)["tasks"].setdefault(name, {}).update(fields)
+
+    def get_task(self, run_id: str, name: str) -> Optional[Dict[str, Any]]:
+        """Get task state"""
+        return self._get_run(run_id)["tasks"].get(name)
+
+    def get_run_info(self, run_id: str) -> Dict[str, Any]:
+        """Get complete run information"""
+        return self._get_run(run_id)
+
+    def list_runs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List runs, optionally filtered by status"""
+        runs = [
+            run for run in self._runs.values() if status is None or run["status"] == status
+        ]
+        runs.sort(key=lambda run: run.get("started") or 0, reverse=True)
+        return runs
+
+    def delete_run(self, run_id: str) -> bool:
+        """Delete a run"""
+        return self._runs.pop(run_id, None) is not None
+
+    def cleanup_old_runs(self, days: int = 30) -> int:
+        """Delete runs started more than ``days`` ago"""
+        cutoff = time.time() - (days * 24 * 60 * 60)
+        old = [
+            run_id
+            for run_id, run in self._runs.items()
+            if (run.get("started") or 0) < cutoff
+        ]
+        for run_id in old:
+            del self._runs[run_id]
+        return len(old)
@@ -0,0 +1,35 @@
+"""MessagePack-backed file state storage for workflows."""
+
+from typing import Any, Dict
+
+from .json_store import JSONStateStore
+
+try:
+    import msgpack  # type: ignore[import-not-found]
+except ImportError:
+    msgpack = None
+
+
+class MsgpackStateStore(JSONStateStore):
+    """File state store that writes one MessagePack file per run.
+
+    Same layout and API as JSONStateStore, but run snapshots are binary and
+    considerably cheaper to encode/decode for large contexts. The per-run
+    event log stays JSONL.
+    """
+
+    file_suffix = ".msgpack"
+
+    def __init__(self, data_dir: str = "./data"):
+        if msgpack is None:
+            raise ImportError(
+                "msgpack is required for MsgpackStateStore. Install with: pip install msgpack"
+            )
+        super().__init__(data_dir)
+
+    def _encode(self, data: Dict[str, Any]) -> bytes:
+        return msgpack.packb(data, use_bin_type=True, default=str)
+
+    def _decode(self, raw: bytes) -> Dict[str, Any]:
+        # Corrupt payloads raise ValueError subclasses, handled by the base class
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
@@ -1,10 +1,11 @@
 """Redis-backed state storage for workflows."""
 
-import json
 import time
 from threading import RLock
 from typing import Any, Dict, Iterable, List, Optional
 
+from ..serialization import get_codec
+
 try:
     import redis  # type: ignore[import-not-found]
 except ImportError:
@@ -12,13 +13,16 @@ except ImportError:
 
 
 class RedisStateStore:
-    """Redis state store using one JSON blob per run."""
+    """Redis state store using one JSON (or MessagePack) blob per run."""
 
     def __init__(
         self,
         redis_url: str = "redis://localhost:6379/0",
         key_prefix: str = "microflow:runs",
         client: Optional[Any] = None,
+        cache_prefix: str = "microflow:cache",
+        cache_ttl_s: Optional[int] = None,
+        serializer: str = "json",
     ):
         if client is None:
             if redis is None:
@@ -29,7 +33,12 @@ class RedisStateStore:
         else:
             self.client = client
 
+        # "msgpack" gives smaller payloads; "json" stays readable by other tools
+        self._dumps, self._loads = get_codec(serializer)
+        self.serializer = serializer
         self.key_prefix = key_prefix.rstrip(":")
+        self.cache_prefix = cache_prefix.rstrip(":")
+        self.cache_ttl_s = cache_ttl_s
         self._lock = RLock()
 
     def _run_key(self, run_id: str) -> str:
@@ -55,21 +64,23 @@ class RedisStateStore:
             "tasks": {},
         }
 
-    def _load_run_data(self, run_id: str) -> Dict[str, Any]:
-        raw = self._decode(self.client.get(self._run_key(run_id)))
+    def _load_payload(self, raw: Any) -> Optional[Dict[str, Any]]:
         if raw is None:
-            return self._default_run_data(run_id)
-
+            return None
         try:
-            data = json.loads(raw)
-            if isinstance(data, dict):
-                return data
-            return self._default_run_data(run_id)
-        except (json.JSONDecodeError, TypeError, ValueError):
+            data = self._loads(raw)
+        except (TypeError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _load_run_data(self, run_id: str) -> Dict[str, Any]:
+        data = self._load_payload(self.client.get(self._run_key(run_id)))
+        if data is None:
             return self._default_run_data(run_id)
+        return data
 
     def _save_run_data(self, run_id: str, data: Dict[str, Any]) -> None:
-        payload = json.dumps(data, default=str)
+        payload = self._dumps(data, default=str)
         self.client.set(self._run_key(run_id), payload)
 
     def init_run(self, run_id: str, ctx: Dict[str, Any]) -> None:
@@ -129,21 +140,30 @@ class RedisStateStore:
     def list_runs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
         runs: List[Dict[str, Any]] = []
         for key in self._iter_run_keys():
-            raw = self._decode(self.client.get(key))
-            if raw is None:
-                continue
-            try:
-                data = json.loads(raw)
-                if not isinstance(data, dict):
-                    continue
-                if status is None or data.get("status") == status:
-                    runs.append(data)
-            except (json.JSONDecodeError, TypeError, ValueError):
+            data = self._load_payload(self.client.get(key))
+            if data is None:
                 continue
+            if status is None or data.get("status") == status:
+                runs.append(data)
 
         runs.sort(key=lambda x: x.get("started", 0) or 0, reverse=True)
         return runs
 
+    def get_cached_result(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._load_payload(self.client.get(f"{self.cache_prefix}:{key}"))
+
+    def set_cached_result(self, key: str, result: Dict[str, Any]) -> None:
+        try:
+            payload = self._dumps(result)
+        except (TypeError, ValueError):
+            return
+
+        cache_key = f"{self.cache_prefix}:{key}"
+        if self.cache_ttl_s:
+            self.client.setex(cache_key, self.cache_ttl_s, payload)
+        else:
+            self.client.set(cache_key, payload)
+
     def delete_run(self, run_id: str) -> bool:
         return bool(self.client.delete(self._run_key(run_id)))
 
@@ -152,15 +172,11 @@ class RedisStateStore:
         deleted = 0
 
         for key in self._iter_run_keys():
-            raw = self._decode(self.client.get(key))
-            if raw is None:
-                continue
-            try:
-                data = json.loads(raw)
-                started = data.get("started", 0) if isinstance(data, dict) else 0
-                if started and started < cutoff:
-                    deleted += int(self.client.delete(key))
-            except (json.JSONDecodeError, TypeError, ValueError):
+            data = self._load_payload(self.client.get(key))
+            if data is None:
                 continue
+            started = data.get("started", 0)
+            if started and started < cutoff:
+                deleted += int(self.client.delete(key))
 
         return deleted
@@ -36,7 +36,13 @@ setup(
             "mypy>=1.7.1",
             "pandas-stubs>=2.2.0",
             "types-openpyxl>=3.1.0",
-        ]
+        ],
+        # Faster event loop (used by run_async) and serializers
+        "speed": [
+            "uvloop>=0.19.0; sys_platform != 'win32'",
+            "orjson>=3.8.0",
+            "msgpack>=1.0.0",
+        ],
     },
     entry_points={
         "console_scripts": [
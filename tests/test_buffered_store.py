@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from microflow import BufferedStateStore, JSONStateStore, Workflow, task
+
+
+class CountingStore(JSONStateStore):
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self.writes = 0
+
+    def update_ctx(self, run_id, ctx_update):
+        self.writes += 1
+        super().update_ctx(run_id, ctx_update)
+
+    def upsert_task(self, run_id, name, **kwargs):
+        self.writes += 1
+        super().upsert_task(run_id, name, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_buffered_store_coalesces_writes_until_read(tmp_path):
+    inner = CountingStore(str(tmp_path))
+    store = BufferedStateStore(inner, flush_interval_s=10.0)
+
+    store.init_run("r1", {"a": 1})
+    store.update_ctx("r1", {"b": 2})
+    store.update_ctx("r1", {"b": 3, "c": 4})
+    store.upsert_task("r1", "t1", status="running", attempt=1)
+    store.upsert_task("r1", "t1", status="success")
+
+    assert inner.writes == 0
+    assert store.get_ctx("r1") == {"a": 1, "b": 3, "c": 4}
+    assert store.get_task("r1", "t1") == {"status": "success", "attempt": 1}
+    assert inner.writes == 2
+    assert store.data_dir == inner.data_dir
+
+
+@pytest.mark.asyncio
+async def test_buffered_store_flushes_on_timer_and_threshold(tmp_path):
+    inner = CountingStore(str(tmp_path))
+    store = BufferedStateStore(inner, flush_interval_s=0.01, max_pending=2)
+    store.init_run("r1", {})
+
+    store.upsert_task("r1", "t1", status="success")
+    await asyncio.sleep(0.05)
+    assert inner.writes == 1
+
+    store.upsert_task("r1", "t2", status="success")
+    store.upsert_task("r1", "t3", status="success")
+    assert inner.writes == 3
+
+
+def test_buffered_store_reschedules_timer_on_a_new_event_loop(tmp_path):
+    inner = CountingStore(str(tmp_path))
+    store = BufferedStateStore(inner, flush_interval_s=0.01)
+    store.init_run("r1", {})
+
+    async def write(key):
+        store.update_ctx("r1", {key: True})
+
+    async def write_and_wait(key):
+        store.update_ctx("r1", {key: True})
+        await asyncio.sleep(0.05)
+
+    # The first loop closes before its flush timer fires
+    asyncio.run(write("a"))
+    asyncio.run(write_and_wait("b"))
+
+    assert inner.writes == 1
+    assert inner.get_ctx("r1") == {"a": True, "b": True}
+
+
+def test_buffered_store_requeues_failed_batches_and_flushes_on_close(tmp_path):
+    class FlakyStore(CountingStore):
+        fail = True
+
+        def upsert_task(self, run_id, name, **kwargs):
+            if self.fail:
+                raise OSError("disk full")
+            super().upsert_task(run_id, name, **kwargs)
+
+    inner = FlakyStore(str(tmp_path))
+    store = BufferedStateStore(inner, max_pending=100)
+    store.init_run("r1", {})
+
+    async def write():
+        store.upsert_task("r1", "t1", status="running", attempt=1)
+        with pytest.raises(OSError):
+            store.flush()
+        store.upsert_task("r1", "t1", status="success")
+
+    asyncio.run(write())
+    inner.fail = False
+    store.close()
+
+    assert inner.get_task("r1", "t1") == {"status": "success", "attempt": 1}
+
+
+def test_workflow_runs_through_buffered_store(tmp_path):
+    @task(name="first")
+    def first(ctx):
+        return {"x": 1}
+
+    @task(name="second")
+    def second(ctx):
+        return {"y": ctx["x"] + 1}
+
+    first >> second
+    inner = JSONStateStore(str(tmp_path))
+    store = BufferedStateStore(inner)
+
+    result = asyncio.run(Workflow([first, second]).run("buffered", store))
+
+    assert result["y"] == 2
+    info = inner.get_run_info("buffered")
+    assert info["status"] == "success"
+    assert info["tasks"]["second"]["status"] == "success"
+
+
+def test_offloaded_store_io_writes_from_background_thread(tmp_path):
+    import threading
+
+    writer_threads = set()
+
+    class ThreadRecordingStore(JSONStateStore):
+        def upsert_task(self, run_id, name, **kwargs):
+            writer_threads.add(threading.current_thread().name)
+            super().upsert_task(run_id, name, **kwargs)
+
+    @task(name="step")
+    async def step(ctx):
+        await asyncio.sleep(0)
+        return {"done": True}
+
+    inner = ThreadRecordingStore(str(tmp_path))
+    workflow = Workflow([step], offload_store_io=True)
+
+    result = asyncio.run(workflow.run("offloaded", inner))
+
+    assert result["done"] is True
+    assert inner.get_run_info("offloaded")["tasks"]["step"]["status"] == "success"
+    assert all(name.startswith("microflow-store-writer") for name in writer_threads)
@@ -0,0 +1,119 @@
+import pytest
+
+from microflow.storage.json_store import JSONStateStore
+
+
+def test_get_or_create_shares_instances_per_directory(tmp_path):
+    first = JSONStateStore.get_or_create(str(tmp_path))
+    again = JSONStateStore.get_or_create(str(tmp_path / "."))
+    other = JSONStateStore.get_or_create(str(tmp_path / "other"))
+
+    assert first is again
+    assert other is not first
+
+    first.init_run("shared", {"a": 1})
+    assert again.get_ctx("shared") == {"a": 1}
+
+
+def test_run_files_round_trip_through_encode_hooks(tmp_path):
+    store = JSONStateStore(str(tmp_path))
+    store.init_run("r1", {"name": "café"})
+    store.upsert_task("r1", "t", status="success")
+
+    assert (tmp_path / "runs" / "r1.json").exists()
+    assert store.get_ctx("r1") == {"name": "café"}
+    assert [run["id"] for run in store.list_runs()] == ["r1"]
+
+    (tmp_path / "runs" / "r1.json").write_bytes(b"{not json")
+    assert store.get_ctx("r1") == {}
+    store.close()
+
+
+def test_msgpack_store_uses_binary_run_files(tmp_path):
+    pytest.importorskip("msgpack")
+    from microflow.storage.msgpack_store import MsgpackStateStore
+
+    store = MsgpackStateStore(str(tmp_path))
+    store.init_run("r1", {"count": 3})
+    store.update_ctx("r1", {"extra": [1, 2]})
+
+    assert (tmp_path / "runs" / "r1.msgpack").exists()
+    assert store.get_ctx("r1") == {"count": 3, "extra": [1, 2]}
+    assert len(store.list_runs()) == 1
+
+
+def test_updates_append_to_event_log_until_status_change(tmp_path):
+    store = JSONStateStore(str(tmp_path))
+    store.init_run("r1", {"a": 1})
+    snapshot = (tmp_path / "runs" / "r1.json").read_bytes()
+
+    store.update_ctx("r1", {"b": 2})
+    store.upsert_task("r1", "t", status="running", started=1.0)
+    store.upsert_task("r1", "t", status="success", error=None)
+
+    events = tmp_path / "runs" / "r1.jsonl"
+    assert len(events.read_bytes().splitlines()) == 3
+    assert (tmp_path / "runs" / "r1.json").read_bytes() == snapshot
+    assert store.get_ctx("r1") == {"a": 1, "b": 2}
+    assert store.get_task("r1", "t") == {"status": "success", "started": 1.0}
+
+    store.set_run_status("r1", "success")
+    assert not events.exists()
+    info = store.get_run_info("r1")
+    assert info["status"] == "success"
+    assert info["tasks"]["t"]["status"] == "success"
+    assert store.delete_run("r1")
+
+
+def test_cached_results_skip_non_serializable_values(tmp_path):
+    store = JSONStateStore(str(tmp_path))
+
+    assert store.get_cached_result("k") is None
+    store.set_cached_result("k", {"value": [1, 2]})
+    assert store.get_cached_result("k") == {"value": [1, 2]}
+
+    store.set_cached_result("bad", {"value": object()})
+    assert store.get_cached_result("bad") is None
+
+
+def test_event_log_handles_are_reused_and_bounded(tmp_path, monkeypatch):
+    store = JSONStateStore(str(tmp_path))
+    monkeypatch.setattr(store, "max_open_event_logs", 2)
+
+    for run_id in ("a", "b", "c"):
+        store.init_run(run_id, {})
+        store.update_ctx(run_id, {"n": 1})
+        store.update_ctx(run_id, {"n": 2})
+
+    assert list(store._event_logs) == ["b", "c"]
+    assert store.get_ctx("a") == {"n": 2}
+
+    store.set_run_status("c", "success")
+    assert list(store._event_logs) == ["b"]
+    store.close()
+    assert not store._event_logs
+
+
+def test_sync_task_writes_a_single_terminal_record(tmp_path):
+    import asyncio
+
+    from microflow import Workflow, task
+
+    @task(name="quick")
+    def quick(ctx):
+        return {"done": True}
+
+    store = JSONStateStore(str(tmp_path))
+    upserts = []
+    original = store.upsert_task
+
+    def recording_upsert(run_id, name, **fields):
+        upserts.append(fields["status"])
+        original(run_id, name, **fields)
+
+    store.upsert_task = recording_upsert
+    asyncio.run(Workflow([quick]).run("single", store))
+
+    assert upserts == ["success"]
+    record = store.get_task("single", "quick")
+    assert record["input"] and record["started"] <= record["finished"]
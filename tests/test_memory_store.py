@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from microflow import JSONStateStore, MemoryStateStore, Workflow, task
+
+
+def test_memory_store_crud_and_listing():
+    store = MemoryStateStore()
+
+    store.init_run("run1", {"a": 1})
+    store.update_ctx("run1", {"b": 2})
+    store.upsert_task("run1", "t1", status="running", output=None)
+    store.upsert_task("run1", "t1", status="success")
+    store.set_run_status("run1", "success")
+
+    assert store.get_ctx("run1") == {"a": 1, "b": 2}
+    assert store.get_task("run1", "t1") == {"status": "success"}
+    assert [run["id"] for run in store.list_runs(status="success")] == ["run1"]
+    assert store.delete_run("run1") is True
+    assert store.delete_run("run1") is False
+
+
+def test_ephemeral_runs_skip_the_default_store(tmp_path, monkeypatch):
+    @task(name="step")
+    def step(ctx):
+        return {"value": 42}
+
+    monkeypatch.chdir(tmp_path)
+    workflow = Workflow([step])
+
+    assert asyncio.run(workflow.run())["value"] == 42
+    assert asyncio.run(workflow.run(run_id="named", durable=False))["value"] == 42
+    assert not (tmp_path / "data").exists()
+
+    asyncio.run(workflow.run(run_id="kept"))
+    assert (tmp_path / "data" / "runs" / "kept.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_non_durable_subworkflows_leave_no_child_runs(tmp_path):
+    from microflow.nodes.subworkflow import parallel_subworkflows
+
+    @task(name="child_step")
+    def child_step(ctx):
+        return {"doubled": ctx["n"] * 2}
+
+    node = parallel_subworkflows(
+        [
+            {"source": lambda: Workflow([child_step]), "name": "a"},
+            {"source": lambda: Workflow([child_step]), "name": "b", "durable": True},
+        ],
+        durable=False,
+    )
+    store = JSONStateStore(str(tmp_path))
+
+    result = await node.spec.fn({"n": 3, "_microflow_store": store})
+
+    assert [r["doubled"] for r in result["parallel_results"]] == [6, 6]
+    assert [run["id"].split("_")[0] for run in store.list_runs()] == ["b"]
+
+
+def test_run_accepts_non_string_context_keys():
+    @task(name="step")
+    def step(ctx):
+        return {"seen": ctx[1]}
+
+    workflow = Workflow([step])
+    ctx = asyncio.run(workflow.run(initial_ctx={1: "a"}, store=MemoryStateStore()))
+
+    assert ctx[1] == "a"
+    assert ctx["seen"] == "a"
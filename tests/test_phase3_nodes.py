@@ -90,3 +90,29 @@ async def test_foreach_collects_results_and_errors():
     assert result["foreach_failed"] == 1
     assert [x["value"] for x in result["out"]] == [10, 20, 40]
     assert any(d["error"] for d in result["foreach_details"])
+
+
+@pytest.mark.asyncio
+async def test_foreach_async_items_respect_max_concurrent():
+    active = 0
+    peak = 0
+
+    @task(name="async_item")
+    async def async_item(ctx):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        active -= 1
+        return {"value": ctx["item"], "index": ctx["_foreach_index"]}
+
+    limited = foreach(async_item, data_key="nums", max_concurrent=2)
+    result = await limited.spec.fn({"nums": [1, 2, 3, 4, 5]})
+    assert peak == 2
+    assert [r["index"] for r in result["foreach_results"]] == [0, 1, 2, 3, 4]
+
+    peak = 0
+    unlimited = foreach(async_item, data_key="nums", max_concurrent=10)
+    result = await unlimited.spec.fn({"nums": [1, 2, 3]})
+    assert peak == 3
+    assert result["foreach_succeeded"] == 3
@@ -1,4 +1,7 @@
 import asyncio
+import importlib
+import sys
+import types
 
 from microflow import task
 from microflow.nodes.control_plane import (
@@ -9,6 +12,7 @@ from microflow.nodes.control_plane import (
     queue_publish,
     trace_span,
 )
+from microflow.queueing import create_workflow_queue_from_env
 
 
 def test_metrics_emit_counter_increments():
@@ -21,17 +25,65 @@ def test_metrics_emit_counter_increments():
     assert second["m"]["metric_value"] >= first["m"]["metric_value"]
 
 
+def test_metrics_emit_counter_is_thread_safe():
+    from concurrent.futures import ThreadPoolExecutor
+
+    control_plane = importlib.import_module("microflow.nodes.control_plane")
+    node = metrics_emit("threaded_jobs", metric_type="counter")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(node.spec.fn, [{}] * 2000))
+
+    assert control_plane._MEMORY_METRICS["threaded_jobs"].value == 2000.0
+    assert metrics_emit("x", metric_type="histogram").spec.fn({})[
+        "metric_success"
+    ] is False
+
+
 def test_trace_span_wraps_task_result():
     @task(name="wrapped")
     def wrapped(ctx):
         return {"work_success": True, "x": 1}
 
+    @task(name="wrapped_async")
+    async def wrapped_async(ctx):
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
     node = trace_span(wrapped, span_name="wrapped_span")
-    result = asyncio.run(node.spec.fn({}))
+    result = node.spec.fn({})
+    async_node = trace_span(wrapped_async)
+    failed = asyncio.run(async_node.spec.fn({}))
 
+    assert not asyncio.iscoroutinefunction(node.spec.fn)
     assert result["trace_success"] is True
     assert result["trace_span"]["span_name"] == "wrapped_span"
+    assert result["trace_span"]["duration_s"] >= 0
     assert result["x"] == 1
+    assert asyncio.iscoroutinefunction(async_node.spec.fn)
+    assert failed["trace_success"] is False
+    assert failed["trace_span"]["error"] == "boom"
+
+
+def test_memory_metric_and_span_records():
+    control_plane = importlib.import_module("microflow.nodes.control_plane")
+
+    @task(name="traced")
+    def traced(ctx):
+        return {}
+
+    timer = metrics_emit("latency", value_key="ms", metric_type="timer", name="lat")
+    timer.spec.fn({"ms": 10})
+    timer.spec.fn({"ms": 20})
+    trace_span(traced, span_name="records_span").spec.fn({})
+
+    metric = control_plane._MEMORY_METRICS["latency"]
+    span = control_plane._MEMORY_TRACES[-1]
+    assert metric.to_dict()["value"] == 15.0
+    assert (metric.count, metric.sum) == (2, 30.0)
+    assert span.span_name == "records_span"
+    assert span.to_dict()["success"] is True
+    assert control_plane._MEMORY_TRACES.maxlen == control_plane._MAX_MEMORY_TRACES
 
 
 def test_human_approval_uses_context_decision():
@@ -42,6 +94,10 @@ def test_human_approval_uses_context_decision():
     assert approved["approval_result"]["approved"] is True
     assert rejected["approval_result"]["approved"] is False
 
+    defaulted = human_approval(prompt="?", default_decision=" Yes ").spec.fn({})
+    assert defaulted["approval_result"]["approved"] is True
+    assert defaulted["approval_result"]["status"] == "defaulted"
+
 
 def test_queue_publish_and_consume_memory_provider():
     publish = queue_publish(message_key="payload", provider="memory", output_key="mid")
@@ -55,6 +111,29 @@ def test_queue_publish_and_consume_memory_provider():
     assert con_result["msg"]["k"] == "v"
 
 
+def test_queue_nodes_reuse_queue_client(monkeypatch):
+    control_plane = importlib.import_module("microflow.nodes.control_plane")
+    created = []
+
+    def fake_create(provider=None, **kwargs):
+        created.append(provider)
+        return create_workflow_queue_from_env(provider="memory")
+
+    monkeypatch.setattr(control_plane, "create_workflow_queue_from_env", fake_create)
+    control_plane._cached_queue.cache_clear()
+    try:
+        publish = queue_publish(message_key="payload", provider="custom", name="pub")
+        consume = queue_consume(provider="custom", name="con")
+        publish.spec.fn({"payload": 1})
+        publish.spec.fn({"payload": 2})
+        consume.spec.fn({})
+        consume.spec.fn({})
+    finally:
+        control_plane._cached_queue.cache_clear()
+
+    assert created == ["custom"]
+
+
 def test_idempotency_guard_blocks_duplicates():
     node = idempotency_guard("job:{job_id}", provider="memory", output_key="idem")
 
@@ -63,3 +142,94 @@ def test_idempotency_guard_blocks_duplicates():
 
     assert first["idempotency_should_process"] is True
     assert second["idempotency_should_process"] is False
+
+
+def test_idempotency_guard_evicts_expired_memory_entries(monkeypatch):
+    control_plane = importlib.import_module("microflow.nodes.control_plane")
+    entries = control_plane.OrderedDict()
+    monkeypatch.setattr(control_plane, "_MEMORY_IDEMPOTENCY", entries)
+    node = idempotency_guard("evict:{n}", ttl_s=1, provider="memory")
+
+    for n in range(3):
+        node.spec.fn({"n": n})
+    monkeypatch.setattr(control_plane.time, "monotonic", lambda: 10.0**12)
+    repeat = node.spec.fn({"n": 0})
+
+    assert repeat["idempotency_should_process"] is True
+    assert list(control_plane._MEMORY_IDEMPOTENCY) == ["evict:0"]
+
+
+def test_idempotency_guard_caps_keys_without_ttl(monkeypatch):
+    control_plane = importlib.import_module("microflow.nodes.control_plane")
+    monkeypatch.setattr(control_plane, "_MEMORY_IDEMPOTENCY", control_plane.OrderedDict())
+    monkeypatch.setattr(control_plane, "_IDEMPOTENCY_NO_TTL", control_plane.OrderedDict())
+    monkeypatch.setattr(control_plane, "_MAX_IDEMPOTENCY_KEYS", 2)
+    node = idempotency_guard("cap:{n}", provider="memory")
+
+    for n in range(4):
+        node.spec.fn({"n": n})
+
+    assert sorted(control_plane._MEMORY_IDEMPOTENCY) == ["cap:2", "cap:3"]
+
+
+def test_idempotency_guard_cap_keeps_live_ttl_keys(monkeypatch):
+    control_plane = importlib.import_module("microflow.nodes.control_plane")
+    monkeypatch.setattr(control_plane, "_MEMORY_IDEMPOTENCY", control_plane.OrderedDict())
+    monkeypatch.setattr(control_plane, "_IDEMPOTENCY_NO_TTL", control_plane.OrderedDict())
+    monkeypatch.setattr(control_plane, "_MAX_IDEMPOTENCY_KEYS", 2)
+    live = idempotency_guard("live:{n}", ttl_s=3600, provider="memory")
+    forever = idempotency_guard("forever:{n}", provider="memory")
+
+    forever.spec.fn({"n": 0})
+    for n in range(3):
+        live.spec.fn({"n": n})
+    forever.spec.fn({"n": 1})
+
+    assert sorted(control_plane._MEMORY_IDEMPOTENCY) == ["live:0", "live:1", "live:2"]
+    for n in range(3):
+        assert live.spec.fn({"n": n})["idempotency_duplicate"] is True
+
+
+def test_trace_limit_env_falls_back_on_invalid_values(monkeypatch):
+    control_plane = importlib.import_module("microflow.nodes.control_plane")
+
+    monkeypatch.setenv("MICROFLOW_TRACE_LIMIT", "")
+    assert control_plane._env_limit("MICROFLOW_TRACE_LIMIT", 10000) == 10000
+    monkeypatch.setenv("MICROFLOW_TRACE_LIMIT", "lots")
+    assert control_plane._env_limit("MICROFLOW_TRACE_LIMIT", 10000) == 10000
+    monkeypatch.setenv("MICROFLOW_TRACE_LIMIT", "25")
+    assert control_plane._env_limit("MICROFLOW_TRACE_LIMIT", 10000) == 25
+
+
+def test_idempotency_guard_reuses_redis_client(monkeypatch):
+    control_plane = importlib.import_module("microflow.nodes.control_plane")
+    clients = []
+
+    class FakeRedis:
+        def __init__(self):
+            self.keys = set()
+
+        @classmethod
+        def from_url(cls, url):
+            clients.append(url)
+            return cls()
+
+        def set(self, key, value, ex=None, nx=False):
+            if nx and key in self.keys:
+                return None
+            self.keys.add(key)
+            return True
+
+    monkeypatch.setitem(sys.modules, "redis", types.SimpleNamespace(Redis=FakeRedis))
+    monkeypatch.setenv("REDIS_URL", "redis://cache:6379/1")
+    control_plane._redis_client.cache_clear()
+    try:
+        node = idempotency_guard("job:{job_id}", provider="redis", output_key="idem")
+        first = node.spec.fn({"job_id": "r1"})
+        second = node.spec.fn({"job_id": "r1"})
+    finally:
+        control_plane._redis_client.cache_clear()
+
+    assert clients == ["redis://cache:6379/1"]
+    assert first["idempotency_should_process"] is True
+    assert second["idempotency_duplicate"] is True
@@ -116,3 +116,59 @@ def test_workflow_runs_with_redis_state_store():
     assert result["y"] == 15
     run_info = store.get_run_info("run-redis")
     assert run_info["status"] == "success"
+
+
+# Module-level so the pure task below does not capture it (captured values are
+# part of the cache key)
+_score_calls = []
+
+
+def test_pure_task_results_are_replayed_from_redis_cache():
+    calls = _score_calls
+    calls.clear()
+
+    @task(name="score", pure=True, input_keys=["points"])
+    def score(ctx):
+        _score_calls.append(ctx["points"])
+        return {"score": ctx["points"] * 2}
+
+    workflow = Workflow([score], name="redis_cache_test")
+    store = RedisStateStore(client=FakeRedis(), key_prefix="mf:runs")
+    run = __import__("asyncio").run
+
+    first = run(workflow.run("cache-1", store, {"points": 3, "noise": 1}))
+    second = run(workflow.run("cache-2", store, {"points": 3, "noise": 2}))
+    third = run(workflow.run("cache-3", store, {"points": 4}))
+
+    assert (first["score"], second["score"], third["score"]) == (6, 6, 8)
+    assert calls == [3, 4]
+    assert store.get_task("cache-2", "score")["cached"] is True
+    assert [run["id"] for run in store.list_runs()].count("cache-1") == 1
+
+
+def test_redis_state_store_serializer_option(monkeypatch):
+    import pytest
+
+    from microflow import serialization
+
+    with pytest.raises(ValueError):
+        RedisStateStore(client=FakeRedis(), serializer="yaml")
+
+    monkeypatch.setattr(serialization, "msgpack", None)
+    with pytest.raises(ImportError):
+        RedisStateStore(client=FakeRedis(), serializer="msgpack")
+
+
+def test_redis_state_store_msgpack_round_trip():
+    import pytest
+
+    pytest.importorskip("msgpack")
+    fake = FakeRedis()
+    store = RedisStateStore(client=fake, key_prefix="mf:runs", serializer="msgpack")
+
+    store.init_run("run1", {"a": 1})
+    store.upsert_task("run1", "t1", status="success")
+
+    assert not fake.kv["mf:runs:run1"].startswith(b"{")
+    assert store.get_ctx("run1") == {"a": 1}
+    assert store.get_task("run1", "t1") == {"status": "success"}
@@ -1,11 +1,33 @@
 import importlib
+import json
 import sys
 
 import pytest
 
-from microflow import Workflow
-from microflow.nodes.data_transform import rename_fields, select_fields
-from microflow.nodes.http_request import webhook_call
+from microflow import JSONStateStore, Workflow, task
+from microflow import serialization
+from microflow.nodes import data_formats
+from microflow.nodes.data_formats import csv_read, csv_to_json, csv_write, json_to_csv
+from microflow.nodes.conditional import (
+    conditional_task,
+    if_equals,
+    if_exists,
+    if_greater_than,
+    if_node,
+    switch_node,
+    switch_on_key,
+)
+from microflow.nodes.data_transform import (
+    data_filter,
+    data_filter_transform,
+    data_transform,
+    json_parse,
+    json_stringify,
+    rename_fields,
+    select_fields,
+)
+from microflow.nodes.file_ops import read_json_file, write_file, write_json_file
+from microflow.nodes.http_request import http_get, webhook_call
 from microflow.nodes.subworkflow import WorkflowLoader
 
 
@@ -51,6 +73,94 @@ async def test_webhook_call_supports_callable_json_payload(monkeypatch):
     assert result["http_status_code"] == 200
 
 
+@pytest.mark.asyncio
+async def test_http_nodes_reuse_workflow_http_client(tmp_path):
+    calls = []
+
+    class FakeResponse:
+        status_code = 200
+        headers = {}
+        text = "[]"
+        content = b"[]"
+        url = "https://example.test/items"
+
+        def json(self):
+            return []
+
+    class SharedClient:
+        async def request(self, **kwargs):
+            calls.append(kwargs)
+            return FakeResponse()
+
+    first = http_get("https://example.test/items", name="first")
+    second = http_get("https://example.test/items", name="second")
+    first >> second
+
+    ctx = await Workflow([first, second], http_client=SharedClient()).run(
+        run_id="shared_http_client_run", store=JSONStateStore(str(tmp_path))
+    )
+
+    assert len(calls) == 2
+    assert calls[0]["method"] == "GET"
+    assert ctx["http_success"] is True
+
+
+@pytest.mark.asyncio
+async def test_http_nodes_skip_shared_client_with_other_ssl_verification(monkeypatch):
+    from microflow.nodes.http_request import create_http_client
+
+    http_request_module = importlib.import_module("microflow.nodes.http_request")
+    per_call = []
+
+    class FakeResponse:
+        status_code = 200
+        headers = {}
+        text = "{}"
+        content = b"{}"
+        url = "https://example.test/items"
+
+        def json(self):
+            return {}
+
+    class FakeAsyncClient:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return None
+
+        async def request(self, **kwargs):
+            per_call.append(self.kwargs["verify"])
+            return FakeResponse()
+
+    class FakeHTTPX:
+        AsyncClient = FakeAsyncClient
+
+        @staticmethod
+        def Limits(**kwargs):
+            return kwargs
+
+    monkeypatch.setattr(http_request_module, "httpx", FakeHTTPX)
+    insecure_pool = create_http_client(verify=False)
+    shared = []
+
+    async def shared_request(**kwargs):
+        shared.append(kwargs["url"])
+        return FakeResponse()
+
+    insecure_pool.request = shared_request
+    ctx = {"_microflow_http_client": insecure_pool}
+
+    await http_get("https://example.test/items").spec.fn(ctx)
+    await http_get("https://example.test/items", verify_ssl=False).spec.fn(ctx)
+
+    assert per_call == [True]
+    assert shared == ["https://example.test/items"]
+
+
 def test_workflow_loader_can_import_module(tmp_path, monkeypatch):
     module_name = "temp_microflow_workflow"
     module_file = tmp_path / f"{module_name}.py"
@@ -86,3 +196,760 @@ def test_select_and_rename_fields_default_optionals():
     assert selected["selected_data"] == [{}]
     assert renamed["transform_success"] is True
     assert renamed["renamed_data"] == [{"id": 1, "name": "Alice"}]
+
+
+def test_csv_to_json_writes_utf8_json(tmp_path):
+    source = tmp_path / "people.csv"
+    source.write_text("name,city\nJosé,Zürich\n", encoding="utf-8")
+    target = tmp_path / "out" / "people.json"
+
+    result = csv_to_json(str(source), output_file=str(target)).spec.fn({})
+
+    assert result["conversion_success"] is True
+    assert json.loads(target.read_text(encoding="utf-8")) == [
+        {"name": "José", "city": "Zürich"}
+    ]
+    assert "Zürich" in target.read_text(encoding="utf-8")
+
+
+def test_csv_read_engine_selection(tmp_path, monkeypatch):
+    source = tmp_path / "nums.csv"
+    source.write_text("a;b\n1;x\n2;y\n", encoding="utf-8")
+
+    default = csv_read(str(source), delimiter=";").spec.fn({})
+    unknown = csv_read(str(source), engine="polars").spec.fn({})
+    monkeypatch.setattr(data_formats, "PYARROW_AVAILABLE", False)
+    missing = csv_to_json(str(source), engine="pyarrow").spec.fn({})
+
+    assert default["csv_data"] == [{"a": "1", "b": "x"}, {"a": "2", "b": "y"}]
+    assert "Unknown CSV engine" in unknown["csv_error"]
+    assert "pyarrow is required" in missing["conversion_error"]
+
+
+def test_csv_readers_report_missing_files(tmp_path):
+    missing = str(tmp_path / "missing.csv")
+
+    read = csv_read(missing).spec.fn({})
+    converted = csv_to_json(missing).spec.fn({})
+
+    assert read["csv_error"] == f"File not found: {missing}"
+    assert read["file_path"] == missing
+    assert converted["conversion_success"] is False
+    assert converted["conversion_error"] == f"File not found: {missing}"
+
+
+def test_csv_writers_round_trip(tmp_path):
+    dict_path = tmp_path / "out" / "dicts.csv"
+    list_path = tmp_path / "lists.csv"
+    flat_path = tmp_path / "flat.csv"
+    rows = [{"id": i, "name": f"n{i}"} for i in range(3)]
+
+    written = csv_write(file_path=str(dict_path)).spec.fn({"data": rows})
+    csv_write(file_path=str(list_path), write_header=False).spec.fn(
+        {"data": [[1, "a"], [2, "b"]]}
+    )
+    json_to_csv(output_file=str(flat_path), flatten_nested=True).spec.fn(
+        {"data": [{"id": 1, "meta": {"tag": "x"}}]}
+    )
+
+    assert written["csv_rows_written"] == 3
+    assert dict_path.read_text() == "id,name\n0,n0\n1,n1\n2,n2\n"
+    assert list_path.read_text() == "1,a\n2,b\n"
+    assert flat_path.read_text() == "id,meta.tag\n1,x\n"
+
+
+def test_json_file_writer_stringifies_unsupported_values(tmp_path):
+    from decimal import Decimal
+
+    target = tmp_path / "out" / "rows.json"
+    data_formats._write_json_file(str(target), [{"price": Decimal("1.50")}])
+
+    assert json.loads(target.read_text(encoding="utf-8")) == [{"price": "1.50"}]
+
+
+def test_flatten_dict_keeps_order_and_handles_deep_nesting():
+    flat = {}
+    data_formats._flatten_dict({"a": {"b": 1, "c": {"d": 2}}, "e": 3, "f": {}}, flat)
+    assert list(flat.items()) == [("a.b", 1), ("a.c.d", 2), ("e", 3)]
+
+    deep = leaf = {}
+    for _ in range(5000):
+        leaf["k"] = {}
+        leaf = leaf["k"]
+    leaf["v"] = 1
+    flat = {}
+    data_formats._flatten_dict(deep, flat, separator="_")
+    assert list(flat.values()) == [1]
+    assert len(next(iter(flat))) == 5000 * 2 + 1
+
+
+def test_excel_read_uses_calamine_engine_without_openpyxl(tmp_path, monkeypatch):
+    from microflow.nodes.data_formats import excel_read
+
+    calls = []
+
+    class FakeFrame:
+        columns = ["a"]
+
+        def to_dict(self, orient):
+            return [{"a": 1}]
+
+    class FakePandas:
+        @staticmethod
+        def read_excel(path, **kwargs):
+            calls.append(kwargs)
+            return FakeFrame()
+
+    source = tmp_path / "book.xlsx"
+    source.write_bytes(b"")
+    monkeypatch.setattr(data_formats, "pd", FakePandas, raising=False)
+    monkeypatch.setattr(data_formats, "PANDAS_AVAILABLE", True)
+    monkeypatch.setattr(data_formats, "OPENPYXL_AVAILABLE", False)
+    monkeypatch.setattr(data_formats, "EXCEL_READ_ENGINE", "calamine")
+
+    result = excel_read(str(source)).spec.fn({})
+
+    assert result["excel_data"] == [{"a": 1}]
+    assert calls[0]["engine"] == "calamine"
+
+
+def test_excel_reads_all_sheets(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from microflow.nodes.data_formats import excel_read, excel_to_json
+
+    sheets = {"north": [{"a": 1}], "south": [{"a": 2}, {"a": 3}]}
+    calls = []
+
+    class FakeFrame:
+        columns = ["a"]
+
+        def __init__(self, rows):
+            self.rows = rows
+
+        def to_dict(self, orient):
+            return self.rows
+
+    class FakeWorkbook:
+        sheet_names = list(sheets)
+
+        def __init__(self, path, engine=None):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    class FakePandas:
+        ExcelFile = FakeWorkbook
+
+        @staticmethod
+        def read_excel(path, sheet_name=0, **kwargs):
+            calls.append(sheet_name)
+            if sheet_name is None:
+                return {name: FakeFrame(rows) for name, rows in sheets.items()}
+            return FakeFrame(sheets[sheet_name])
+
+    source = tmp_path / "book.xlsx"
+    source.write_bytes(b"")
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(data_formats, "pd", FakePandas, raising=False)
+    monkeypatch.setattr(data_formats, "PANDAS_AVAILABLE", True)
+    monkeypatch.setattr(data_formats, "OPENPYXL_AVAILABLE", True)
+    monkeypatch.setattr(data_formats, "_shared_excel_pool", lambda: pool)
+    monkeypatch.setattr(data_formats, "LXML_AVAILABLE", True)
+
+    single = excel_read(str(source), sheet_name="south").spec.fn({})
+    every = excel_read(str(source), sheet_name=None).spec.fn({})
+    parallel = excel_to_json(
+        str(source), sheet_name=None, parallel_sheets=True
+    ).spec.fn({})
+    pool.shutdown()
+
+    assert single["excel_data"] == sheets["south"]
+    assert every["excel_data"] == sheets
+    assert every["excel_rows"] == 3
+    assert every["excel_columns"] == {"north": 1, "south": 1}
+    assert parallel["json_data"] == sheets
+    assert parallel["rows_converted"] == 3
+    assert sorted(calls[2:]) == ["north", "south"]
+
+
+def test_pandas_is_imported_on_first_use(monkeypatch):
+    import types
+
+    fake_pandas = types.ModuleType("pandas")
+    monkeypatch.setitem(sys.modules, "pandas", fake_pandas)
+    monkeypatch.setattr(data_formats, "pd", None)
+
+    assert data_formats._pandas() is fake_pandas
+    assert data_formats.pd is fake_pandas
+
+
+def test_missing_lxml_warns_once(monkeypatch):
+    monkeypatch.setattr(data_formats, "LXML_AVAILABLE", False)
+    monkeypatch.setattr(data_formats, "_lxml_warned", False)
+
+    with pytest.warns(UserWarning, match="pip install lxml") as record:
+        data_formats._warn_if_lxml_missing()
+        data_formats._warn_if_lxml_missing()
+
+    assert len(record) == 1
+
+
+def test_excel_write_streams_with_xlsxwriter(tmp_path):
+    pytest.importorskip("xlsxwriter")
+    import zipfile
+
+    from microflow.nodes.data_formats import excel_write
+
+    target = tmp_path / "out.xlsx"
+    rows = [{"a": 1, "b": "x"}, {"a": float("nan"), "c": [1, 2]}]
+    result = excel_write("rows", str(target)).spec.fn({"rows": rows})
+    sheet = zipfile.ZipFile(target).read("xl/worksheets/sheet1.xml").decode()
+
+    assert result["excel_success"] is True
+    assert result["excel_columns_written"] == 3
+    assert '<dimension ref="A1:C3"/>' in sheet
+    assert "[1, 2]" in sheet
+
+
+def test_excel_write_rustpy_engine(tmp_path, monkeypatch):
+    from microflow.nodes.data_formats import excel_write
+
+    written = []
+
+    class FakeRustpy:
+        @staticmethod
+        def write_worksheet(records, file_name, sheet_name=None):
+            written.append((records, file_name, sheet_name))
+
+    monkeypatch.setattr(data_formats, "rustpy_xlsxwriter", FakeRustpy)
+    target = str(tmp_path / "fast.xlsx")
+    rows = [{"a": 1, "b": 2}, {"b": 3, "c": 4}]
+
+    result = excel_write("rows", target, engine="rustpy").spec.fn({"rows": rows})
+    unknown = excel_write("rows", target, engine="fastxlsx").spec.fn({"rows": rows})
+
+    assert result["excel_success"] is True
+    assert result["excel_columns_written"] == 3
+    assert written == [
+        (
+            [{"a": 1, "b": 2, "c": None}, {"a": None, "b": 3, "c": 4}],
+            target,
+            "Sheet1",
+        )
+    ]
+    assert "Unknown Excel engine" in unknown["excel_error"]
+
+
+def test_rows_to_dataframe_matches_pandas():
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+
+    rows = [{"a": 1, "b": "x"}, {"b": "y", "c": 2.5}]
+    mixed = [{"a": 1}, {"a": "one"}]
+
+    frame = data_formats._rows_to_dataframe(rows)
+    expected = pd.DataFrame(rows)
+
+    assert list(frame.columns) == list(expected.columns)
+    assert frame.where(frame.notna(), None).values.tolist() == (
+        expected.where(expected.notna(), None).values.tolist()
+    )
+    assert data_formats._rows_to_dataframe(mixed)["a"].tolist() == [1, "one"]
+
+
+def test_csv_read_pyarrow_engine(tmp_path):
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "nums.csv"
+    source.write_text("a;b\n1;x\n2;y\n", encoding="utf-8")
+
+    with_header = csv_read(str(source), delimiter=";", engine="pyarrow").spec.fn({})
+    no_header = csv_read(
+        str(source), delimiter=";", has_header=False, engine="pyarrow"
+    ).spec.fn({})
+
+    assert with_header["csv_data"] == [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]
+    assert no_header["csv_data"][0] == ["a", "b"]
+
+    import gzip
+
+    packed = tmp_path / "nums.csv.gz"
+    packed.write_bytes(gzip.compress(source.read_bytes()))
+    compressed = csv_read(str(packed), delimiter=";", engine="pyarrow").spec.fn({})
+    assert compressed["csv_data"] == with_header["csv_data"]
+
+
+def test_serialization_falls_back_to_stdlib_for_unsupported_values():
+    big = 2**70
+    assert serialization.loads(serialization.dumps({"n": big})) == {"n": big}
+    assert serialization.loads(serialization.dumps({1: "a"})) == {"1": "a"}
+    assert serialization.loads("NaN") != serialization.loads("NaN")
+
+
+def test_fn_fingerprint_hashes_names_and_nested_code():
+    import math
+    import subprocess
+    from pathlib import Path
+
+    from microflow.core.cache import _fn_fingerprint
+
+    def nested(x):
+        return sorted(x, key=lambda item: item in {"a", "b", "c"})
+
+    assert _fn_fingerprint(lambda x: math.floor(x)) != _fn_fingerprint(
+        lambda x: math.ceil(x)
+    )
+    assert b" at 0x" not in _fn_fingerprint(nested)
+
+    script = (
+        "from microflow.core.cache import _fn_fingerprint\n"
+        "def f(x):\n"
+        "    return [y for y in x if y in {'a', 'b', 'c'}]\n"
+        "print(_fn_fingerprint(f).hex())\n"
+    )
+    fingerprints = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            env={"PYTHONHASHSEED": seed, "PYTHONPATH": str(Path(__file__).resolve().parents[1])},
+            check=True,
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert len(fingerprints) == 1
+
+
+def test_task_cache_key_covers_captured_values_and_wrapped_functions():
+    import threading
+
+    from microflow.core.cache import task_cache_key
+
+    def make_score(weights):
+        @task(name="score", pure=True)
+        def score(ctx):
+            return {"score": weights["x"]}
+
+        return score
+
+    def make_conditional(body):
+        return conditional_task(route="yes", condition_node="gate")(
+            task(name="branch", pure=True)(body)
+        )
+
+    def small(ctx):
+        return {"value": 1}
+
+    def large(ctx):
+        return {"value": 100}
+
+    lock = threading.Lock()
+
+    @task(name="locked", pure=True)
+    def locked(ctx):
+        with lock:
+            return {}
+
+    low, high = make_score({"x": 1}), make_score({"x": 100})
+    assert task_cache_key(low.spec, {}) != task_cache_key(high.spec, {})
+    assert task_cache_key(low.spec, {}) == task_cache_key(make_score({"x": 1}).spec, {})
+    assert task_cache_key(make_conditional(small).spec, {}) != task_cache_key(
+        make_conditional(large).spec, {}
+    )
+    assert task_cache_key(locked.spec, {}) is None
+
+
+def test_serialize_canonical_is_order_independent():
+    first = serialization.serialize_canonical({"b": [1, {"y": 2, "x": 1}], "a": None})
+    second = serialization.serialize_canonical({"a": None, "b": [1, {"x": 1, "y": 2}]})
+
+    assert first == second
+    assert json.loads(first) == {"a": None, "b": [1, {"x": 1, "y": 2}]}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_serialization_encodes_dataclasses_natively(monkeypatch, use_orjson):
+    from dataclasses import dataclass
+
+    @dataclass
+    class Point:
+        x: int
+        y: int
+
+    if not use_orjson:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    payload = {"p": Point(1, 2), "other": object()}
+    decoded = serialization.loads(serialization.dumps(payload, default=lambda _: "?"))
+    assert decoded == {"p": {"x": 1, "y": 2}, "other": "?"}
+
+
+def test_serialization_encodes_numpy_arrays_as_lists():
+    np = pytest.importorskip("numpy")
+
+    encoded = serialization.dumps({"a": np.arange(3), "s": np.float64(1.5)}, default=str)
+    assert serialization.loads(encoded) == {"a": [0, 1, 2], "s": 1.5}
+
+
+def test_json_stringify_and_parse_round_trip():
+    data = {"name": "José", "tags": ["a", "b"], "count": 3}
+
+    pretty = json_stringify(data_key="data", indent=2).spec.fn({"data": data})
+    ascii_only = json_stringify(data_key="data", ensure_ascii=True).spec.fn({"data": data})
+    parsed = json_parse(json_key="json_string").spec.fn(pretty)
+
+    assert pretty["json_string"] == json.dumps(data, indent=2, ensure_ascii=False)
+    assert "\\u00e9" in ascii_only["json_string"]
+    assert parsed["parsed_data"] == data
+    assert json_parse().spec.fn({"json_string": "{bad"})["json_parsed"] is False
+
+
+def test_compiled_expressions_keep_eval_semantics():
+    rows = [{"tags": ["a", "b"]}, {"tags": ["c"]}]
+    ctx = {"rows": rows, "wanted": "a"}
+
+    filtered = data_filter(
+        "[t for t in item['tags'] if t == ctx['wanted']]", data_key="rows"
+    ).spec.fn(ctx)
+    upper = data_transform(
+        "[t.upper() for t in item['tags'] if t != ctx['wanted']]", data_key="rows"
+    ).spec.fn(ctx)
+    broken = data_filter("item[", data_key="rows").spec.fn(ctx)
+    routed = if_node("ctx['wanted'] == 'a'", name="check").spec.fn(ctx)
+    switched = switch_node("ctx['wanted']", {"a": "route_a"}, name="sw").spec.fn(ctx)
+    bad_switch = switch_node("ctx[", {"a": "route_a"}, name="bad").spec.fn(ctx)
+
+    assert filtered["filtered_data"] == [rows[0]]
+    assert upper["transformed_data"] == [["B"], ["C"]]
+    assert broken["filter_success"] is False
+    assert "filter_error" in broken
+    assert routed["_route_check"] == "true"
+    assert switched["_route_sw"] == "route_a"
+    assert bad_switch["_route_bad"] == "default"
+    assert "_switch_error_bad" in bad_switch
+
+
+def test_compiled_expressions_accept_any_expression_syntax():
+    ctx = {"value": 1}
+
+    walrus = if_node("(x := ctx['value'])", name="walrus").spec.fn(ctx)
+    fn = switch_node("(lambda: 1)()", {1: "one"}, name="fn").spec.fn(ctx)
+
+    assert walrus["_route_walrus"] == "true"
+    assert fn["_route_fn"] == "one"
+
+
+def test_specialized_expressions_match_eval():
+    from microflow.core.expressions import CompiledExpression
+
+    namespace = {"ctx": {"n": 5, "s": "a", "tags": ["x"]}, "__builtins__": {}}
+    sources = [
+        "ctx['n'] > 3",
+        "ctx.get('n', 0) <= -1",
+        "ctx.get('missing') is None",
+        "ctx['s'] in ('a', 'b')",
+        "ctx['s'] not in ['a']",
+        "ctx.get('tags')",
+        "ctx['n'] == 5.0",
+    ]
+    for source in sources:
+        expression = CompiledExpression(source)
+        assert expression.specialized is not None, source
+        assert expression.evaluate(namespace) == eval(source, dict(namespace))
+
+    for source in (
+        "ctx['n'] > ctx['m']",
+        "1 < ctx['n'] < 9",
+        "ctx[k] == 1",
+        "ctx.get('missing', [])",
+    ):
+        assert CompiledExpression(source).specialized is None
+
+    # A mutable default is built fresh on each evaluation
+    default = CompiledExpression("ctx.get('missing', [])")
+    first = default.evaluate(namespace)
+    first.append("leak")
+    assert default.evaluate(namespace) == []
+
+    with pytest.raises(KeyError):
+        CompiledExpression("ctx['missing'] == 1").evaluate(namespace)
+
+
+def test_bound_expressions_match_eval():
+    from microflow.core.expressions import CompiledExpression
+
+    ctx = {"n": 5, "items": [1, 2, 3]}
+    for source in (
+        "ctx['n'] > 3",
+        "ctx['n'] * 2 if ctx['n'] else 0",
+        "[i for i in ctx['items'] if i < ctx['n'] - 3]",
+        "sum(ctx['items'])",
+    ):
+        bound = CompiledExpression(source).bind("ctx")
+        try:
+            expected = eval(source, {"ctx": ctx, "__builtins__": {}})
+        except NameError:
+            with pytest.raises(NameError):
+                bound(ctx)
+        else:
+            assert bound(ctx) == expected
+
+
+def test_conditional_helpers_use_predicates():
+    ctx = {"status": "active", "score": 7, "flag": "yes"}
+
+    assert if_equals("status", "active", name="eq").spec.fn(ctx)["_route_eq"] == "true"
+    assert if_greater_than("score", 9, name="gt").spec.fn(ctx)["_route_gt"] == "false"
+    assert if_exists("flag", name="ex").spec.fn(ctx)["_route_ex"] == "true"
+    assert if_exists("missing", name="nx").spec.fn(ctx)["_route_nx"] == "false"
+    switched = switch_on_key("status", {"active": "go"}, name="sw").spec.fn(ctx)
+    assert switched["_route_sw"] == "go"
+    assert if_equals("status", "active").spec.description == (
+        "IF condition: ctx.get('status') == 'active'"
+    )
+
+
+@pytest.mark.asyncio
+async def test_conditional_task_skip_results_are_fresh_dicts(tmp_path):
+    from microflow.nodes.resilience import retry_policy
+
+    check = if_node("ctx['value'] > 10", name="check")
+
+    @conditional_task(route="true", condition_node="check")
+    @task(name="high")
+    def high(ctx):
+        return {"high": True}
+
+    check >> high
+    first = await high.spec.fn({"_route_check": "false"})
+    second = await high.spec.fn({"_route_check": "false"})
+    ctx = await Workflow([check, high]).run(
+        "skip_run", JSONStateStore(str(tmp_path)), {"value": 1}
+    )
+
+    retried = await retry_policy(high, max_retries=0).spec.fn({"_route_check": "no"})
+
+    assert type(first) is dict and first == second and first is not second
+    assert first["_skipped"] is True
+    assert ctx["_skipped"] is True and "high" not in ctx
+    assert retried["_skipped"] is True and retried["retry_successful"] is True
+    assert "wrapped_result" not in retried
+
+
+@pytest.mark.asyncio
+async def test_conditional_task_auto_detects_route_key():
+    @conditional_task(route="yes")
+    @task(name="auto")
+    def auto(ctx):
+        return {"ran": True}
+
+    assert (await auto.spec.fn({"x": 1, "_route_a": "yes"}))["ran"] is True
+    assert (await auto.spec.fn({"_route_a": "no"}))["_skipped"] is True
+    # A context without the remembered key is searched again
+    assert (await auto.spec.fn({"_route_b": "yes"}))["ran"] is True
+    assert (await auto.spec.fn({"x": 1}))["_skipped"] is True
+
+
+def test_data_filter_transform_single_pass():
+    users = [
+        {"name": "Ann", "dept": "eng", "score": 91},
+        {"name": "Bob", "dept": "ops", "score": 70},
+        {"name": "Cy", "dept": "eng", "score": 80},
+    ]
+
+    result = data_filter_transform(
+        "item['dept'] == 'eng'",
+        "{'name': item['name'], 'grade': 'A' if item['score'] >= 90 else 'B'}",
+        data_key="users",
+        output_key="graded",
+    ).spec.fn({"users": users})
+
+    assert result["transform_success"] is True
+    assert result["original_count"] == 3
+    assert result["graded"] == [
+        {"name": "Ann", "grade": "A"},
+        {"name": "Cy", "grade": "B"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_file_nodes_run_off_the_event_loop(tmp_path):
+    target = tmp_path / "nested" / "greeting.txt"
+    json_target = tmp_path / "data.json"
+
+    written = await write_file(str(target), "Hello {user}").spec.fn({"user": "Ann"})
+    json_written = await write_json_file(str(json_target), data_key="payload").spec.fn(
+        {"payload": {"ok": True}}
+    )
+    loaded = await read_json_file(str(json_target)).spec.fn({})
+
+    assert written["file_written"] is True
+    assert target.read_text(encoding="utf-8") == "Hello Ann"
+    assert json_written["file_written"] is True
+    assert loaded["json_data"] == {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_write_file_accepts_callable_bytes_content(tmp_path):
+    target = tmp_path / "payload.bin"
+    node = write_file(str(target), lambda ctx: ctx["payload"], append_mode=True)
+
+    first = await node.spec.fn({"payload": b"{not a template}"})
+    await node.spec.fn({"payload": b"!"})
+
+    assert first["bytes_written"] == 16
+    assert target.read_bytes() == b"{not a template}!"
+
+
+@pytest.mark.asyncio
+async def test_subworkflow_builds_factory_workflow_once(tmp_path):
+    from microflow.nodes.subworkflow import subworkflow
+
+    builds = []
+
+    @task(name="child_step")
+    def child_step(ctx):
+        return {"doubled": ctx["value"] * 2}
+
+    def factory():
+        builds.append(1)
+        return Workflow([child_step], name="child")
+
+    node = subworkflow(factory, output_keys=["doubled"], name="child_node")
+    fresh_node = subworkflow(factory, name="fresh_node", fresh=True)
+    store = JSONStateStore(str(tmp_path))
+
+    first = await node.spec.fn({"value": 2, "_microflow_store": store})
+    second = await node.spec.fn({"value": 5, "_microflow_store": store})
+    assert (first["doubled"], second["doubled"]) == (4, 10)
+    assert len(builds) == 1
+
+    await fresh_node.spec.fn({"value": 1, "_microflow_store": store})
+    assert len(builds) == 2
+
+
+def test_workflow_cache_is_bounded_and_skipped_for_fresh_builds(monkeypatch):
+    from collections import OrderedDict
+
+    subworkflow_module = importlib.import_module("microflow.nodes.subworkflow")
+    cache = OrderedDict()
+    monkeypatch.setattr(subworkflow_module, "_workflow_cache", cache)
+    monkeypatch.setattr(subworkflow_module, "_WORKFLOW_CACHE_SIZE", 2)
+
+    def factory():
+        return Workflow([], name="cached")
+
+    resolve = subworkflow_module._resolve_workflow
+    resolve(factory, "fresh", fresh=True)
+    assert not cache
+
+    first = resolve(factory, "a")
+    resolve(factory, "b")
+    assert resolve(factory, "a") is first
+    resolve(factory, "c")
+
+    assert list(cache) == [(factory, "a"), (factory, "c")]
+
+
+@pytest.mark.asyncio
+async def test_subworkflow_projects_input_and_output_keys(tmp_path):
+    from microflow.nodes.subworkflow import subworkflow
+
+    @task(name="echo")
+    def echo(ctx):
+        return {"seen": sorted(k for k in ctx if not k.startswith("_")), "extra": 1}
+
+    node = subworkflow(
+        lambda: Workflow([echo], name="echo_child"),
+        input_keys=["a", "missing", "b"],
+        output_keys=["seen", "absent"],
+        name="projected",
+    )
+    store = JSONStateStore(str(tmp_path))
+
+    result = await node.spec.fn({"a": 1, "b": 2, "c": 3, "_microflow_store": store})
+
+    assert result["seen"] == ["a", "b"]
+    assert "extra" not in result and "absent" not in result
+
+
+def _square_workflow():
+    @task(name="square")
+    def square(ctx):
+        return {"squared": ctx["n"] ** 2}
+
+    return Workflow([square], name="square_child")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("executor", ["process", "thread"])
+async def test_parallel_subworkflows_run_in_executor(tmp_path, executor):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from microflow.nodes.subworkflow import parallel_subworkflows
+
+    pool = ThreadPoolExecutor(max_workers=2) if executor == "thread" else executor
+    node = parallel_subworkflows(
+        [
+            {"source": _square_workflow, "name": "sq_a", "input_keys": ["n"]},
+            {"source": _square_workflow, "name": "sq_b", "context_mapping": {"m": "n"}},
+        ],
+        executor=pool,
+    )
+    store = JSONStateStore(str(tmp_path))
+
+    result = await node.spec.fn({"n": 3, "m": 4, "_microflow_store": store})
+
+    assert result["parallel_success"] is True
+    assert [r["squared"] for r in result["parallel_results"]] == [9, 16]
+    run_id = result["parallel_results"][0]["subworkflow_run_id"]
+    assert store.get_run_info(run_id)["status"] == "success"
+    if executor == "thread":
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_subworkflows_keep_memory_parents_in_memory(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from microflow import MemoryStateStore
+    from microflow.nodes.subworkflow import parallel_subworkflows
+
+    monkeypatch.chdir(tmp_path)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        node = parallel_subworkflows(
+            [{"source": _square_workflow, "name": "sq", "input_keys": ["n"]}],
+            executor=pool,
+        )
+        result = await node.spec.fn({"n": 3, "_microflow_store": MemoryStateStore()})
+
+    assert result["parallel_results"][0]["squared"] == 9
+    assert not (tmp_path / "data").exists()
+
+
+@pytest.mark.asyncio
+async def test_parallel_subworkflows_share_public_ctx_without_leaking_mappings(tmp_path):
+    from microflow.nodes.subworkflow import parallel_subworkflows
+
+    node = parallel_subworkflows(
+        [
+            {"source": _square_workflow, "name": "mapped", "context_mapping": {"m": "n"}},
+            {"source": _square_workflow, "name": "plain"},
+        ]
+    )
+    store = JSONStateStore(str(tmp_path))
+
+    result = await node.spec.fn({"n": 2, "m": 5, "_microflow_store": store})
+
+    assert [r["squared"] for r in result["parallel_results"]] == [25, 4]
+
+
+def test_parallel_subworkflows_rejects_unknown_executor():
+    from microflow.nodes.subworkflow import parallel_subworkflows
+
+    with pytest.raises(ValueError):
+        parallel_subworkflows([], executor="gpu")
@@ -3,7 +3,7 @@ import json
 
 import pytest
 
-from microflow import Workflow, WorkflowRunner, task
+from microflow import JSONStateStore, Workflow, WorkflowRunner, task, wait_for_condition
 from microflow.queueing import (
     InMemoryWorkflowQueue,
     RedisWorkflowQueue,
@@ -35,6 +35,246 @@ async def test_workflow_runner_limits_concurrency():
     assert active["max_seen"] == 1
 
 
+@pytest.mark.asyncio
+async def test_workflow_runner_cancelled_waiter_does_not_leak_a_slot(tmp_path):
+    gate = asyncio.Event()
+
+    @task(name="blocker")
+    async def blocker(ctx):
+        await gate.wait()
+        return {}
+
+    wf = Workflow([blocker], name="wf_cancel")
+    store = JSONStateStore(str(tmp_path))
+    runner = WorkflowRunner(max_concurrent_workflows=1)
+
+    first = asyncio.ensure_future(runner.run_workflow(wf, run_id="c1", store=store))
+    await asyncio.sleep(0)
+    queued = asyncio.ensure_future(runner.run_workflow(wf, run_id="c2", store=store))
+    await asyncio.sleep(0)
+    queued.cancel()
+    gate.set()
+    await first
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+
+    await asyncio.wait_for(runner.run_workflow(wf, run_id="c3", store=store), 1.0)
+    assert runner._free_slots == 1
+
+
+@pytest.mark.asyncio
+async def test_workflow_runs_independent_branches_in_one_wave(tmp_path):
+    events = []
+
+    @task(name="start")
+    def start(ctx):
+        events.append("start")
+        return {"started": True}
+
+    def make_branch(branch_name):
+        @task(name=branch_name)
+        async def branch(ctx):
+            events.append(f"{branch_name}:begin")
+            await asyncio.sleep(0.05)
+            events.append(f"{branch_name}:end")
+            return {branch_name: True}
+
+        return branch
+
+    left = make_branch("left")
+    right = make_branch("right")
+
+    @task(name="join")
+    def join(ctx):
+        events.append("join")
+        return {"joined": ctx["left"] and ctx["right"]}
+
+    start >> left >> join
+    start >> right >> join
+
+    wf = Workflow([start, left, right, join], name="wf_waves", max_concurrent_tasks=4)
+    ctx = await wf.run(run_id="waves", store=JSONStateStore(str(tmp_path)))
+
+    assert ctx["joined"] is True
+    assert events[0] == "start" and events[-1] == "join"
+    # Both branches start before either finishes
+    assert events.index("right:begin") < events.index("left:end")
+    assert events.index("left:begin") < events.index("right:end")
+
+
+@pytest.mark.asyncio
+async def test_downstream_task_starts_before_slow_sibling_finishes(tmp_path):
+    events = []
+
+    @task(name="slow")
+    async def slow(ctx):
+        await asyncio.sleep(0.1)
+        events.append("slow:end")
+        return {"slow": True}
+
+    @task(name="fast")
+    async def fast(ctx):
+        return {"fast": True}
+
+    @task(name="after_fast")
+    def after_fast(ctx):
+        events.append("after_fast")
+        return {}
+
+    fast >> after_fast
+
+    wf = Workflow([slow, fast, after_fast], name="wf_dispatch", max_concurrent_tasks=4)
+    await wf.run(run_id="dispatch", store=JSONStateStore(str(tmp_path)))
+
+    assert events == ["after_fast", "slow:end"]
+
+
+@pytest.mark.asyncio
+async def test_workflow_run_leaves_the_loop_task_factory_alone(tmp_path):
+    @task(name="quick")
+    def quick(ctx):
+        return {"quick": True}
+
+    loop = asyncio.get_running_loop()
+    result = await Workflow([quick]).run("factory", JSONStateStore(str(tmp_path)))
+
+    assert result["quick"] is True
+    assert loop.get_task_factory() is None
+
+
+def test_run_async_keeps_the_default_task_factory():
+    from microflow.core.runner import run_async
+
+    async def factory():
+        return asyncio.get_running_loop().get_task_factory()
+
+    assert run_async(factory()) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_task_cancels_in_flight_siblings(tmp_path):
+    finished = []
+
+    @task(name="boom")
+    async def boom(ctx):
+        raise ValueError("boom")
+
+    @task(name="sleeper")
+    async def sleeper(ctx):
+        await asyncio.sleep(0.2)
+        finished.append("sleeper")
+        return {}
+
+    store = JSONStateStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        await Workflow([boom, sleeper], max_concurrent_tasks=2).run("fail_fast", store)
+
+    await asyncio.sleep(0.25)
+    assert finished == []
+    assert store.get_run_info("fail_fast")["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_wait_for_condition_wakes_on_context_merge(tmp_path):
+    @task(name="producer")
+    async def producer(ctx):
+        await asyncio.sleep(0.05)
+        return {"ready": True}
+
+    waiter = wait_for_condition(
+        "ctx.get('ready', False)", check_interval=10.0, max_wait_time=5.0
+    )
+
+    wf = Workflow([producer, waiter], name="wf_wait", max_concurrent_tasks=2)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    ctx = await wf.run(run_id="wait_signal", store=JSONStateStore(str(tmp_path)))
+
+    assert ctx["condition_met"] is True
+    assert loop.time() - started < 1.0
+
+
+def test_visualize_is_cached_until_graph_changes():
+    @task(name="a")
+    def a(ctx):
+        return {}
+
+    @task(name="b")
+    def b(ctx):
+        return {}
+
+    wf = Workflow([a, b], name="viz")
+    first = wf.visualize()
+
+    assert wf.visualize() is first
+    assert "depends on" not in first
+
+    a >> b
+    assert "- b (depends on: a)" in wf.visualize()
+
+
+def test_schedule_is_reused_until_graph_changes(tmp_path):
+    order = []
+
+    @task(name="first")
+    def first(ctx):
+        order.append("first")
+        return {}
+
+    @task(name="second")
+    def second(ctx):
+        order.append("second")
+        return {}
+
+    wf = Workflow([second, first], name="sched")
+    schedule = wf._schedule()
+    assert wf._schedule() is schedule
+
+    wf.add_edges([(second, first)])
+    updated = wf._schedule()
+    assert updated is not schedule
+    assert updated.initial_ready == (second,)
+
+    store = JSONStateStore(str(tmp_path))
+    asyncio.run(wf.run("sched_1", store))
+    asyncio.run(wf.run("sched_2", store))
+    assert order == ["second", "first", "second", "first"]
+
+    @task(name="third")
+    def third(ctx):
+        order.append("third")
+        return {}
+
+    # Replacing a task in place keeps the list's id and length
+    wf.tasks[1] = third
+    replaced = wf._schedule()
+    assert replaced is not updated
+    assert set(replaced.ordered_tasks) == {second, third}
+
+
+def test_add_edges_links_tasks_and_rejects_foreign_tasks():
+    @task(name="src")
+    def src(ctx):
+        return {}
+
+    @task(name="dst")
+    def dst(ctx):
+        return {}
+
+    @task(name="outsider")
+    def outsider(ctx):
+        return {}
+
+    wf = Workflow([src, dst], name="edges")
+    assert wf.add_edges([(src, dst)]) is wf
+    assert dst.upstream == {src}
+    assert wf.topo_sort() == [src, dst]
+
+    with pytest.raises(ValueError):
+        wf.add_edges([(dst, outsider)])
+    assert not outsider.upstream
+
+
 def test_queue_provider_defaults_to_memory(monkeypatch):
     monkeypatch.delenv("QUEUE_PROVIDER", raising=False)
     provider, queue = create_workflow_queue_from_env()
@@ -119,3 +359,174 @@ def test_in_memory_queue_ack_nack():
     assert msg2 and msg2.message_id == mid2
     assert q.nack(mid2, to_dlq=True) is True
     assert q.dlq_size() == 1
+
+
+@pytest.mark.asyncio
+async def test_workflow_runner_shares_pooled_http_client(tmp_path, monkeypatch):
+    import importlib
+
+    http_request = importlib.import_module("microflow.nodes.http_request")
+    seen = []
+
+    class FakeClient:
+        closed = False
+
+        async def aclose(self):
+            self.closed = True
+
+    monkeypatch.setattr(http_request, "create_http_client", FakeClient)
+
+    @task(name="grab_client")
+    def grab_client(ctx):
+        seen.append(ctx.get("_microflow_http_client"))
+        return {}
+
+    store = JSONStateStore(str(tmp_path))
+    async with WorkflowRunner(pool_http=True) as runner:
+        await runner.run_workflow(Workflow([grab_client]), run_id="h1", store=store)
+        await runner.run_workflow(Workflow([grab_client]), run_id="h2", store=store)
+        client = runner.http_client
+
+    assert seen == [client, client]
+    assert client.closed is True
+    assert runner.http_client is None
+
+
+def test_topo_sort_orders_diamond_and_detects_cycles():
+    @task(name="a")
+    def a(ctx):
+        return {}
+
+    @task(name="b")
+    def b(ctx):
+        return {}
+
+    @task(name="c")
+    def c(ctx):
+        return {}
+
+    @task(name="d")
+    def d(ctx):
+        return {}
+
+    a >> b >> d
+    a >> c >> d
+    order = Workflow([d, c, b, a], name="diamond").topo_sort()
+
+    assert order[0] is a and order[-1] is d
+
+    d >> a
+    with pytest.raises(RuntimeError, match="Cycle detected"):
+        Workflow([a, b, c, d], name="cyclic").topo_sort()
+
+
+@pytest.mark.asyncio
+async def test_retried_attempts_record_repr_and_final_failure_keeps_traceback(tmp_path):
+    attempts = []
+    store = JSONStateStore(str(tmp_path))
+
+    @task(name="flaky", max_retries=1)
+    def flaky(ctx):
+        attempts.append(store.get_task("flaky_run", "flaky"))
+        raise ValueError(f"attempt {len(attempts)}")
+
+    with pytest.raises(ValueError):
+        await Workflow([flaky]).run("flaky_run", store)
+
+    assert attempts[1]["error"] == "ValueError('attempt 1')"
+    final_error = store.get_task("flaky_run", "flaky")["error"]
+    assert final_error.startswith("Traceback") and "attempt 2" in final_error
+
+
+@pytest.mark.asyncio
+async def test_linear_chain_runs_back_to_back_and_records_every_task(tmp_path):
+    events = []
+
+    @task(name="first")
+    async def first(ctx):
+        events.append("first")
+        return {"n": 1}
+
+    @task(name="second")
+    def second(ctx):
+        events.append("second")
+        return {"n": ctx["n"] + 1}
+
+    @task(name="side")
+    async def side(ctx):
+        await asyncio.sleep(0)
+        events.append("side")
+        return {}
+
+    first >> second
+    store = JSONStateStore(str(tmp_path))
+    wf = Workflow([first, second, side], name="wf_chain", max_concurrent_tasks=4)
+
+    ctx = await wf.run(run_id="chain", store=store)
+
+    assert ctx["n"] == 2
+    assert events.index("second") < events.index("side")
+    assert {name: t["status"] for name, t in store.get_run_info("chain")["tasks"].items()} == {
+        "first": "success",
+        "second": "success",
+        "side": "success",
+    }
+
+
+def test_task_and_task_spec_are_slotted():
+    import sys
+
+    @task(name="slotted")
+    def slotted(ctx):
+        return {}
+
+    assert not hasattr(slotted, "__dict__")
+    if sys.version_info >= (3, 10):
+        assert not hasattr(slotted.spec, "__dict__")
+    # conditional_task and friends swap the function in place
+    slotted.spec.fn = lambda ctx: {"swapped": True}
+    assert slotted.spec.fn({}) == {"swapped": True}
+
+
+@pytest.mark.asyncio
+async def test_mapping_results_are_merged_like_dicts(tmp_path):
+    from collections import OrderedDict
+    from types import MappingProxyType
+
+    @task(name="proxy")
+    def proxy(ctx):
+        return MappingProxyType({"from_proxy": 1})
+
+    @task(name="ordered")
+    def ordered(ctx):
+        return OrderedDict(from_ordered=2)
+
+    @task(name="nothing")
+    def nothing(ctx):
+        return None
+
+    store = JSONStateStore(str(tmp_path))
+    ctx = await Workflow([proxy, ordered, nothing]).run("mappings", store)
+
+    assert ctx["from_proxy"] == 1 and ctx["from_ordered"] == 2
+    assert store.get_task("mappings", "nothing")["status"] == "success"
+
+
+def test_compile_builds_plan_once_and_rejects_cycles():
+    @task(name="one")
+    def one(ctx):
+        return {}
+
+    @task(name="two")
+    def two(ctx):
+        return {}
+
+    one >> two
+    wf = Workflow([one, two], name="compiled")
+
+    assert wf.compile() is wf
+    assert wf._schedule() is wf._schedule_cache[1]
+
+    two >> one
+    with pytest.raises(RuntimeError):
+        Workflow([one, two]).compile()